@@ -26,15 +26,17 @@ class ImportErrorHandler:
     def add_warning(self, row_number: int, field: str, warning_message: str, value: Any = None):
         self.warnings.append(ImportError(row_number, field, warning_message, value))
 
-    def add_duplicate(self, row_data: Dict[str, Any]):
-        self.duplicates.append(row_data)
+    def add_duplicate(self, row_data: Dict[str, Any], row_number: Optional[int] = None, duplicate_of: Optional[str] = None):
+        """Record a duplicate row and what it collides with, e.g. 'row 5' or 'scholarship 12'"""
+        self.duplicates.append({'row_number': row_number, 'duplicate_of': duplicate_of, **row_data})
 
     def add_missing_required(self, field: str):
         if field not in self.missing_required:
             self.missing_required.append(field)
 
-    def add_corrupt_data(self, row_data: Dict[str, Any]):
-        self.corrupt_data.append(row_data)
+    def add_corrupt_data(self, row_data: Dict[str, Any], row_number: Optional[int] = None, invalid_references: Optional[List[str]] = None):
+        """Record a row whose foreign keys, listed in invalid_references, do not exist"""
+        self.corrupt_data.append({'row_number': row_number, 'invalid_references': invalid_references or [], **row_data})
 
     def add_incomplete_data(self, row_data: Dict[str, Any]):
         self.incomplete_data.append(row_data)
@@ -0,0 +1,152 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator, List
+import pandas as pd
+
+# Characters read at a time when streaming a JSON document
+JSON_READ_SIZE = 64 * 1024
+# Largest JSON record, or other value, in characters before the file is
+# treated as malformed
+JSON_MAX_RECORD_SIZE = 16 * 1024 * 1024
+JSON_WHITESPACE = ' \t\r\n'
+
+def read_import_file(file_path: str, chunk_size: int = 5000) -> Iterator[pd.DataFrame]:
+    """Yield an import file as DataFrames of at most chunk_size rows.
+
+    XLSX, CSV, NDJSON and JSON (an array of records, optionally inside an
+    object such as {"scholarships": [...]}) are streamed, so memory stays
+    bounded by the chunk size. Other spreadsheet formats are read whole.
+    Frames are indexed by the record's position in the file.
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix in ('.xlsx', '.xlsm'):
+        yield from _read_xlsx(file_path, chunk_size)
+    elif suffix == '.csv':
+        with pd.read_csv(file_path, chunksize=chunk_size) as reader:
+            yield from reader
+    elif suffix in ('.ndjson', '.jsonl'):
+        with pd.read_json(file_path, lines=True, chunksize=chunk_size) as reader:
+            yield from reader
+    elif suffix == '.json':
+        yield from _frames(_iter_json_records(file_path), chunk_size)
+    else:
+        df = pd.read_excel(file_path)
+        for start in range(0, max(len(df), 1), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+def _read_xlsx(file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Read the first sheet row by row with openpyxl's read-only mode"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) if name is not None else f'column_{i}' for i, name in enumerate(header)]
+        yield from _frames(rows, chunk_size, columns)
+    finally:
+        workbook.close()
+
+def _frames(records: Iterator[Any], chunk_size: int, columns: List[str] = None) -> Iterator[pd.DataFrame]:
+    """Group records into DataFrames, always yielding at least one"""
+    batch, index = [], []
+    yielded = False
+    for position, record in enumerate(records):
+        if columns is not None and not any(value is not None for value in record):
+            continue  # blank spreadsheet row
+        batch.append(record)
+        index.append(position)
+        if len(batch) >= chunk_size:
+            yield pd.DataFrame(batch, columns=columns, index=index)
+            yielded = True
+            batch, index = [], []
+    if batch or not yielded:
+        yield pd.DataFrame(batch, columns=columns, index=index)
+
+class _JsonStream:
+    """A JSON document read in blocks and decoded one value at a time"""
+
+    def __init__(self, f):
+        self.file = f
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+
+    def _read(self) -> bool:
+        """Append the next block to the unread text; False at the end of the file"""
+        block = self.file.read(JSON_READ_SIZE)
+        if not block:
+            return False
+        self.buffer = self.buffer[self.position:] + block
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """The next character, or '' at the end of the file"""
+        while self.position >= len(self.buffer):
+            if not self._read():
+                return ''
+        return self.buffer[self.position]
+
+    def skip(self, characters: str):
+        """Move past any run of the given characters"""
+        while True:
+            char = self.peek()
+            if not char or char not in characters:
+                return
+            self.position += 1
+
+    def decode(self) -> Any:
+        """Decode the value at the current position"""
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except ValueError:
+                # The value continues past the buffer; read more of the file
+                if len(self.buffer) - self.position > JSON_MAX_RECORD_SIZE:
+                    raise ValueError(f'JSON value longer than {JSON_MAX_RECORD_SIZE} characters')
+                if not self._read():
+                    raise
+                continue
+            # A number at the end of the buffer may go on in the next block
+            if end == len(self.buffer) and self._read():
+                continue
+            self.position = end
+            return value
+
+def _iter_json_records(file_path: str) -> Iterator[Any]:
+    """Decode the records of a JSON file one at a time.
+
+    The records are the elements of the top-level array, or of the first
+    array-valued key of a top-level object; the object's other values are
+    decoded and skipped. Raises ValueError once a single value grows past
+    JSON_MAX_RECORD_SIZE without decoding, rather than reading the rest of
+    a malformed file into memory.
+    """
+    with open(file_path, encoding='utf-8-sig') as f:
+        stream = _JsonStream(f)
+        stream.skip(JSON_WHITESPACE)
+        start = stream.peek()
+        if start == '{':
+            stream.position += 1
+            while True:
+                stream.skip(JSON_WHITESPACE + ',')
+                if stream.peek() in ('}', ''):
+                    return
+                stream.decode()  # the key
+                stream.skip(JSON_WHITESPACE + ':')
+                if stream.peek() == '[':
+                    break
+                stream.decode()  # a value other than the records
+        elif start == '':
+            return
+        elif start != '[':
+            raise ValueError('JSON import must be an array of records or an object holding one')
+        stream.position += 1
+        while True:
+            stream.skip(JSON_WHITESPACE + ',')
+            if stream.peek() == ']':
+                return
+            yield stream.decode()
@@ -0,0 +1,46 @@
+import threading
+import time
+from typing import Dict, FrozenSet, Optional
+from app.models.organization import Organization
+from app.models.category import Category
+from app.models.country import Country
+from app.models.education_level import EducationLevel
+from app.models.gender import Gender
+from sqlalchemy.orm import Session
+
+# Foreign key columns of a scholarship row and the tables they reference
+REFERENCE_TABLES = {
+    'organization_id': Organization,
+    'category_id': Category,
+    'country_id': Country,
+    'education_level_id': EducationLevel,
+    'gender_id': Gender,
+}
+
+class ReferenceDataCache:
+    """Valid IDs of the reference tables, loaded once and reused until the TTL expires"""
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self._ids: Dict[str, FrozenSet[int]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get_ids(self, db: Session) -> Dict[str, FrozenSet[int]]:
+        """Valid IDs per foreign key column, reloading them if stale"""
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+                self._ids = {
+                    field: frozenset(row_id for (row_id,) in db.query(model.id).all())
+                    for field, model in REFERENCE_TABLES.items()
+                }
+                self._loaded_at = time.monotonic()
+            return self._ids
+
+    def invalidate(self):
+        """Reload on next use, e.g. after reference tables change"""
+        with self._lock:
+            self._loaded_at = None
+
+# Shared across imports so back-to-back imports skip the reload
+reference_data_cache = ReferenceDataCache()
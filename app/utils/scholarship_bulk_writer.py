@@ -0,0 +1,138 @@
+import io
+from typing import Any, Dict, List, Optional, Tuple
+from app.models.scholarship import Scholarship
+from app.utils.import_error_handler import ImportErrorHandler
+from app.validations.scholarship_validation import ScholarshipValidation
+from sqlalchemy import ColumnDefault, inspect, util
+from sqlalchemy.orm import Session
+
+def copy_field(value: Any) -> str:
+    """A value as a COPY CSV field.
+
+    NULL is the unquoted empty field and every other value is quoted, so no
+    string, empty or otherwise, can be read back as NULL.
+    """
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+def is_context_free(default: ColumnDefault) -> bool:
+    """Whether a column default can be computed without an execution context.
+
+    That is a plain value or a function of no arguments, which SQLAlchemy
+    wraps in a context-taking function that keeps it as __wrapped__.
+    """
+    if default.is_scalar:
+        return True
+    wrapped = getattr(default.arg, '__wrapped__', None) if default.is_callable else None
+    if wrapped is None:
+        return False
+    try:
+        argspec = util.get_callable_argspec(wrapped, no_self=True)
+    except TypeError:
+        # Builtins such as datetime.utcnow, which SQLAlchemy calls with no arguments
+        return True
+    return len(argspec.args) == len(argspec.defaults or ())
+
+class ScholarshipBulkWriter:
+    """Inserts validated scholarships in chunks, one transaction per chunk.
+
+    Each chunk is written under a savepoint with a single bulk insert, or
+    COPY on PostgreSQL with psycopg2. When a chunk fails, it is rolled back
+    to the savepoint and retried in halves until the failing rows are
+    isolated and reported; the rest of the chunk is still written.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        error_handler: ImportErrorHandler,
+        chunk_size: int = 1000,
+        use_copy: Optional[bool] = None
+    ):
+        self.db = db
+        self.error_handler = error_handler
+        self.chunk_size = chunk_size
+        # Column defaults bulk inserts compute in Python, by attribute name
+        self.defaults = {
+            key: column.default
+            for key, column in inspect(Scholarship).columns.items()
+            if column.default is not None
+        }
+        if use_copy is None:
+            dialect = db.get_bind().dialect
+            use_copy = dialect.name == 'postgresql' and dialect.driver == 'psycopg2'
+        # COPY can only fill in defaults that need no execution context;
+        # others are left to bulk_insert_mappings
+        if not all(is_context_free(default) for default in self.defaults.values()):
+            use_copy = False
+        self.use_copy = use_copy
+        self.pending: List[Tuple[int, Dict[str, Any]]] = []
+        self.inserted = 0
+
+    def add(self, row_number: int, validated_data: ScholarshipValidation):
+        """Queue a row, writing the chunk once it is full"""
+        self.pending.append((row_number, validated_data.dict()))
+        if len(self.pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write and commit the queued rows"""
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        self._write(rows)
+        self.db.commit()
+
+    def _write(self, rows: List[Tuple[int, Dict[str, Any]]]):
+        try:
+            with self.db.begin_nested():
+                self._insert([mapping for _, mapping in rows])
+            self.inserted += len(rows)
+        except Exception as e:
+            if len(rows) == 1:
+                row_number, _ = rows[0]
+                self.error_handler.add_error(row_number, 'database', f'Error inserting row: {str(e)}')
+                return
+            middle = len(rows) // 2
+            self._write(rows[:middle])
+            self._write(rows[middle:])
+
+    def _insert(self, mappings: List[Dict[str, Any]]):
+        if self.use_copy:
+            self._copy(mappings)
+        else:
+            self.db.bulk_insert_mappings(Scholarship, mappings)
+
+    def _with_defaults(self, mapping: Dict[str, Any]) -> Dict[str, Any]:
+        """The mapping with the Python-side defaults of its missing columns filled in.
+
+        Only used when every default is context free, so no context is passed.
+        """
+        missing = [key for key in self.defaults if key not in mapping]
+        if not missing:
+            return mapping
+        mapping = dict(mapping)
+        for key in missing:
+            default = self.defaults[key]
+            mapping[key] = default.arg if default.is_scalar else default.arg(None)
+        return mapping
+
+    def _copy(self, mappings: List[Dict[str, Any]]):
+        """COPY the rows in through the session's own connection and transaction"""
+        mappings = [self._with_defaults(mapping) for mapping in mappings]
+        keys = list(mappings[0])
+        buffer = io.StringIO()
+        for mapping in mappings:
+            buffer.write(','.join(copy_field(mapping[key]) for key in keys))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        columns = inspect(Scholarship).columns
+        column_list = ', '.join(f'"{columns[key].name}"' for key in keys)
+        sql = f"COPY {Scholarship.__table__.fullname} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(sql, buffer)
+        finally:
+            cursor.close()
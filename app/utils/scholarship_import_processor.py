@@ -1,21 +1,48 @@
 import pandas as pd
-from typing import List, Dict, Any, Tuple
-from datetime import datetime
-from decimal import Decimal
+from typing import List, Dict, Any, Optional, Tuple
 from app.validations.scholarship_validation import ScholarshipValidation
 from app.utils.import_error_handler import ImportErrorHandler
+from app.utils.import_file_reader import read_import_file
+from app.utils.reference_data_cache import REFERENCE_TABLES, ReferenceDataCache, reference_data_cache
+from app.utils.scholarship_bulk_writer import ScholarshipBulkWriter
 from app.models.scholarship import Scholarship
-from app.models.organization import Organization
-from app.models.category import Category
-from app.models.country import Country
-from app.models.education_level import EducationLevel
-from app.models.gender import Gender
 from sqlalchemy.orm import Session
 
+BOOLEAN_FIELDS = [
+    'is_merit_based', 'is_need_based', 'is_athletic', 'is_artistic',
+    'is_academic', 'is_minority', 'is_international', 'is_undergraduate',
+    'is_graduate', 'is_phd', 'is_postdoc', 'is_full_ride', 'is_partial',
+    'is_renewable'
+]
+NUMERIC_FIELDS = ['amount', 'age_min', 'age_max', 'gpa_min', 'gpa_max', 'income_min', 'income_max']
+# Flag values read as False; anything else that is present reads as True
+FALSE_VALUES = {'', '0', '0.0', 'false', 'f', 'no', 'n', 'off', 'none', 'nan'}
+# Fast path for deadlines; other formats are parsed one value at a time
+DEADLINE_FORMAT = '%Y-%m-%d'
+# Organization IDs per duplicate lookup query
+DUPLICATE_QUERY_BATCH = 1000
+
+def normalize_name(name: Any) -> str:
+    """Scholarship name as compared for duplicates: case and spacing ignored"""
+    return ' '.join(str(name).split()).casefold()
+
 class ScholarshipImportProcessor:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        reference_cache: Optional[ReferenceDataCache] = None,
+        chunk_size: int = 1000,
+        read_chunk_size: int = 5000
+    ):
         self.db = db
+        self.reference_cache = reference_cache or reference_data_cache
         self.error_handler = ImportErrorHandler()
+        self.writer = ScholarshipBulkWriter(db, self.error_handler, chunk_size)
+        self.read_chunk_size = read_chunk_size
+        # Duplicate keys carried across the chunks of one file
+        self._existing_keys: Dict[Tuple[str, int], int] = {}
+        self._loaded_organizations: set = set()
+        self._seen_keys: Dict[Tuple[str, int], int] = {}
         self.required_fields = [
             'name', 'description', 'amount', 'deadline', 'eligibility_criteria',
             'application_process', 'status', 'organization_id', 'category_id',
@@ -25,14 +52,18 @@ class ScholarshipImportProcessor:
     def process_file(self, file_path: str) -> Tuple[bool, ImportErrorHandler]:
         """
         Process a scholarship import file and return success status and error handler
+
+        The file is read and processed in chunks of read_chunk_size rows, so
+        memory does not grow with the file and valid rows are committed as
+        each insert chunk fills up.
         """
         try:
-            df = pd.read_excel(file_path)
-            self._validate_headers(df)
-            
-            for index, row in df.iterrows():
-                row_number = index + 2  # Excel is 1-based and has header row
-                self._process_row(row, row_number)
+            self._existing_keys, self._loaded_organizations, self._seen_keys = {}, set(), {}
+            for chunk_number, df in enumerate(read_import_file(file_path, self.read_chunk_size)):
+                if chunk_number == 0:
+                    self._validate_headers(df)
+                self._process_chunk(df)
+            self.writer.flush()
 
             return not self.error_handler.has_errors(), self.error_handler
 
@@ -47,17 +78,25 @@ class ScholarshipImportProcessor:
             for header in missing_headers:
                 self.error_handler.add_missing_required(header)
 
-    def _process_row(self, row: pd.Series, row_number: int):
-        """Process a single row of data"""
-        try:
-            # Convert row to dict and clean data
-            data = self._clean_row_data(row)
-            
-            # Check for duplicates
-            if self._is_duplicate(data):
-                self.error_handler.add_duplicate(data)
-                return
+    def _process_chunk(self, df: pd.DataFrame):
+        """Run one chunk of rows through cleaning, duplicate and reference checks, then row by row"""
+        df = self._clean_data(df)
+        keys = self._duplicate_keys(df)
+        df = self._drop_duplicates(df, keys)
+        invalid_references = self._find_invalid_references(df)
 
+        for index, row_number, data in zip(df.index, self._row_numbers(df), self._to_records(df)):
+            self._process_row(data, row_number, invalid_references.get(index, []), keys.get(index))
+
+    def _process_row(
+        self,
+        data: Dict[str, Any],
+        row_number: int,
+        invalid_references: List[str],
+        key: Optional[Tuple[str, int]] = None
+    ):
+        """Process a single row of cleaned data, the foreign keys it failed and its duplicate key"""
+        try:
             # Validate data using Pydantic model
             try:
                 validated_data = ScholarshipValidation(**data)
@@ -66,8 +105,8 @@ class ScholarshipImportProcessor:
                 return
 
             # Check for corrupt data
-            if self._is_corrupt_data(data):
-                self.error_handler.add_corrupt_data(data)
+            if invalid_references:
+                self.error_handler.add_corrupt_data(data, row_number, invalid_references)
                 return
 
             # Check for incomplete data
@@ -75,67 +114,147 @@ class ScholarshipImportProcessor:
                 self.error_handler.add_incomplete_data(data)
                 return
 
-            # Create scholarship record
-            self._create_scholarship(validated_data)
+            # Only rows that are inserted claim their key, so a rejected row
+            # does not hide a later valid copy of it
+            if key is not None:
+                if key in self._seen_keys:
+                    self.error_handler.add_duplicate(data, row_number, f'row {self._seen_keys[key]}')
+                    return
+                self._seen_keys[key] = row_number
+
+            # Queue scholarship record for the next chunk insert
+            self.writer.add(row_number, validated_data)
 
         except Exception as e:
             self.error_handler.add_error(row_number, 'processing', f'Error processing row: {str(e)}')
 
-    def _clean_row_data(self, row: pd.Series) -> Dict[str, Any]:
-        """Clean and convert row data to appropriate types"""
-        data = row.to_dict()
-        
-        # Convert amount to Decimal
-        if 'amount' in data and pd.notna(data['amount']):
-            data['amount'] = Decimal(str(data['amount']))
-
-        # Convert deadline to datetime
-        if 'deadline' in data and pd.notna(data['deadline']):
-            if isinstance(data['deadline'], str):
-                data['deadline'] = pd.to_datetime(data['deadline'])
-            elif isinstance(data['deadline'], datetime):
-                data['deadline'] = data['deadline']
-
-        # Convert boolean fields
-        boolean_fields = [
-            'is_merit_based', 'is_need_based', 'is_athletic', 'is_artistic',
-            'is_academic', 'is_minority', 'is_international', 'is_undergraduate',
-            'is_graduate', 'is_phd', 'is_postdoc', 'is_full_ride', 'is_partial',
-            'is_renewable'
-        ]
-        for field in boolean_fields:
-            if field in data:
-                data[field] = bool(data[field]) if pd.notna(data[field]) else False
-
-        # Convert numeric fields
-        numeric_fields = ['age_min', 'age_max', 'gpa_min', 'gpa_max', 'income_min', 'income_max']
-        for field in numeric_fields:
-            if field in data and pd.notna(data[field]):
-                data[field] = Decimal(str(data[field]))
-
-        return data
-
-    def _is_duplicate(self, data: Dict[str, Any]) -> bool:
-        """Check if scholarship is a duplicate"""
-        return self.db.query(Scholarship).filter(
-            Scholarship.name == data['name'],
-            Scholarship.organization_id == data['organization_id']
-        ).first() is not None
-
-    def _is_corrupt_data(self, data: Dict[str, Any]) -> bool:
-        """Check if data is corrupt"""
-        # Check if required IDs exist in database
-        if not self.db.query(Organization).get(data['organization_id']):
-            return True
-        if not self.db.query(Category).get(data['category_id']):
-            return True
-        if not self.db.query(Country).get(data['country_id']):
-            return True
-        if not self.db.query(EducationLevel).get(data['education_level_id']):
-            return True
-        if not self.db.query(Gender).get(data['gender_id']):
-            return True
-        return False
+    def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert whole columns to the types validation expects.
+
+        Values that cannot be converted are kept as read, so validation
+        reports them against their field.
+        """
+        df = df.copy()
+
+        for field in NUMERIC_FIELDS:
+            if field in df.columns:
+                df[field] = self._coerce(df[field], pd.to_numeric(df[field], errors='coerce'))
+
+        if 'deadline' in df.columns:
+            df['deadline'] = self._clean_deadlines(df['deadline'])
+
+        for field in BOOLEAN_FIELDS:
+            if field in df.columns:
+                df[field] = self._clean_flags(df[field])
+
+        return df
+
+    def _clean_deadlines(self, column: pd.Series) -> pd.Series:
+        """Parse deadlines, trying the fixed format before anything else"""
+        if pd.api.types.is_datetime64_any_dtype(column):
+            return column
+        parsed = pd.to_datetime(column, format=DEADLINE_FORMAT, errors='coerce')
+        missed = parsed.isna() & column.notna()
+        if missed.any():
+            parsed[missed] = column[missed].map(lambda value: pd.to_datetime(value, errors='coerce'))
+        return self._coerce(column, parsed)
+
+    @staticmethod
+    def _clean_flags(column: pd.Series) -> pd.Series:
+        """Normalize a flag column to booleans; blanks are False"""
+        if pd.api.types.is_bool_dtype(column):
+            return column
+        if pd.api.types.is_numeric_dtype(column):
+            return column.fillna(0) != 0
+        text = column.astype(str).str.strip().str.lower()
+        return column.notna() & ~text.isin(FALSE_VALUES)
+
+    @staticmethod
+    def _coerce(column: pd.Series, converted: pd.Series) -> pd.Series:
+        """Take converted values, keeping the originals that failed to convert"""
+        failed = converted.isna() & column.notna()
+        if not failed.any():
+            return converted
+        return converted.astype(object).where(~failed, column)
+
+    @staticmethod
+    def _row_numbers(df: pd.DataFrame) -> List[int]:
+        """File row numbers of the frame's rows"""
+        # Excel is 1-based and has header row
+        return (df.index + 2).tolist()
+
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Row dicts with missing values as None"""
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+
+    @staticmethod
+    def _duplicate_keys(df: pd.DataFrame) -> Dict[Any, Tuple[str, int]]:
+        """Normalized name and organization of each row that has both.
+
+        Rows missing either are left for validation to reject.
+        """
+        if 'name' not in df.columns or 'organization_id' not in df.columns:
+            return {}
+
+        names = df['name'].astype('string').str.split().str.join(' ').str.casefold()
+        organization_ids = pd.to_numeric(df['organization_id'], errors='coerce')
+        keyed = names.notna() & (names != '') & organization_ids.notna() & (organization_ids % 1 == 0)
+        return dict(zip(df.index[keyed], zip(names[keyed], organization_ids[keyed].astype(int).tolist())))
+
+    def _drop_duplicates(self, df: pd.DataFrame, keys: Dict[Any, Tuple[str, int]]) -> pd.DataFrame:
+        """Report and remove rows that repeat an existing scholarship.
+
+        Repeats within the file are caught as rows are queued for insert.
+        """
+        new_organizations = {organization_id for _, organization_id in keys.values()} - self._loaded_organizations
+        self._existing_keys.update(self._load_existing_keys(new_organizations))
+        self._loaded_organizations |= new_organizations
+        existing = self._existing_keys
+
+        duplicate_of = {
+            index: f'scholarship {existing[key]}'
+            for index, key in keys.items()
+            if key in existing
+        }
+        if not duplicate_of:
+            return df
+        duplicates = df.loc[list(duplicate_of)]
+        records = self._to_records(duplicates)
+        for index, row_number, data in zip(duplicates.index, self._row_numbers(duplicates), records):
+            self.error_handler.add_duplicate(data, row_number, duplicate_of[index])
+        return df.drop(index=duplicates.index)
+
+    def _load_existing_keys(self, organization_ids: set) -> Dict[Tuple[str, int], int]:
+        """Map (normalized name, organization_id) to scholarship ID for the given organizations"""
+        keys = {}
+        organization_ids = sorted(organization_ids)
+        for start in range(0, len(organization_ids), DUPLICATE_QUERY_BATCH):
+            rows = self.db.query(
+                Scholarship.id, Scholarship.name, Scholarship.organization_id
+            ).filter(
+                Scholarship.organization_id.in_(organization_ids[start:start + DUPLICATE_QUERY_BATCH])
+            ).all()
+            for scholarship_id, name, organization_id in rows:
+                keys.setdefault((normalize_name(name), organization_id), scholarship_id)
+        return keys
+
+    def _find_invalid_references(self, df: pd.DataFrame) -> Dict[Any, List[str]]:
+        """Foreign key columns whose ID does not exist, for each row with any.
+
+        Missing or non-numeric IDs are left for validation to reject.
+        """
+        valid_ids = self.reference_cache.get_ids(self.db)
+        invalid = pd.DataFrame(index=df.index)
+        for field in REFERENCE_TABLES:
+            if field in df.columns:
+                ids = pd.to_numeric(df[field], errors='coerce')
+                invalid[field] = ids.notna() & ~ids.isin(valid_ids[field])
+        failed = invalid[invalid.any(axis=1)]
+        return {
+            index: [field for field, is_invalid in flags.items() if is_invalid]
+            for index, flags in zip(failed.index, failed.to_dict('records'))
+        }
 
     def _is_incomplete_data(self, data: Dict[str, Any]) -> bool:
         """Check if data is incomplete"""
@@ -144,9 +263,3 @@ class ScholarshipImportProcessor:
             if field not in data or pd.isna(data[field]):
                 return True
         return False
-
-    def _create_scholarship(self, validated_data: ScholarshipValidation):
-        """Create a new scholarship record"""
-        scholarship = Scholarship(**validated_data.dict())
-        self.db.add(scholarship)
-        self.db.commit() 
\ No newline at end of file
@@ -12,27 +12,79 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 
-import google.auth
-import vertexai
 from google import genai
 from google.genai import types
 
+from app.utils.evaluation import RUBRIC
+from app.utils.school_index import SchoolIndex
+
 # Constants
 VERTEXAI = os.getenv("VERTEXAI", "true").lower() == "true"
 LOCATION = "us-central1"
 MODEL_ID = "gemini-live-2.5-flash-preview-native-audio"
 
-# Initialize Google Cloud clients
-credentials, project_id = google.auth.default()
-vertexai.init(project=project_id, location=LOCATION)
+# Google Cloud clients are created on first use rather than at import, so a
+# cold start can accept connections before credentials are resolved
+_genai_client: genai.Client | None = None
+_genai_client_lock = threading.Lock()
+
+
+def get_genai_client() -> genai.Client:
+    """Return the shared Gemini client, creating it on first call.
+
+    Safe to call from several threads at once; the client, and on Vertex AI
+    the credential lookup and ``vertexai.init``, happen exactly once.
+    """
+    global _genai_client
+    if _genai_client is None:
+        with _genai_client_lock:
+            if _genai_client is None:
+                _genai_client = _create_genai_client()
+    return _genai_client
+
+
+def _create_genai_client() -> genai.Client:
+    if not VERTEXAI:
+        # API key should be set using GOOGLE_API_KEY environment variable
+        return genai.Client(http_options={"api_version": "v1alpha"})
+
+    # Imported here because they dominate the module's import time
+    import google.auth
+    import vertexai
+
+    _, project_id = google.auth.default()
+    vertexai.init(project=project_id, location=LOCATION)
+    return genai.Client(project=project_id, location=LOCATION, vertexai=True)
 
-if VERTEXAI:
-    genai_client = genai.Client(project=project_id, location=LOCATION, vertexai=True)
-else:
-    # API key should be set using GOOGLE_API_KEY environment variable
-    genai_client = genai.Client(http_options={"api_version": "v1alpha"})
+
+# Curated insights merged into the school index ahead of database rows
+SCHOOL_INSIGHTS = {
+    "harvard business school": {
+        "focus": "leadership excellence, analytical thinking, and collaborative mindset",
+        "values": "excellence, integrity, respect, accountability, and service",
+        "culture": "case method learning, collaborative leadership development"
+    },
+    "stanford graduate school of business": {
+        "focus": "entrepreneurial thinking, innovation, and social impact",
+        "values": "intellectual vitality, engaged community, personal leadership",
+        "culture": "innovation, risk-taking, social responsibility"
+    },
+    "wharton school": {
+        "focus": "analytical rigor, quantitative skills, and global perspective",
+        "values": "knowledge for action, integrity, global citizenship",
+        "culture": "analytical excellence, finance leadership, team collaboration"
+    }
+}
+
+# Rebuilt from mba_schools and the persona tables by the server lifespan
+school_index = SchoolIndex(seed=SCHOOL_INSIGHTS)
 
 
 def get_school_info(school_name: str) -> dict:
@@ -44,50 +96,45 @@ def get_school_info(school_name: str) -> dict:
     Returns:
         A dictionary with school information and interview insights.
     """
-    school_insights = {
-        "harvard business school": {
-            "focus": "leadership excellence, analytical thinking, and collaborative mindset",
-            "values": "excellence, integrity, respect, accountability, and service",
-            "culture": "case method learning, collaborative leadership development"
-        },
-        "stanford graduate school of business": {
-            "focus": "entrepreneurial thinking, innovation, and social impact",
-            "values": "intellectual vitality, engaged community, personal leadership",
-            "culture": "innovation, risk-taking, social responsibility"
-        },
-        "wharton school": {
-            "focus": "analytical rigor, quantitative skills, and global perspective",
-            "values": "knowledge for action, integrity, global citizenship",
-            "culture": "analytical excellence, finance leadership, team collaboration"
-        }
-    }
-    
-    school_key = school_name.lower()
-    if school_key in school_insights:
-        return {"output": f"School insights: {school_insights[school_key]}"}
-    
+    insights = school_index.lookup(school_name)
+    if insights is not None:
+        return {"output": f"School insights: {insights}"}
+
     return {"output": "General MBA insights: Focus on leadership, teamwork, and analytical thinking."}
 
 
-def take_interview_notes(observation: str) -> dict:
+def take_interview_notes(
+    observation: str, dimension: str | None = None, rating: int | None = None
+) -> dict:
     """Take notes during the interview for evaluation purposes.
 
+    Live sessions replace this with a per-session version that feeds the
+    session's running evaluation.
+
     Args:
         observation: Important observation or insight about the candidate's response.
+        dimension: Rubric dimension the observation is evidence for.
+        rating: Rating of the candidate on that dimension from 1 to 5.
 
     Returns:
         Confirmation that the note was recorded.
     """
-    # In a real implementation, this would save to the database
     return {"output": f"Note recorded: {observation}"}
 
 
 # Configure tools available to the MBA interview agent
-tool_functions = {
+tool_functions: dict[str, Callable] = {
     "get_school_info": get_school_info,
     "take_interview_notes": take_interview_notes
 }
 
+# Seconds each tool may run before an error response is sent to the model.
+# Tools are called mid-turn, so keep these short.
+tool_timeouts = {
+    "get_school_info": 2.0,
+    "take_interview_notes": 2.0,
+}
+
 # Create tool declarations for the LiveConnectConfig
 tool_declarations = [
     types.Tool(
@@ -115,6 +162,15 @@ tool_declarations = [
                         "observation": types.Schema(
                             type=types.Type.STRING,
                             description="Important observation or insight about the candidate's response"
+                        ),
+                        "dimension": types.Schema(
+                            type=types.Type.STRING,
+                            enum=list(RUBRIC),
+                            description="Evaluation criterion the observation is evidence for"
+                        ),
+                        "rating": types.Schema(
+                            type=types.Type.INTEGER,
+                            description="Rating of the candidate on that criterion from 1 (weak) to 5 (excellent)"
                         )
                     },
                     required=["observation"]
@@ -124,6 +180,13 @@ tool_declarations = [
     )
 ]
 
+# Voice settings shared by every interview config
+speech_config = types.SpeechConfig(
+    voice_config=types.VoiceConfig(
+        prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name="Kore")
+    )
+)
+
 # MBA Interview System Instruction Template - will be dynamically injected with school persona
 MBA_INTERVIEW_SYSTEM_INSTRUCTION = """You are an expert MBA admissions interviewer conducting a natural, conversational interview.
 
@@ -154,7 +217,7 @@ CONVERSATION GUIDELINES:
 - Ask relevant follow-ups based on what the candidate shares
 - Keep the interview natural and conversational
 - Be professional yet warm and supportive
-- Use the take_interview_notes tool to record key observations
+- Use the take_interview_notes tool to record key observations, tagged with the criterion they support and a 1-5 rating
 
 QUESTION BANK CONTEXT: {questions_context}
 
@@ -180,14 +243,34 @@ live_connect_config = types.LiveConnectConfig(
             )
         ]
     ),
-    speech_config=types.SpeechConfig(
-        voice_config=types.VoiceConfig(
-            prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name="Kore")
-        )
-    ),
+    speech_config=speech_config,
     enable_affective_dialog=True,
+    input_audio_transcription=types.AudioTranscriptionConfig(),
 )
 
+# Personalized configs keyed by a hash of the persona fields and question texts.
+# Configs are shared between sessions and must be treated as read-only.
+CONFIG_CACHE_MAX_ENTRIES = int(os.getenv("CONFIG_CACHE_MAX_ENTRIES", "1024"))
+_config_cache: OrderedDict[str, tuple[types.LiveConnectConfig, int]] = OrderedDict()
+_config_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "instruction_bytes": 0}
+
+
+def config_cache_stats() -> dict:
+    """Return hit rate and approximate memory use of the config cache."""
+    lookups = _config_cache_stats["hits"] + _config_cache_stats["misses"]
+    return {
+        **_config_cache_stats,
+        "entries": len(_config_cache),
+        "hit_rate": _config_cache_stats["hits"] / lookups if lookups else 0.0,
+    }
+
+
+def clear_config_cache() -> None:
+    """Drop every cached config and reset the counters."""
+    _config_cache.clear()
+    for counter in _config_cache_stats:
+        _config_cache_stats[counter] = 0
+
 
 def create_personalized_config(persona_data: dict, questions_data: list) -> types.LiveConnectConfig:
     """Create a personalized live connect config based on school persona and questions."""
@@ -200,8 +283,23 @@ def create_personalized_config(persona_data: dict, questions_data: list) -> type
     greeting = persona_data.get('greeting', 'Hello! I\'m excited to learn more about you and your interest in pursuing an MBA.')
     closing = persona_data.get('closing', 'Thank you for this wonderful conversation. We\'ll be in touch soon.')
     
+    question_texts = [q.get('question_text', '') for q in questions_data[:5]]
+    cache_key = hashlib.sha256(
+        json.dumps(
+            [persona_context, school_context, tone, behavioral_notes, greeting, closing, question_texts],
+            default=str,
+        ).encode("utf-8")
+    ).hexdigest()
+
+    cached = _config_cache.get(cache_key)
+    if cached is not None:
+        _config_cache.move_to_end(cache_key)
+        _config_cache_stats["hits"] += 1
+        return cached[0]
+    _config_cache_stats["misses"] += 1
+
     # Format questions context
-    questions_context = "Consider these school-specific topics during the conversation: " + "; ".join([q.get('question_text', '') for q in questions_data[:5]])
+    questions_context = "Consider these school-specific topics during the conversation: " + "; ".join(question_texts)
     
     personalized_instruction = MBA_INTERVIEW_SYSTEM_INSTRUCTION.format(
         persona_context=persona_context,
@@ -213,16 +311,23 @@ def create_personalized_config(persona_data: dict, questions_data: list) -> type
         questions_context=questions_context
     )
     
-    return types.LiveConnectConfig(
+    config = types.LiveConnectConfig(
         response_modalities=[types.Modality.AUDIO],
         tools=tool_declarations,
         system_instruction=types.Content(
             parts=[types.Part(text=personalized_instruction)]
         ),
-        speech_config=types.SpeechConfig(
-            voice_config=types.VoiceConfig(
-                prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name="Kore")
-            )
-        ),
+        speech_config=speech_config,
         enable_affective_dialog=True,
+        # Transcripts of the candidate's speech feed the injection scanner
+        input_audio_transcription=types.AudioTranscriptionConfig(),
     )
+
+    instruction_bytes = len(personalized_instruction.encode("utf-8"))
+    _config_cache[cache_key] = (config, instruction_bytes)
+    _config_cache_stats["instruction_bytes"] += instruction_bytes
+    while len(_config_cache) > CONFIG_CACHE_MAX_ENTRIES:
+        _, (_, evicted_bytes) = _config_cache.popitem(last=False)
+        _config_cache_stats["instruction_bytes"] -= evicted_bytes
+        _config_cache_stats["evictions"] += 1
+    return config
@@ -0,0 +1,346 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime
+from urllib.parse import urlparse
+
+import asyncpg
+import backoff
+
+from app.utils.metrics import DB_POOL_WAIT_SECONDS, DB_QUERY_SECONDS
+from app.utils.turn_writer import TURN_COLUMNS, TurnRecord
+
+# Query texts are kept constant so each pooled connection prepares them once
+# and serves every later call from its statement cache.
+PERSONA_QUERY = """
+    SELECT * FROM ai_interview_school_personas
+    WHERE school_id = $1 AND is_active = true
+    LIMIT 1
+"""
+
+QUESTIONS_QUERY = """
+    SELECT * FROM ai_interview_question_banks
+    WHERE school_id = $1 AND is_active = true
+    ORDER BY priority DESC LIMIT 10
+"""
+
+SCHOOL_INDEX_QUERY = """
+    SELECT s.id::text AS school_id, s.name, s.location, s.teaching_methodology,
+           p.school_context, p.behavioral_notes,
+           (SELECT array_agg(DISTINCT q.question_category)
+            FROM ai_interview_question_banks q
+            WHERE q.school_id = s.id AND q.is_active = true) AS question_categories
+    FROM mba_schools s
+    LEFT JOIN ai_interview_school_personas p
+        ON p.school_id = s.id AND p.is_active = true
+"""
+
+INSERT_SESSION_QUERY = """
+    INSERT INTO ai_interview_agent_sessions
+    (id, user_id, school_id, status, persona_used, questions_context,
+     started_at, user_agent, ip_address)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+"""
+
+INSERT_TURN_QUERY = """
+    INSERT INTO ai_interview_conversation_turns
+    (session_id, turn_number, speaker, message_text, message_metadata, timestamp)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    ON CONFLICT (session_id, turn_number) DO NOTHING
+"""
+
+COMPLETE_SESSION_QUERY = """
+    UPDATE ai_interview_agent_sessions
+    SET status = $1, total_turns = $2, duration_seconds = $3,
+        completed_at = $4, completion_percentage = $5
+    WHERE id = $6
+"""
+
+UPSERT_EVALUATION_QUERY = """
+    INSERT INTO ai_interview_evaluations (session_id, user_id, evaluation_data)
+    VALUES ($1, $2, $3)
+    ON CONFLICT (session_id) DO UPDATE
+    SET evaluation_data = EXCLUDED.evaluation_data, updated_at = NOW()
+"""
+
+
+class DatabaseUnavailableError(RuntimeError):
+    """Raised when a query is attempted while no connection pool exists."""
+
+
+def get_database_url() -> str:
+    """Read DATABASE_URL from environment or construct it from the Supabase URL."""
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        return database_url
+
+    supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL", "")
+    db_password = os.getenv("SUPABASE_DB_PASSWORD", "")
+
+    if supabase_url and db_password:
+        # Parse Supabase URL to extract connection details
+        parsed = urlparse(supabase_url)
+        if parsed.hostname:
+            # Extract project reference from hostname (e.g., "abcdef.supabase.co")
+            project_ref = parsed.hostname.split(".")[0]
+            # Construct database hostname
+            db_host = f"db.{project_ref}.supabase.co"
+            return f"postgresql://postgres:{db_password}@{db_host}:5432/postgres"
+        raise ValueError("Invalid NEXT_PUBLIC_SUPABASE_URL format")
+    raise ValueError(
+        "Database connection configuration missing. Please set DATABASE_URL or NEXT_PUBLIC_SUPABASE_URL + SUPABASE_DB_PASSWORD"
+    )
+
+
+class Database:
+    """Owns the asyncpg pool and the queries the interview agent runs.
+
+    The pool is created once from the FastAPI lifespan. If that fails, it is
+    retried in the background with exponential backoff while queries fail
+    fast with ``DatabaseUnavailableError`` instead of reconnecting per call.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 10,
+        command_timeout: float = 30.0,
+        acquire_timeout: float = 10.0,
+    ) -> None:
+        """Initialize the data-access layer without connecting.
+
+        Args:
+            min_size: Connections opened and warmed when the pool is created
+            max_size: Upper bound on concurrent connections
+            command_timeout: Default per-statement timeout in seconds
+            acquire_timeout: Seconds to wait for a free connection
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.command_timeout = command_timeout
+        self.acquire_timeout = acquire_timeout
+        self.pool: asyncpg.Pool | None = None
+        self._lock = asyncio.Lock()
+        self._retry_task: asyncio.Task | None = None
+        self._waiting = 0
+        self._acquisitions = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    async def start(self) -> None:
+        """Create and warm the pool, retrying in the background on failure."""
+        try:
+            await self._create_pool()
+        except ValueError as e:
+            # Missing configuration will not fix itself, so don't retry
+            logging.error(f"Database disabled: {e}")
+        except Exception as e:
+            logging.error(f"Failed to create database connection pool: {e}")
+            self._retry_task = asyncio.create_task(self._create_pool_with_retry())
+
+    async def close(self) -> None:
+        """Stop any pending retry and close the pool."""
+        if self._retry_task is not None:
+            self._retry_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._retry_task
+            self._retry_task = None
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def connect_listener(self) -> asyncpg.Connection:
+        """Open a dedicated connection outside the pool for LISTEN."""
+        return await asyncpg.connect(get_database_url())
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """Borrow a pooled connection, recording how long the wait took."""
+        if self.pool is None:
+            raise DatabaseUnavailableError("Database connection pool is not available")
+
+        self._waiting += 1
+        started = time.perf_counter()
+        try:
+            conn = await self.pool.acquire(timeout=self.acquire_timeout)
+        finally:
+            self._waiting -= 1
+        waited = time.perf_counter() - started
+        self._acquisitions += 1
+        self._wait_seconds_total += waited
+        self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        DB_POOL_WAIT_SECONDS.observe(waited)
+
+        try:
+            yield conn
+        finally:
+            await self.pool.release(conn)
+
+    def stats(self) -> dict:
+        """Return pool occupancy and acquisition wait telemetry."""
+        size = self.pool.get_size() if self.pool is not None else 0
+        idle = self.pool.get_idle_size() if self.pool is not None else 0
+        return {
+            "available": self.pool is not None,
+            "size": size,
+            "max_size": self.max_size,
+            "in_use": size - idle,
+            "waiting": self._waiting,
+            "acquisitions": self._acquisitions,
+            "wait_seconds_total": self._wait_seconds_total,
+            "wait_seconds_max": self._wait_seconds_max,
+            "wait_seconds_avg": (
+                self._wait_seconds_total / self._acquisitions
+                if self._acquisitions
+                else 0.0
+            ),
+        }
+
+    async def fetch_school_persona_and_questions(
+        self, school_id: str
+    ) -> tuple[dict, list]:
+        """Fetch the active persona and top questions for a school."""
+        async with self.acquire() as conn:
+            with DB_QUERY_SECONDS.labels("persona").time():
+                persona_row = await conn.fetchrow(PERSONA_QUERY, school_id)
+            with DB_QUERY_SECONDS.labels("questions").time():
+                questions_rows = await conn.fetch(QUESTIONS_QUERY, school_id)
+        persona_data = dict(persona_row) if persona_row else {}
+        questions_data = [dict(row) for row in questions_rows]
+        return persona_data, questions_data
+
+    async def fetch_school_index_rows(self) -> list[dict]:
+        """Fetch every school with its active persona context for the school index."""
+        async with self.acquire() as conn:
+            with DB_QUERY_SECONDS.labels("school_index").time():
+                rows = await conn.fetch(SCHOOL_INDEX_QUERY)
+        return [dict(row) for row in rows]
+
+    async def insert_interview_session(
+        self, session_id: str, user_id: str, school_id: str, context: dict
+    ) -> None:
+        """Insert a new active interview session row."""
+        async with self.acquire() as conn:
+            with DB_QUERY_SECONDS.labels("insert_session").time():
+                await conn.execute(
+                    INSERT_SESSION_QUERY,
+                    session_id,
+                    user_id,
+                    school_id,
+                    "active",
+                    json.dumps(context.get("persona_data", {}), default=str),
+                    json.dumps(context.get("questions_data", []), default=str),
+                    datetime.utcnow(),
+                    context.get("user_agent", ""),
+                    context.get("ip_address", ""),
+                )
+
+    async def complete_interview_session(
+        self, session_id: str, total_turns: int, duration_seconds: int
+    ) -> None:
+        """Mark an interview session as completed."""
+        async with self.acquire() as conn:
+            with DB_QUERY_SECONDS.labels("complete_session").time():
+                await conn.execute(
+                    COMPLETE_SESSION_QUERY,
+                    "completed",
+                    total_turns,
+                    duration_seconds,
+                    datetime.utcnow(),
+                    100,
+                    session_id,
+                )
+
+    async def upsert_interview_evaluation(
+        self, session_id: str, user_id: str, evaluation_data: dict
+    ) -> None:
+        """Insert or replace the evaluation of an interview session."""
+        async with self.acquire() as conn:
+            with DB_QUERY_SECONDS.labels("upsert_evaluation").time():
+                await conn.execute(
+                    UPSERT_EVALUATION_QUERY,
+                    session_id,
+                    user_id,
+                    json.dumps(evaluation_data, default=str),
+                )
+
+    async def write_conversation_turns(self, records: list[TurnRecord]) -> None:
+        """Bulk insert buffered conversation turns with a single COPY."""
+        async with self.acquire() as conn:
+            with DB_QUERY_SECONDS.labels("write_turns").time():
+                try:
+                    await conn.copy_records_to_table(
+                        "ai_interview_conversation_turns",
+                        records=records,
+                        columns=TURN_COLUMNS,
+                    )
+                except asyncpg.PostgresError as e:
+                    # COPY is all-or-nothing, so one bad row (e.g. a temp session id)
+                    # would lose the whole batch. Fall back to inserting row by row.
+                    logging.warning(
+                        f"Bulk turn insert failed, retrying row by row: {e}"
+                    )
+                    for record in records:
+                        try:
+                            await conn.execute(INSERT_TURN_QUERY, *record)
+                        except asyncpg.PostgresError as row_error:
+                            logging.error(
+                                f"Failed to save conversation turn {record[1]} of session {record[0]}: {row_error}"
+                            )
+
+    async def _create_pool(self) -> None:
+        async with self._lock:
+            if self.pool is not None:
+                return
+            self.pool = await asyncpg.create_pool(
+                get_database_url(),
+                min_size=self.min_size,
+                max_size=self.max_size,
+                command_timeout=self.command_timeout,
+                init=self._init_connection,
+                server_settings={
+                    "jit": "off",  # Disable JIT for better compatibility
+                    "application_name": "mba_interview_agent",
+                },
+            )
+            logging.info(
+                f"Database connection pool created successfully "
+                f"(min_size={self.min_size}, max_size={self.max_size})"
+            )
+
+    @backoff.on_exception(backoff.expo, Exception, max_value=60)
+    async def _create_pool_with_retry(self) -> None:
+        await self._create_pool()
+
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection) -> None:
+        # Prime the statement cache of each new connection with the read
+        # queries every session setup runs. NULL matches no rows.
+        await conn.fetchrow(PERSONA_QUERY, None)
+        await conn.fetch(QUESTIONS_QUERY, None)
+
+
+db = Database(
+    min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+    max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+    command_timeout=float(os.getenv("DB_COMMAND_TIMEOUT", "30")),
+    acquire_timeout=float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", "10")),
+)
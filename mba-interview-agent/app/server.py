@@ -13,86 +13,143 @@
 # limitations under the License.
 
 import asyncio
-import json
+import functools
 import logging
 import os
-import re
+import secrets
+import time
 import uuid
-from collections.abc import Callable
-from typing import Any, Literal
+import weakref
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from datetime import datetime
+from typing import Any, Literal, cast, get_args
 
-import backoff
-from fastapi import FastAPI, WebSocket, HTTPException
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from google.cloud import logging as google_cloud_logging
 from google.genai import types
 from google.genai.types import LiveServerToolCall
 from pydantic import BaseModel
-from websockets.exceptions import ConnectionClosedError
-import asyncpg
-from datetime import datetime
-from urllib.parse import urlparse
+from websockets.exceptions import ConnectionClosed, ConnectionClosedError
+
+from app.agent import (
+    MODEL_ID,
+    create_personalized_config,
+    get_genai_client,
+    live_connect_config,
+    school_index,
+    tool_functions,
+    tool_timeouts,
+)
+from app.db import db
+from app.utils import metrics
+from app.utils.admission import AdmissionController, AdmissionRejected, RateLimiter
+from app.utils.audio_ingress import AudioIngress, IngressOverflowError, OverflowPolicy
+from app.utils.audio_recorder import AudioRecorder, FsyncPolicy, SessionRecording
+from app.utils.egress import EgressOverflowError, EgressPolicy, EgressQueue
+from app.utils.evaluation import EvaluationAccumulator
+from app.utils.injection_scanner import (
+    InjectionScanner,
+    compile_patterns,
+    pattern_index,
+)
+from app.utils.log_shipper import CloudLoggingBackend, JsonLinesBackend, LogShipper
+from app.utils.relay_codec import has_audio, split_server_message, turn_text
+from app.utils.school_cache import SchoolDataCache
+from app.utils.session_registry import ParkedSessions
+from app.utils.timings import PhaseTimer
+from app.utils.tool_executor import ToolExecutor
+from app.utils.turn_writer import TurnWriter
+
+# Create cloud clients in the background at startup instead of on the first
+# session. Startup itself never waits for them.
+WARMUP_CLIENTS = os.getenv("WARMUP_CLIENTS", "true").lower() == "true"
 
-from app.agent import MODEL_ID, genai_client, live_connect_config, tool_functions, create_personalized_config
 
-app = FastAPI()
+def warmup_clients() -> None:
+    """Create the Gemini and Cloud Logging clients; failures retry on first use."""
+    started = time.perf_counter()
+    try:
+        get_genai_client()
+        if isinstance(log_backend, CloudLoggingBackend):
+            log_backend.warmup()
+    except Exception as e:
+        logging.warning(f"Client warmup failed, will retry on first use: {e}")
+        return
+    logging.info(
+        f"Cloud clients ready in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start background workers on startup and drain them on shutdown."""
+    log_shipper.start()
+    if audio_recorder is not None:
+        audio_recorder.start()
+    warmup = (
+        asyncio.create_task(asyncio.to_thread(warmup_clients))
+        if WARMUP_CLIENTS
+        else None
+    )
+    await db.start()
+    turn_writer.start()
+    school_data_listener = asyncio.create_task(listen_for_school_data_changes())
+    school_index_refresher = asyncio.create_task(
+        school_index.run_refresh(
+            db.fetch_school_index_rows, SCHOOL_INDEX_REFRESH_SECONDS
+        )
+    )
+    try:
+        yield
+    finally:
+        for task in (school_data_listener, school_index_refresher):
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await parked_sessions.close()
+        await turn_writer.stop()
+        await db.close()
+        tool_executor.shutdown()
+        # Blocks until queued records are shipped, so keep it off the loop
+        await asyncio.to_thread(log_shipper.stop)
+        if audio_recorder is not None:
+            # Writes out and closes every open WAV file
+            await asyncio.to_thread(audio_recorder.stop)
+        if warmup is not None:
+            # A thread cannot be cancelled; give a stuck warmup a moment, then move on
+            await asyncio.wait({warmup}, timeout=5)
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
 )
-logging_client = google_cloud_logging.Client()
-logger = logging_client.logger(__name__)
-logging.basicConfig(level=logging.INFO)
 
-# Database connection pool
-db_pool = None
-
-async def get_db_connection():
-    """Get database connection from pool."""
-    global db_pool
-    if db_pool is None:
-        # Parse DATABASE_URL from environment or construct from Supabase URL
-        database_url = os.getenv("DATABASE_URL")
-        if not database_url:
-            supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL", "")
-            supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
-            db_password = os.getenv("SUPABASE_DB_PASSWORD", "")
-            
-            if supabase_url and db_password:
-                # Parse Supabase URL to extract connection details
-                parsed = urlparse(supabase_url)
-                if parsed.hostname:
-                    # Extract project reference from hostname (e.g., "abcdef.supabase.co")
-                    project_ref = parsed.hostname.split('.')[0]
-                    # Construct database hostname
-                    db_host = f"db.{project_ref}.supabase.co"
-                    database_url = f"postgresql://postgres:{db_password}@{db_host}:5432/postgres"
-                else:
-                    raise ValueError("Invalid NEXT_PUBLIC_SUPABASE_URL format")
-            else:
-                raise ValueError("Database connection configuration missing. Please set DATABASE_URL or NEXT_PUBLIC_SUPABASE_URL + SUPABASE_DB_PASSWORD")
-        
-        try:
-            db_pool = await asyncpg.create_pool(
-                database_url, 
-                min_size=1, 
-                max_size=10,
-                command_timeout=30,
-                server_settings={
-                    'jit': 'off',  # Disable JIT for better compatibility
-                    'application_name': 'mba_interview_agent'
-                }
-            )
-            logging.info("Database connection pool created successfully")
-        except Exception as e:
-            logging.error(f"Failed to create database connection pool: {e}")
-            # Set pool to None so we can try again later
-            db_pool = None
-            raise
-    
-    return await db_pool.acquire()
+# Structured logs are shipped in batches from a background thread.
+# LOG_BACKEND is "cloud" (Cloud Logging), "stdout", or a JSON lines file path.
+LOG_BACKEND = os.getenv("LOG_BACKEND", "cloud")
+if LOG_BACKEND == "cloud":
+    log_backend: CloudLoggingBackend | JsonLinesBackend = CloudLoggingBackend(__name__)
+else:
+    log_backend = JsonLinesBackend(None if LOG_BACKEND == "stdout" else LOG_BACKEND)
+log_shipper = LogShipper(
+    log_backend,
+    max_queue=int(os.getenv("LOG_MAX_QUEUE", "10000")),
+    max_batch=int(os.getenv("LOG_MAX_BATCH", "500")),
+    flush_interval=float(os.getenv("LOG_FLUSH_INTERVAL", "1.0")),
+)
+logging.basicConfig(level=logging.INFO)
 
 # Input validation patterns
 PROMPT_INJECTION_PATTERNS = [
@@ -105,133 +162,248 @@ PROMPT_INJECTION_PATTERNS = [
     r"roleplay\s+as",
 ]
 
+# One alternation over all patterns, shared by validate_input and the
+# per-session transcript scanners
+PROMPT_INJECTION_REGEX = compile_patterns(PROMPT_INJECTION_PATTERNS)
+
+
 def validate_input(text: str) -> bool:
     """Validate user input to prevent prompt injection attacks."""
     if not text or len(text.strip()) == 0:
         return False
-    
+
     # Check for prompt injection patterns
-    for pattern in PROMPT_INJECTION_PATTERNS:
-        if re.search(pattern, text, re.IGNORECASE):
-            logging.warning(f"Potential prompt injection detected: {pattern}")
-            return False
-    
+    match = PROMPT_INJECTION_REGEX.search(text)
+    if match:
+        pattern = PROMPT_INJECTION_PATTERNS[pattern_index(match)]
+        logging.warning(f"Potential prompt injection detected: {pattern}")
+        return False
+
     # Basic length and content checks
     if len(text) > 10000:  # Prevent extremely long inputs
         return False
-    
+
     return True
 
+
+# Personas and question banks only change on admin edits, so they are cached
+# per school and evicted by the NOTIFY triggers on both tables.
+school_data_cache = SchoolDataCache(
+    db.fetch_school_persona_and_questions,
+    ttl=float(os.getenv("SCHOOL_CACHE_TTL", "300")),
+    max_entries=int(os.getenv("SCHOOL_CACHE_MAX_ENTRIES", "512")),
+)
+
+# How often the get_school_info index is rebuilt from mba_schools
+SCHOOL_INDEX_REFRESH_SECONDS = float(os.getenv("SCHOOL_INDEX_REFRESH_SECONDS", "600"))
+
+
+async def listen_for_school_data_changes() -> None:
+    """Apply persona and question bank invalidations pushed by Postgres."""
+    await school_data_cache.listen(db.connect_listener)
+
+
 async def get_school_persona_and_questions(school_id: str) -> tuple[dict, list]:
-    """Fetch school persona and questions from database."""
+    """Get school persona and questions, served from cache when possible."""
     try:
-        conn = await get_db_connection()
-        try:
-            # Get school persona
-            persona_query = """
-                SELECT * FROM ai_interview_school_personas 
-                WHERE school_id = $1 AND is_active = true 
-                LIMIT 1
-            """
-            persona_row = await conn.fetchrow(persona_query, school_id)
-            
-            # Get school questions
-            questions_query = """
-                SELECT * FROM ai_interview_question_banks 
-                WHERE school_id = $1 AND is_active = true 
-                ORDER BY priority DESC LIMIT 10
-            """
-            questions_rows = await conn.fetch(questions_query, school_id)
-            
-            persona_data = dict(persona_row) if persona_row else {}
-            questions_data = [dict(row) for row in questions_rows] if questions_rows else []
-            
-            return persona_data, questions_data
-            
-        finally:
-            await db_pool.release(conn)
-        
+        return await school_data_cache.get(school_id)
     except Exception as e:
         logging.error(f"Failed to fetch school data: {e}")
         # Return default data
         return {
-            'interviewer_name': 'MBA Admissions Interviewer',
-            'interviewer_title': 'Admissions Committee Member',
-            'tone': 'warm_professional',
-            'greeting': 'Hello! I\'m excited to learn more about you and your interest in pursuing an MBA.',
-            'closing': 'Thank you for this wonderful conversation. We\'ll be in touch soon.',
-            'school_context': 'A top-tier business school focused on developing tomorrow\'s leaders',
-            'behavioral_notes': 'Be encouraging and supportive while maintaining professionalism'
+            "interviewer_name": "MBA Admissions Interviewer",
+            "interviewer_title": "Admissions Committee Member",
+            "tone": "warm_professional",
+            "greeting": "Hello! I'm excited to learn more about you and your interest in pursuing an MBA.",
+            "closing": "Thank you for this wonderful conversation. We'll be in touch soon.",
+            "school_context": "A top-tier business school focused on developing tomorrow's leaders",
+            "behavioral_notes": "Be encouraging and supportive while maintaining professionalism",
         }, []
 
+
 async def create_interview_session(user_id: str, school_id: str, context: dict) -> str:
     """Create a new interview session in database."""
     try:
         session_id = str(uuid.uuid4())
-        conn = await get_db_connection()
-        try:
-            await conn.execute("""
-                INSERT INTO ai_interview_agent_sessions 
-                (id, user_id, school_id, status, persona_used, questions_context, 
-                 started_at, user_agent, ip_address)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-            """, session_id, user_id, school_id, 'active', 
-                json.dumps(context.get('persona_data', {})),
-                json.dumps(context.get('questions_data', [])),
-                datetime.utcnow(),
-                context.get('user_agent', ''),
-                context.get('ip_address', ''))
-            
-            return session_id
-        finally:
-            await db_pool.release(conn)
-            
+        await db.insert_interview_session(session_id, user_id, school_id, context)
+        return session_id
+
     except Exception as e:
         logging.error(f"Failed to create interview session: {e}")
         # Return a temporary session ID
         return f"temp_session_{uuid.uuid4()}"
 
-async def save_conversation_turn(session_id: str, turn_number: int, speaker: str, message: str, metadata: dict = None):
-    """Save a conversation turn to database."""
-    try:
-        conn = await get_db_connection()
-        try:
-            await conn.execute("""
-                INSERT INTO ai_interview_conversation_turns 
-                (session_id, turn_number, speaker, message_text, message_metadata, timestamp)
-                VALUES ($1, $2, $3, $4, $5, $6)
-            """, session_id, turn_number, speaker, message, 
-                json.dumps(metadata or {}), datetime.utcnow())
-        finally:
-            await db_pool.release(conn)
-        
-    except Exception as e:
-        logging.error(f"Failed to save conversation turn: {e}")
 
-async def update_session_completion(session_id: str, total_turns: int, duration_seconds: int):
+# Per-process write-behind buffer for conversation turns
+turn_writer = TurnWriter(
+    db.write_conversation_turns,
+    max_batch_size=int(os.getenv("TURN_WRITER_BATCH_SIZE", "200")),
+    flush_interval=float(os.getenv("TURN_WRITER_FLUSH_INTERVAL", "1.0")),
+    max_pending=int(os.getenv("TURN_WRITER_MAX_PENDING", "10000")),
+)
+
+
+def save_conversation_turn(
+    session_id: str,
+    turn_number: int,
+    speaker: str,
+    message: str,
+    metadata: dict | None = None,
+):
+    """Queue a conversation turn for the next bulk write."""
+    if session_id.startswith("temp_"):
+        # No session row to reference; would fail the whole COPY batch
+        return
+    turn_writer.enqueue(session_id, turn_number, speaker, message, metadata)
+
+
+async def update_session_completion(
+    session_id: str, total_turns: int, duration_seconds: int
+):
     """Update session completion status in database."""
     try:
-        conn = await get_db_connection()
-        try:
-            await conn.execute("""
-                UPDATE ai_interview_agent_sessions 
-                SET status = $1, total_turns = $2, duration_seconds = $3, 
-                    completed_at = $4, completion_percentage = $5
-                WHERE id = $6
-            """, 'completed', total_turns, duration_seconds, 
-                datetime.utcnow(), 100, session_id)
-        finally:
-            await db_pool.release(conn)
-            
+        await db.complete_interview_session(session_id, total_turns, duration_seconds)
+
     except Exception as e:
         logging.error(f"Failed to update session completion: {e}")
 
 
+async def save_interview_evaluation(
+    session_id: str, user_id: str, evaluation_data: dict
+):
+    """Write the final evaluation of a session."""
+    if session_id.startswith("temp_"):
+        return
+    try:
+        await db.upsert_interview_evaluation(session_id, user_id, evaluation_data)
+    except Exception as e:
+        logging.error(f"Failed to save interview evaluation: {e}")
+
+
+def env_choice(name: str, choices: Any, default: str) -> str:
+    """Read an environment setting that must be one of a ``Literal``'s values."""
+    value = os.getenv(name, default)
+    allowed = get_args(choices)
+    if value not in allowed:
+        raise ValueError(f"{name} must be one of {', '.join(allowed)}, got {value!r}")
+    return value
+
+
+# Client audio is coalesced into frames of this many milliseconds before it is
+# sent to Gemini; at most INGRESS_MAX_QUEUE frames wait per session.
+INGRESS_FRAME_MS = int(os.getenv("INGRESS_FRAME_MS", "60"))
+INGRESS_MAX_QUEUE = int(os.getenv("INGRESS_MAX_QUEUE", "32"))
+INGRESS_OVERFLOW_POLICY = cast(
+    OverflowPolicy, env_choice("INGRESS_OVERFLOW_POLICY", OverflowPolicy, "drop_oldest")
+)
+
+# Outbound frames wait in a per-session queue drained by a writer task.
+EGRESS_MAX_BYTES = int(os.getenv("EGRESS_MAX_BYTES", str(2 * 1024 * 1024)))
+EGRESS_MAX_MESSAGES = int(os.getenv("EGRESS_MAX_MESSAGES", "500"))
+EGRESS_OVERFLOW_POLICY = cast(
+    EgressPolicy, env_choice("EGRESS_OVERFLOW_POLICY", EgressPolicy, "coalesce")
+)
+EGRESS_DRAIN_TIMEOUT = float(os.getenv("EGRESS_DRAIN_TIMEOUT", "2.0"))
+
+# Optional recording of both speakers for interview review, off unless
+# RECORD_AUDIO_DIR is set. The relay only copies PCM into per-session ring
+# buffers; WAV files are written by the recorder's own thread.
+RECORD_AUDIO_DIR = os.getenv("RECORD_AUDIO_DIR")
+audio_recorder = (
+    AudioRecorder(
+        RECORD_AUDIO_DIR,
+        ring_seconds=float(os.getenv("RECORD_RING_SECONDS", "4")),
+        segment_bytes=int(float(os.getenv("RECORD_SEGMENT_MB", "50")) * 1024 * 1024),
+        max_track_bytes=int(
+            float(os.getenv("RECORD_MAX_TRACK_MB", "500")) * 1024 * 1024
+        ),
+        fsync=cast(FsyncPolicy, env_choice("RECORD_FSYNC", FsyncPolicy, "segment")),
+        flush_interval=float(os.getenv("RECORD_FLUSH_INTERVAL", "0.25")),
+    )
+    if RECORD_AUDIO_DIR
+    else None
+)
+
+
+# Sessions whose client dropped wait this long for it to reconnect with its
+# resume token before the Gemini session is closed. 0 disables resumption.
+RESUME_GRACE_SECONDS = float(os.getenv("RESUME_GRACE_SECONDS", "30"))
+parked_sessions: "ParkedSessions[GeminiSession]" = ParkedSessions(
+    grace_seconds=RESUME_GRACE_SECONDS,
+    max_sessions=int(os.getenv("RESUME_MAX_PARKED_SESSIONS", "1000")),
+)
+
+# Live sessions admitted per worker; further sessions queue briefly and are
+# then turned away with a retry hint rather than degrading everyone's latency.
+admission = AdmissionController(
+    max_sessions=int(os.getenv("MAX_LIVE_SESSIONS", "40")),
+    max_waiting=int(os.getenv("ADMISSION_QUEUE_SIZE", "20")),
+    wait_timeout=float(os.getenv("ADMISSION_WAIT_SECONDS", "10")),
+    retry_after=float(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5")),
+)
+
+# Per-user and per-IP request budgets (requests per minute, bursts allowed up
+# to the same number). Per-IP budgets are looser since users share NATs.
+ws_user_limiter = RateLimiter(float(os.getenv("WS_USER_RATE_PER_MINUTE", "10")))
+ws_ip_limiter = RateLimiter(float(os.getenv("WS_IP_RATE_PER_MINUTE", "60")))
+feedback_user_limiter = RateLimiter(
+    float(os.getenv("FEEDBACK_USER_RATE_PER_MINUTE", "20"))
+)
+feedback_ip_limiter = RateLimiter(
+    float(os.getenv("FEEDBACK_IP_RATE_PER_MINUTE", "120"))
+)
+
+
+# Sessions with an open Gemini connection, attached or parked; read at scrape time
+live_sessions: "weakref.WeakSet[GeminiSession]" = weakref.WeakSet()
+metrics.ACTIVE_SESSIONS.set_function(lambda: admission.active)
+metrics.WAITING_SESSIONS.set_function(lambda: admission.waiting)
+metrics.PARKED_SESSIONS.set_function(lambda: len(parked_sessions))
+metrics.EGRESS_QUEUED_MESSAGES.set_function(
+    lambda: sum(s.egress.depth for s in list(live_sessions))
+)
+metrics.EGRESS_QUEUED_BYTES.set_function(
+    lambda: sum(s.egress.queued_bytes for s in list(live_sessions))
+)
+
+
+# Proxies in front of the server that append the peer address to
+# X-Forwarded-For; Cloud Run's front end is one. Entries left of the ones they
+# added are set by the client and never trusted. 0 ignores the header.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+
+
+def client_ip(headers: Any, client: Any, trusted_hops: int = TRUSTED_PROXY_HOPS) -> str:
+    """The caller's address as recorded by the outermost trusted proxy."""
+    if trusted_hops > 0:
+        hops = [hop.strip() for hop in headers.get("x-forwarded-for", "").split(",")]
+        hops = [hop for hop in hops if hop]
+        if len(hops) >= trusted_hops:
+            return hops[-trusted_hops]
+    return client.host if client is not None else "unknown"
+
+
+# Shared by all sessions so tool threads are bounded per process
+tool_executor = ToolExecutor(
+    max_workers=int(os.getenv("TOOL_MAX_WORKERS", "8")),
+    default_timeout=float(os.getenv("TOOL_TIMEOUT_SECONDS", "10")),
+    timeouts=tool_timeouts,
+)
+
+
 class GeminiSession:
     """Manages bidirectional communication between a client and the Gemini model."""
 
+    egress: EgressQueue
+
     def __init__(
-        self, session: Any, websocket: WebSocket, tool_functions: dict[str, Callable]
+        self,
+        session: Any,
+        websocket: WebSocket,
+        tool_functions: dict[str, Callable],
+        timer: PhaseTimer | None = None,
+        binary_audio: bool = False,
+        exit_stack: AsyncExitStack | None = None,
     ) -> None:
         """Initialize the Gemini session.
 
@@ -239,76 +411,303 @@ class GeminiSession:
             session: The Gemini session
             websocket: The client websocket connection
             tool_functions: Dictionary of available tool functions
+            timer: Setup phase timer started when the socket was accepted
+            binary_audio: Send audio as binary frames and other content as JSON
+                text instead of one JSON message per Gemini message
+            exit_stack: Owns the Gemini connection; closed with the session
         """
         self.session = session
-        self.websocket = websocket
+        self._exit_stack = exit_stack
+        # Lets a reconnecting client reattach within the grace window
+        self.resume_token = secrets.token_urlsafe(16)
         self.run_id = "n/a"
         self.user_id = "n/a"
         self.school_id = None
-        self.interview_session_id = None
-        self.tool_functions = tool_functions
-        self._tool_tasks: list[asyncio.Task] = []
+        self.interview_session_id: str | None = None
+        self._session_row: asyncio.Task[str] | None = None
+        self._setup_task: asyncio.Task | None = None
+        self.evaluation = EvaluationAccumulator()
+        self.injection_scanner = InjectionScanner(
+            PROMPT_INJECTION_REGEX, PROMPT_INJECTION_PATTERNS
+        )
+        # Notes feed this session's evaluation instead of the stateless tool
+        self.tool_functions: dict[str, Callable] = {
+            **tool_functions,
+            "take_interview_notes": self._take_interview_notes,
+        }
+        self._tool_tasks: set[asyncio.Task] = set()
         self.turn_counter = 0
         self.session_start_time = datetime.utcnow()
+        self.ingress = AudioIngress(
+            session._ws.send,
+            frame_ms=INGRESS_FRAME_MS,
+            max_queue=INGRESS_MAX_QUEUE,
+            overflow_policy=INGRESS_OVERFLOW_POLICY,
+        )
+        self._ingress_task: asyncio.Task | None = None
+        self.recording: SessionRecording | None = None
+        if audio_recorder is not None:
+            self.recording = audio_recorder.open(
+                f"{self.session_start_time:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+            )
+            self.ingress.tap = self.recording.candidate.write
+        self.reader: asyncio.Task | None = None
+        self._closed = False
+        # Whether this session holds an admission slot, returned on close
+        self.admitted = False
+        # Time to first response runs from the latest candidate input (text,
+        # or transcribed speech) to the first model output after a turn ends
+        self._last_input_at = time.monotonic()
+        self._awaiting_response = True
+        live_sessions.add(self)
+        self.attach(websocket, timer or PhaseTimer(), binary_audio)
+
+    def attach(
+        self, websocket: WebSocket, timer: PhaseTimer, binary_audio: bool
+    ) -> None:
+        """Connect a client socket, either the first one or a resuming one."""
+        self.websocket: WebSocket | None = websocket
+        self.timer = timer
+        self.binary_audio = binary_audio
+        # Each socket gets its own queue; frames queued for a dropped socket
+        # are never replayed
+        self.egress = EgressQueue(
+            functools.partial(self._send_to_client, websocket),
+            max_bytes=EGRESS_MAX_BYTES,
+            max_messages=EGRESS_MAX_MESSAGES,
+            overflow_policy=EGRESS_OVERFLOW_POLICY,
+        )
 
-    async def receive_audio_from_client(self) -> None:
-        """Listen for and process audio messages from the client."""
+    def start(self) -> None:
+        """Start the Gemini-side tasks, which outlive individual client sockets."""
+        self._ingress_task = asyncio.create_task(self.ingress.run())
+        self.reader = asyncio.create_task(self.receive_from_gemini())
+
+    @property
+    def gemini_closed(self) -> bool:
+        """Whether the Gemini connection has ended and the session cannot resume."""
+        return self.reader is None or self.reader.done()
+
+    async def serve(self) -> None:
+        """Relay between the attached client and Gemini until the client goes away."""
+        writer = asyncio.create_task(self.egress.run())
+        try:
+            await self.receive_audio_from_client(writer)
+        finally:
+            self.websocket = None
+            self.egress.close()
+            try:
+                await asyncio.wait_for(writer, timeout=EGRESS_DRAIN_TIMEOUT)
+            except Exception:
+                writer.cancel()
+            logging.info(f"Egress stats for {self.user_id}: {self.egress.stats()}")
+
+    async def close(self) -> None:
+        """End the Gemini session for good and persist the interview."""
+        if self._closed:
+            return
+        self._closed = True
+        live_sessions.discard(self)
+        tasks = [
+            t
+            for t in (
+                self.reader,
+                self._ingress_task,
+                self._setup_task,
+                *self._tool_tasks,
+            )
+            if t is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._exit_stack is not None:
+            try:
+                await self._exit_stack.aclose()
+            except Exception as e:
+                logging.warning(
+                    f"Error closing Gemini session for {self.user_id}: {e!s}"
+                )
+        if self.admitted:
+            self.admitted = False
+            admission.release()
+        if audio_recorder is not None and self.recording is not None:
+            self.recording.metadata.update(
+                run_id=self.run_id,
+                user_id=self.user_id,
+                school_id=self.school_id,
+                interview_session_id=self.interview_session_id,
+                started_at=self.session_start_time.isoformat(),
+            )
+            audio_recorder.close(self.recording)
+        await self._cleanup_session()
+
+    async def _close_client(self, code: int, reason: str = "") -> None:
+        """Close the attached client socket, if any."""
+        websocket = self.websocket
+        if websocket is not None:
+            with suppress(RuntimeError):
+                await websocket.close(code=code, reason=reason)
+
+    async def receive_audio_from_client(self, writer: asyncio.Task) -> None:
+        """Listen for client messages and feed them through the ingress stage.
+
+        Returns when the client disconnects, its socket fails, or the Gemini
+        side ends and closes the socket.
+        """
+        websocket = self.websocket
+        if websocket is None:
+            return
         try:
             while True:
-                audio_chunk = await self.websocket.receive_bytes()
-                # Directly forward the raw audio bytes to Gemini
-                await self.session._ws.send(audio_chunk)
-        except ConnectionClosedError as e:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                if message.get("bytes") is not None:
+                    # Binary frames carry raw 16 kHz PCM16 audio
+                    metrics.UPSTREAM_MESSAGES.inc()
+                    metrics.UPSTREAM_BYTES.inc(len(message["bytes"]))
+                    self.ingress.push_audio(message["bytes"])
+                elif message.get("text") is not None:
+                    metrics.UPSTREAM_MESSAGES.inc()
+                    metrics.UPSTREAM_BYTES.inc(len(message["text"]))
+                    self._last_input_at = time.monotonic()
+                    self.ingress.push_client_message(message["text"])
+                if self._ingress_task is not None and self._ingress_task.done():
+                    # Surface upstream send failures
+                    await self._ingress_task
+                    break
+                if writer.done():
+                    # Surface client send failures
+                    await writer
+                    break
+        except IngressOverflowError as e:
+            logging.warning(
+                f"Closing client {self.user_id}: {e.reason} ({self.ingress.stats()})"
+            )
+            await self._close_client(1013, e.reason)
+        except (ConnectionClosedError, WebSocketDisconnect) as e:
             logging.warning(f"Client {self.user_id} closed connection: {e}")
-            await self._cleanup_session()
         except Exception as e:
             logging.error(f"Error receiving audio from client {self.user_id}: {e!s}")
-            # The break is implicit, as the gather call in the endpoint will terminate.
+            await self._close_client(1011, "Internal server error")
+
+    async def _post_connection_setup(
+        self,
+        setup_data: dict,
+        persona_data: dict,
+        session_row: asyncio.Task[str] | None = None,
+    ):
+        """Handle setup tasks after connection and personalization.
 
-    async def _post_connection_setup(self, setup_data: dict, persona_data: dict, questions_data: list):
-        """Handle setup tasks after connection and personalization."""
+        The greeting goes out right away. The interview session row, which the
+        endpoint started inserting before connecting to Gemini, is awaited in
+        the background so it never delays the first audio.
+        """
         self.run_id = setup_data.get("run_id", "n/a")
         self.user_id = setup_data.get("user_id", "n/a")
-        
+
         context = setup_data.get("context", {})
         self.school_id = context.get("school_id")
-        
+        self._session_row = session_row
+
         if self.school_id:
-            # Create interview session in database
-            session_context = {
-                'persona_data': persona_data,
-                'questions_data': questions_data,
-                'user_agent': context.get('user_agent', ''),
-                'ip_address': context.get('ip_address', '')
-            }
-            self.interview_session_id = await create_interview_session(
-                self.user_id, self.school_id, session_context
+            # Ask the model to open with the persona's greeting
+            greeting_message = persona_data.get(
+                "greeting", "Hello! I'm excited to learn more about you."
             )
-            
-            # Send initial greeting through the session
-            greeting_message = persona_data.get('greeting', 'Hello! I\'m excited to learn more about you.')
-            await self.session.send(
-                types.LiveServerMessage(
-                    server_content=types.ServerContent(
-                        model_turn=types.ModelTurn(parts=[types.Part(text=greeting_message)])
-                    )
-                )
+            await self.session.send_client_content(
+                turns=types.Content(
+                    role="user",
+                    parts=[
+                        types.Part(
+                            text=f'Begin the interview now with your greeting: "{greeting_message}"'
+                        )
+                    ],
+                ),
+                turn_complete=True,
+            )
+            self.timer.mark("greeting_sent")
+            self._last_input_at = time.monotonic()
+            logging.info(
+                f"Successfully sent personalized greeting for school {self.school_id}"
             )
-            logging.info(f"Successfully sent personalized greeting for school {self.school_id}")
-        
-        logger.log_struct(
-            {**setup_data, "type": "setup", "interview_session_id": self.interview_session_id}, 
-            severity="INFO"
+
+        self._setup_task = asyncio.create_task(self._finish_setup(setup_data))
+
+    async def _finish_setup(self, setup_data: dict) -> None:
+        """Wait for the session row and log the completed setup."""
+        await self._get_interview_session_id()
+        log_shipper.log_struct(
+            {
+                **setup_data,
+                "type": "setup",
+                "interview_session_id": self.interview_session_id,
+                "setup_timings_ms": self.timer.as_dict(),
+            },
+            severity="INFO",
+        )
+
+    async def _get_interview_session_id(self) -> str | None:
+        """Return the interview session id once its row has been created."""
+        if self._session_row is not None:
+            # Shielded: cancelling the setup task must not cancel the insert
+            self.interview_session_id = await asyncio.shield(self._session_row)
+            self._session_row = None
+            self.timer.mark("session_row_created")
+        return self.interview_session_id
+
+    def _record_first_audio(self) -> None:
+        """Mark and log time to first audio byte for this connection."""
+        first_audio_ms = self.timer.mark("first_audio")
+        logging.info(
+            f"Time to first audio for {self.user_id}: {first_audio_ms:.0f} ms "
+            f"(phases: {self.timer.as_dict()})"
         )
 
     async def _cleanup_session(self):
         """Clean up session when connection ends."""
-        if self.interview_session_id:
+        logging.info(f"Ingress stats for {self.user_id}: {self.ingress.stats()}")
+        interview_session_id = await self._get_interview_session_id()
+        if interview_session_id:
+            await turn_writer.flush_session(interview_session_id)
             duration = (datetime.utcnow() - self.session_start_time).total_seconds()
             await update_session_completion(
-                self.interview_session_id, 
-                self.turn_counter, 
-                int(duration)
+                interview_session_id, self.turn_counter, int(duration)
+            )
+            await save_interview_evaluation(
+                interview_session_id,
+                self.user_id,
+                self.evaluation.evaluation_data(self.turn_counter, int(duration)),
+            )
+
+    async def _take_interview_notes(
+        self, observation: str, dimension: str | None = None, rating: int | None = None
+    ) -> dict:
+        """Record an interviewer note against the turn in progress."""
+        filed_under = self.evaluation.add_note(
+            observation, self.turn_counter + 1, dimension, rating
+        )
+        return {
+            "output": f"Note recorded under {filed_under or 'general'}: {observation}"
+        }
+
+    def _scan_transcription(self, text: str | None) -> None:
+        """Scan a chunk of the candidate's transcript for prompt injection."""
+        for hit in self.injection_scanner.feed(text or ""):
+            logging.warning(
+                f"Potential prompt injection from {self.user_id}: {hit.pattern}"
+            )
+            log_shipper.log_struct(
+                {
+                    "type": "prompt_injection",
+                    "run_id": self.run_id,
+                    "user_id": self.user_id,
+                    "interview_session_id": self.interview_session_id,
+                    "turn": self.turn_counter + 1,
+                    **hit.as_dict(),
+                },
+                severity="WARNING",
             )
 
     def _get_func(self, action_label: str | None) -> Callable | None:
@@ -320,127 +719,378 @@ class GeminiSession:
     async def _handle_tool_call(
         self, session: Any, tool_call: LiveServerToolCall
     ) -> None:
-        """Process tool calls from Gemini and send back responses."""
+        """Run the calls of one tool request concurrently and send back one response."""
         if tool_call.function_calls is None:
             logging.debug("No function calls in tool_call")
             return
 
         for fc in tool_call.function_calls:
             logging.debug(f"Calling tool function: {fc.name} with args: {fc.args}")
-            func = self._get_func(fc.name)
-            if func is None:
-                logging.error(f"Function {fc.name} not found")
-                continue
-            args = fc.args if fc.args is not None else {}
-
-            # Handle both async and sync functions appropriately
-            if asyncio.iscoroutinefunction(func):
-                # Function is already async
-                response = await func(**args)
-            else:
-                # Run sync function in a thread pool to avoid blocking
-                response = await asyncio.to_thread(func, **args)
+        responses = await asyncio.gather(
+            *(
+                tool_executor.run(fc.name, self._get_func(fc.name), fc.args or {})
+                for fc in tool_call.function_calls
+            )
+        )
 
-            tool_response = types.LiveClientToolResponse(
-                function_responses=[
-                    types.FunctionResponse(name=fc.name, id=fc.id, response=response)
-                ]
+        tool_response = types.LiveClientToolResponse(
+            function_responses=[
+                types.FunctionResponse(name=fc.name, id=fc.id, response=response)
+                for fc, response in zip(
+                    tool_call.function_calls, responses, strict=True
+                )
+            ]
+        )
+        logging.debug(f"Tool response: {tool_response}")
+        await session.send(input=tool_response)
+
+    def _forward_to_client(self, result: types.LiveServerMessage) -> bool:
+        """Queue one Gemini message for the client.
+
+        Returns:
+            True if the message carried audio.
+        """
+        if result.server_content and result.server_content.interrupted:
+            # Audio still queued was generated before the interruption
+            self.egress.drop_audio()
+
+        if not self.binary_audio:
+            # Forward the raw message bytes to the client
+            carries_audio = has_audio(result)
+            self.egress.put(
+                result.model_dump_json(exclude_none=True).encode("utf-8"), carries_audio
             )
-            logging.debug(f"Tool response: {tool_response}")
-            await session.send(input=tool_response)
+            return carries_audio
 
+        frames, payload = split_server_message(result)
+        for frame in frames:
+            self.egress.put(frame, carries_audio=True)
+        if payload is not None:
+            self.egress.put(payload)
+        return bool(frames)
+
+    def _record_interviewer(self, result: types.LiveServerMessage) -> None:
+        """Copy the model's audio into this session's recording."""
+        model_turn = result.server_content.model_turn if result.server_content else None
+        if self.recording is None or model_turn is None or not model_turn.parts:
+            return
+        for part in model_turn.parts:
+            blob = part.inline_data
+            if (
+                blob is not None
+                and blob.data
+                and blob.mime_type
+                and blob.mime_type.startswith("audio/pcm")
+            ):
+                self.recording.interviewer.write(blob.data)
+
+    @staticmethod
+    async def _send_to_client(websocket: WebSocket, payload: bytes | str) -> None:
+        """Write one queued frame to a client socket."""
+        metrics.DOWNSTREAM_MESSAGES.inc()
+        metrics.DOWNSTREAM_BYTES.inc(len(payload))
+        if isinstance(payload, bytes):
+            await websocket.send_bytes(payload)
+        else:
+            await websocket.send_text(payload)
 
     async def receive_from_gemini(self) -> None:
-        """Listen for and process messages from Gemini without blocking."""
+        """Listen for and process messages from Gemini without blocking.
+
+        Runs for the whole Gemini session, across client reconnects. Client
+        sends happen on the attached socket's writer task, so a slow client
+        only grows its own egress queue and never stalls this loop. Messages
+        arriving while no client is attached are not forwarded.
+        """
+        close_code, close_reason = 1000, "Session ended"
         try:
-            async for result in self.session:
-                # Forward the raw message bytes to the client
-                await self.websocket.send_bytes(result.model_dump_json(exclude_none=True).encode("utf-8"))
-                
-                # Also, process the message for tool calls and logging
-                if result.tool_call:
-                    tool_call = LiveServerToolCall.model_validate(result.tool_call)
-                    task = asyncio.create_task(
-                        self._handle_tool_call(self.session, tool_call)
-                    )
-                    self._tool_tasks.append(task)
-                
-                if result.server_content and result.server_content.turn_complete and self.interview_session_id:
-                    model_turn = result.server_content.model_turn
-                    if model_turn:
-                        self.turn_counter += 1
-                        turn_text = "".join(part.text for part in model_turn.parts if part.text)
-                        
-                        if turn_text.strip():
-                            await save_conversation_turn(
-                                self.interview_session_id,
-                                self.turn_counter,
-                                "agent",
-                                turn_text,
-                                {"response_id": str(uuid.uuid4())}
+            while True:
+                # receive() ends after each complete model turn
+                async for result in self.session.receive():
+                    if (
+                        self._awaiting_response
+                        and result.server_content
+                        and result.server_content.model_turn
+                    ):
+                        self._awaiting_response = False
+                        metrics.TIME_TO_FIRST_RESPONSE_SECONDS.observe(
+                            time.monotonic() - self._last_input_at
+                        )
+
+                    if self.recording is not None:
+                        self._record_interviewer(result)
+
+                    if self.websocket is not None:
+                        try:
+                            sent_audio = self._forward_to_client(result)
+                        except EgressOverflowError as e:
+                            logging.warning(
+                                f"Closing slow client {self.user_id}: {e.reason} ({self.egress.stats()})"
                             )
-                            
+                            await self._close_client(1013, e.reason)
+                            sent_audio = False
+                        if sent_audio and "first_audio" not in self.timer.phases:
+                            self._record_first_audio()
+
+                    # Also, process the message for tool calls and logging
+                    if result.tool_call:
+                        tool_call = LiveServerToolCall.model_validate(result.tool_call)
+                        task = asyncio.create_task(
+                            self._handle_tool_call(self.session, tool_call)
+                        )
+                        self._tool_tasks.add(task)
+                        task.add_done_callback(self._tool_tasks.discard)
+
+                    if (
+                        result.server_content
+                        and result.server_content.input_transcription
+                    ):
+                        self._last_input_at = time.monotonic()
+                        self._scan_transcription(
+                            result.server_content.input_transcription.text
+                        )
+
+                    if result.server_content and result.server_content.turn_complete:
+                        self._awaiting_response = True
+
+                    if (
+                        result.server_content
+                        and result.server_content.turn_complete
+                        and (
+                            interview_session_id
+                            := await self._get_interview_session_id()
+                        )
+                    ):
+                        model_turn = result.server_content.model_turn
+                        if model_turn:
+                            self.turn_counter += 1
+                            text = turn_text(model_turn)
+
+                            if text.strip():
+                                save_conversation_turn(
+                                    interview_session_id,
+                                    self.turn_counter,
+                                    "agent",
+                                    text,
+                                    {"response_id": str(uuid.uuid4())},
+                                )
+        except ConnectionClosed as e:
+            logging.info(f"Gemini session for {self.user_id} closed: {e}")
         except Exception as e:
             logging.error(f"Error in receive_from_gemini: {e!s}", exc_info=True)
-            if not self.websocket.client_state == 'DISCONNECTED':
-                await self.websocket.close(code=1011, reason="Internal server error")
+            close_code, close_reason = 1011, "Internal server error"
+        finally:
+            # Without Gemini there is nothing to resume, so end the client loop
+            await self._close_client(close_code, close_reason)
+
+
+async def release_session(
+    gemini_session: GeminiSession, resumable: bool = True
+) -> None:
+    """Park a session whose client went away, or close it if it cannot resume."""
+    if resumable and RESUME_GRACE_SECONDS > 0 and not gemini_session.gemini_closed:
+        parked_sessions.park(
+            gemini_session.resume_token,
+            gemini_session.user_id,
+            gemini_session,
+            gemini_session.close,
+            done=gemini_session.reader,
+        )
+        logging.info(
+            f"Parked session of {gemini_session.user_id} for {RESUME_GRACE_SECONDS:.0f}s "
+            f"({len(parked_sessions)} parked)"
+        )
+    else:
+        await gemini_session.close()
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
-    """Handle new websocket connections."""
+    """Handle new websocket connections.
+
+    Setup is pipelined: the interview session row is inserted while the
+    Gemini connection is opened and the greeting is sent, so the only waits
+    before the first audio are the persona lookup and the Gemini connect.
+
+    A setup message carrying the ``resume_token`` of a session whose client
+    dropped within the last ``RESUME_GRACE_SECONDS`` skips all of that and
+    reattaches to the still-open Gemini session, keeping its turn numbering.
+
+    New sessions need an admission slot before anything else is done for
+    them. Clients over their connection budget, or arriving while the wait
+    queue is full, get a status message with ``retry_after`` and are closed
+    with 1013 (try again later).
+    """
+    timer = PhaseTimer(on_mark=metrics.observe_setup_phase)
     await websocket.accept()
+    timer.mark("accepted")
     session = None
     gemini_session = None
-    
+    session_row = None
+    resumable = True
+    slot_held = False
+    # Owns the Gemini connection so it can outlive this handler while parked
+    exit_stack = AsyncExitStack()
+
     try:
         # Phase 1: Receive and process the setup message to configure the session.
         setup_data = await websocket.receive_json()
+        timer.mark("setup_received")
         if "setup" not in setup_data:
             logging.error("Protocol Error: First message was not 'setup'.")
             await websocket.close(code=1002, reason="Protocol Error")
             return
 
         setup_info = setup_data["setup"]
-        context = setup_info.get("context", {})
-        school_id = context.get("school_id")
+        ip = client_ip(websocket.headers, websocket.client)
+        ws_ip_limiter.check(f"ip:{ip}")
+        # Anonymous clients get a per-user budget of their own, not a shared one
+        user_id = setup_info.get("user_id")
+        ws_user_limiter.check(f"user:{user_id}" if user_id else f"anonymous:{ip}")
+        # Clients opt into the binary audio relay from the setup message
+        binary_audio = bool(setup_info.get("binary_audio", False))
 
-        persona_data, questions_data = {}, []
-        if school_id:
-            persona_data, questions_data = await get_school_persona_and_questions(school_id)
-            config = create_personalized_config(persona_data, questions_data)
+        resume_token = setup_info.get("resume_token")
+        if resume_token:
+            gemini_session = parked_sessions.claim(
+                resume_token, setup_info.get("user_id", "n/a")
+            )
+            if gemini_session is None:
+                logging.info("Resume token unknown or expired, starting a new session.")
+
+        if gemini_session is not None:
+            gemini_session.attach(websocket, timer, binary_audio)
+            resumed_ms = timer.mark("resumed")
+            logging.info(
+                f"Resumed session of {gemini_session.user_id} at turn "
+                f"{gemini_session.turn_counter} in {resumed_ms:.0f} ms"
+            )
+            await websocket.send_json(
+                {
+                    "type": "status",
+                    "message": "Session resumed. Ready for audio.",
+                    "binary_audio": binary_audio,
+                    "resume_token": gemini_session.resume_token,
+                    "resumed": True,
+                    "turn": gemini_session.turn_counter,
+                }
+            )
         else:
-            # Fallback to default configuration if no school_id is provided
-            config = live_connect_config
-            logging.warning("No school_id provided, using default config.")
-
-        # Phase 2: Connect to Gemini with the appropriate configuration.
-        async with genai_client.aio.live.connect(model=MODEL_ID, config=config) as session:
-            await websocket.send_json({"type": "status", "message": "Agent connected. Ready for audio."})
-            
+            # Take an admission slot before any database work, so shed and
+            # queued clients cost nothing but the wait
+            async def report_queue_position(position: int) -> None:
+                await websocket.send_json(
+                    {
+                        "type": "status",
+                        "message": f"Server busy, waiting for a free slot (position {position}).",
+                        "queued": True,
+                        "position": position,
+                    }
+                )
+
+            await admission.acquire(report_queue_position)
+            slot_held = True
+            timer.mark("admitted")
+
+            context = setup_info.get("context", {})
+            school_id = context.get("school_id")
+
+            persona_data = {}
+            if school_id:
+                persona_data, questions_data = await get_school_persona_and_questions(
+                    school_id
+                )
+                timer.mark("persona_loaded")
+                config = create_personalized_config(persona_data, questions_data)
+                timer.mark("config_built")
+
+                # The session row does not feed the Gemini connection, so insert it
+                # concurrently with the connect and greeting.
+                session_row = asyncio.create_task(
+                    create_interview_session(
+                        setup_info.get("user_id", "n/a"),
+                        school_id,
+                        {
+                            "persona_data": persona_data,
+                            "questions_data": questions_data,
+                            "user_agent": context.get("user_agent", ""),
+                            "ip_address": context.get("ip_address", ""),
+                        },
+                    )
+                )
+            else:
+                # Fallback to default configuration if no school_id is provided
+                config = live_connect_config
+                logging.warning("No school_id provided, using default config.")
+
+            # Phase 2: Connect to Gemini with the appropriate configuration.
+            # Off the loop, since the first call may still be resolving credentials
+            genai_client = await asyncio.to_thread(get_genai_client)
+            session = await exit_stack.enter_async_context(
+                genai_client.aio.live.connect(model=MODEL_ID, config=config)
+            )
+            timer.mark("gemini_connected")
+
             gemini_session = GeminiSession(
-                session=session, websocket=websocket, tool_functions=tool_functions
+                session=session,
+                websocket=websocket,
+                tool_functions=tool_functions,
+                timer=timer,
+                binary_audio=binary_audio,
+                exit_stack=exit_stack,
+            )
+            gemini_session.admitted, slot_held = True, False
+            await websocket.send_json(
+                {
+                    "type": "status",
+                    "message": "Agent connected. Ready for audio.",
+                    "binary_audio": binary_audio,
+                    "resume_token": gemini_session.resume_token,
+                }
             )
-            
-            await gemini_session._post_connection_setup(setup_info, persona_data, questions_data)
-
-            # Phase 3: Start bidirectional streaming.
-            logging.info("Starting bidirectional communication.")
-            await asyncio.gather(
-                gemini_session.receive_audio_from_client(),
-                gemini_session.receive_from_gemini(),
+
+            await gemini_session._post_connection_setup(
+                setup_info, persona_data, session_row
             )
+            gemini_session.start()
+
+        # Phase 3: Start bidirectional streaming.
+        logging.info("Starting bidirectional communication.")
+        await gemini_session.serve()
 
+    except AdmissionRejected as e:
+        logging.warning(
+            f"Rejected websocket connection: {e.reason} (retry after {e.retry_after}s)"
+        )
+        resumable = False
+        with suppress(RuntimeError, WebSocketDisconnect):
+            await websocket.send_json(
+                {
+                    "type": "status",
+                    "message": f"{e.reason}. Please retry shortly.",
+                    "retry_after": e.retry_after,
+                }
+            )
+            await websocket.close(code=1013, reason=e.reason)
     except ConnectionClosedError:
         logging.warning("Client closed connection.")
-        if gemini_session:
-            await gemini_session._cleanup_session()
     except Exception as e:
-        logging.error(f"An error occurred in the websocket endpoint: {e!s}", exc_info=True)
-        if not websocket.client_state == 'DISCONNECTED':
+        logging.error(
+            f"An error occurred in the websocket endpoint: {e!s}", exc_info=True
+        )
+        resumable = False
+        if not websocket.client_state == "DISCONNECTED":
             await websocket.close(code=1011, reason="Internal Server Error")
-        if gemini_session:
-            await gemini_session._cleanup_session()
+    finally:
+        if gemini_session is not None:
+            await release_session(gemini_session, resumable)
+        else:
+            if session_row is not None:
+                # Setup failed before the session took ownership of the row
+                session_row.cancel()
+            await exit_stack.aclose()
+            if slot_held:
+                admission.release()
 
 
 @app.get("/health")
@@ -449,10 +1099,22 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "mba-interview-agent",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow().isoformat(),
+        "database": db.stats(),
+        "tools": tool_executor.stats(),
+        "admission": admission.stats(),
+        "logs": log_shipper.stats(),
+        "recording": audio_recorder.stats() if audio_recorder is not None else None,
     }
 
 
+@app.get("/metrics")
+async def metrics_endpoint() -> Response:
+    """Prometheus metrics for this worker."""
+    payload, content_type = metrics.render()
+    return Response(content=payload, media_type=content_type)
+
+
 class FeedbackRequest(BaseModel):
     run_id: str
     user_id: str
@@ -461,9 +1123,18 @@ class FeedbackRequest(BaseModel):
 
 
 @app.post("/feedback")
-async def log_feedback(feedback: FeedbackRequest) -> dict[str, str]:
+async def log_feedback(feedback: FeedbackRequest, request: Request) -> dict[str, str]:
     """Log user feedback."""
-    logger.log_struct(
+    try:
+        feedback_ip_limiter.check(f"ip:{client_ip(request.headers, request.client)}")
+        feedback_user_limiter.check(f"user:{feedback.user_id}")
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=e.reason,
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    log_shipper.log_struct(
         {
             "type": "feedback",
             "run_id": feedback.run_id,
@@ -478,4 +1149,5 @@ async def log_feedback(feedback: FeedbackRequest) -> dict[str, str]:
 
 if __name__ == "__main__":
     import uvicorn
+
     uvicorn.run(app, host="0.0.0.0", port=8000)
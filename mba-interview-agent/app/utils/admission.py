@@ -0,0 +1,204 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; ``retry_after`` is a hint in seconds."""
+
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class RateLimiter:
+    """Token buckets keyed by user or client address.
+
+    Each key may make ``burst`` requests at once and regains
+    ``per_minute / 60`` tokens per second. The least recently seen keys are
+    forgotten past ``max_keys``, which only makes those keys more lenient.
+    """
+
+    def __init__(
+        self, per_minute: float, burst: int | None = None, max_keys: int = 10000
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            per_minute: Sustained requests allowed per key per minute
+            burst: Requests allowed at once; defaults to ``per_minute``
+            max_keys: Buckets kept in memory
+        """
+        self.rate = per_minute / 60
+        self.burst = burst if burst is not None else max(1, int(per_minute))
+        self.max_keys = max_keys
+        # key -> (tokens, last refill time)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.rejected = 0
+
+    def check(self, key: str, reason: str = "Too many requests") -> None:
+        """Take a token for ``key``.
+
+        Raises:
+            AdmissionRejected: If the bucket is empty.
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            self.rejected += 1
+            retry_after = (1 - tokens) / self.rate if self.rate > 0 else 60
+            raise AdmissionRejected(reason, retry_after)
+        self._buckets[key] = (tokens - 1, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+
+class AdmissionController:
+    """Caps concurrent live sessions per worker with a short FIFO wait queue.
+
+    Up to ``max_sessions`` callers hold a slot at once. Further callers wait
+    in arrival order, at most ``max_waiting`` of them and for at most
+    ``wait_timeout`` seconds; anyone beyond that is rejected immediately with
+    a retry hint, so overload sheds new sessions instead of slowing every
+    running one. A released slot passes directly to the longest waiter.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 40,
+        max_waiting: int = 20,
+        wait_timeout: float = 10.0,
+        retry_after: float = 5.0,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            max_sessions: Live sessions this worker runs at once
+            max_waiting: Callers allowed to queue for a slot
+            wait_timeout: Seconds a queued caller waits before giving up
+            retry_after: Retry hint given to rejected callers
+        """
+        self.max_sessions = max_sessions
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        # Resolved, then replaced, whenever the queue moves up
+        self._moved: asyncio.Future[None] | None = None
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "max_sessions": self.max_sessions,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    async def acquire(
+        self, on_queued: Callable[[int], Awaitable[None]] | None = None
+    ) -> None:
+        """Take a session slot, waiting in line if the worker is full.
+
+        Args:
+            on_queued: Called with the caller's queue position when it has to
+                wait, and again each time the position changes
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait timed out.
+        """
+        if self.active < self.max_sessions and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_waiting:
+            self.rejected += 1
+            raise AdmissionRejected("Server at capacity", self.retry_after)
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            deadline = loop.time() + self.wait_timeout
+            position = 0
+            while not waiter.done():
+                if on_queued is not None:
+                    current = self._waiters.index(waiter) + 1
+                    if current != position:
+                        position = current
+                        await on_queued(position)
+                        continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                if self._moved is None:
+                    self._moved = loop.create_future()
+                await asyncio.wait(
+                    (waiter, self._moved),
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+                self._queue_moved()
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise AdmissionRejected(
+                    "Timed out waiting for capacity", self.retry_after
+                ) from e
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Return a slot, handing it to the next waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            self._queue_moved()
+            if not waiter.done():
+                # The slot moves to the waiter, so ``active`` is unchanged
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _queue_moved(self) -> None:
+        """Wake the waiters so they can report their new positions."""
+        if self._moved is not None and not self._moved.done():
+            self._moved.set_result(None)
+        self._moved = None
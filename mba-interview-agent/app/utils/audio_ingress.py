@@ -0,0 +1,217 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import base64
+import contextlib
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Literal
+
+OverflowPolicy = Literal["drop_oldest", "close"]
+
+
+class IngressOverflowError(Exception):
+    """Raised when the ingress queue is full and the policy is ``close``."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AudioIngress:
+    """Framing stage between the client socket and the Gemini session.
+
+    Client PCM16 chunks, whether sent as binary frames or base64 inside
+    ``realtimeInput`` JSON, are coalesced into frames of ``frame_ms`` before
+    they are sent upstream. Other client messages are passed through in order.
+    A bounded queue decouples the two sockets, so a stalled upstream costs at
+    most ``max_queue`` frames per session before the overflow policy applies.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        sample_rate: int = 16000,
+        frame_ms: int = 60,
+        max_queue: int = 32,
+        overflow_policy: OverflowPolicy = "drop_oldest",
+    ) -> None:
+        """Initialize the ingress stage.
+
+        Args:
+            send: Coroutine function writing one message to the Gemini socket
+            sample_rate: Sample rate of the client PCM16 mono audio
+            frame_ms: Duration of each upstream audio frame in milliseconds
+            max_queue: Maximum number of frames and messages waiting upstream
+            overflow_policy: ``drop_oldest`` discards the oldest audio frame,
+                ``close`` raises ``IngressOverflowError``
+        """
+        self._send = send
+        self.mime_type = f"audio/pcm;rate={sample_rate}"
+        self.frame_ms = frame_ms
+        # Whole samples only, so frames never split a PCM16 sample
+        self.frame_bytes = sample_rate * frame_ms // 1000 * 2
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self._pending = bytearray()
+        # (is_audio, encoded message) in upstream order
+        self._queue: deque[tuple[bool, str]] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._last_audio = 0.0
+        self.bytes_in = 0
+        self.frames_sent = 0
+        self.messages_sent = 0
+        self.frames_dropped = 0
+        # Optional callable receiving every chunk of client PCM, e.g. a recorder
+        self.tap: Callable[[bytes], object] | None = None
+
+    @property
+    def depth(self) -> int:
+        """Number of frames and messages waiting to be sent upstream."""
+        return len(self._queue)
+
+    def stats(self) -> dict:
+        """Counters describing this session's ingress queue."""
+        return {
+            "queue_depth": self.depth,
+            "pending_audio_bytes": len(self._pending),
+            "bytes_in": self.bytes_in,
+            "frames_sent": self.frames_sent,
+            "messages_sent": self.messages_sent,
+            "frames_dropped": self.frames_dropped,
+        }
+
+    def push_audio(self, pcm: bytes) -> None:
+        """Buffer raw PCM16 and queue every complete frame."""
+        self.bytes_in += len(pcm)
+        if self.tap is not None:
+            self.tap(pcm)
+        self._last_audio = time.monotonic()
+        self._pending += pcm
+        while len(self._pending) >= self.frame_bytes:
+            frame = bytes(self._pending[: self.frame_bytes])
+            del self._pending[: self.frame_bytes]
+            self._enqueue(True, self._encode_audio(frame))
+
+    def push_client_message(self, text: str) -> None:
+        """Route a JSON client message, framing any PCM audio it carries."""
+        try:
+            message = json.loads(text)
+        except ValueError:
+            logging.warning("Dropping malformed client message")
+            return
+
+        realtime_input = (
+            message.get("realtimeInput") if isinstance(message, dict) else None
+        )
+        chunks = (
+            realtime_input.get("mediaChunks")
+            if isinstance(realtime_input, dict)
+            else None
+        )
+        if not chunks:
+            self.push_message(text)
+            return
+
+        others = []
+        for chunk in chunks:
+            if chunk.get("mimeType", "").startswith("audio/pcm"):
+                self.push_audio(base64.b64decode(chunk.get("data", "")))
+            else:
+                others.append(chunk)
+        if others:
+            self.push_message(json.dumps({"realtimeInput": {"mediaChunks": others}}))
+
+    def push_message(self, text: str) -> None:
+        """Queue a non-audio message after any audio received before it."""
+        self.flush_audio()
+        self._enqueue(False, text)
+
+    def flush_audio(self) -> None:
+        """Queue the buffered partial frame, if any."""
+        if self._pending:
+            frame = bytes(self._pending)
+            self._pending.clear()
+            self._enqueue(True, self._encode_audio(frame))
+
+    def close(self) -> None:
+        """Flush buffered audio and let ``run`` exit once the queue drains."""
+        self.flush_audio()
+        self._closed = True
+        self._ready.set()
+
+    async def run(self) -> None:
+        """Send queued frames upstream until closed.
+
+        A partial frame is flushed once no audio has arrived for ``frame_ms``,
+        so the tail of an utterance is never held back waiting for more audio.
+        """
+        while True:
+            if not self._queue:
+                if self._closed:
+                    return
+                self._ready.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._ready.wait(), timeout=self.frame_ms / 1000
+                    )
+                idle = time.monotonic() - self._last_audio
+                if not self._queue and idle >= self.frame_ms / 1000:
+                    self.flush_audio()
+                continue
+
+            is_audio, payload = self._queue.popleft()
+            await self._send(payload)
+            if is_audio:
+                self.frames_sent += 1
+            else:
+                self.messages_sent += 1
+
+    def _enqueue(self, is_audio: bool, payload: str) -> None:
+        if len(self._queue) >= self.max_queue:
+            self._make_room()
+        self._queue.append((is_audio, payload))
+        self._ready.set()
+
+    def _make_room(self) -> None:
+        if self.overflow_policy == "drop_oldest":
+            for index, (is_audio, _) in enumerate(self._queue):
+                if is_audio:
+                    del self._queue[index]
+                    self.frames_dropped += 1
+                    if self.frames_dropped == 1 or self.frames_dropped % 100 == 0:
+                        logging.warning(
+                            f"Upstream audio queue full, dropped {self.frames_dropped} frames so far"
+                        )
+                    return
+        raise IngressOverflowError("Upstream audio queue full")
+
+    def _encode_audio(self, frame: bytes) -> str:
+        return json.dumps(
+            {
+                "realtimeInput": {
+                    "mediaChunks": [
+                        {
+                            "mimeType": self.mime_type,
+                            "data": base64.b64encode(frame).decode("ascii"),
+                        }
+                    ]
+                }
+            }
+        )
@@ -0,0 +1,370 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import BinaryIO, Literal, Protocol
+
+FsyncPolicy = Literal["never", "segment", "always"]
+
+SPEAKERS = {"candidate": 16000, "interviewer": 24000}
+# PCM16 mono; sizes are kept to whole frames so no sample spans two segments
+CHANNELS = 1
+SAMPLE_WIDTH = 2
+FRAME_BYTES = CHANNELS * SAMPLE_WIDTH
+
+
+class Sink(Protocol):
+    """Anything ``PcmRing.drain`` can write to."""
+
+    def write(self, data: memoryview, /) -> object: ...
+
+
+class PcmRing:
+    """Fixed-size single-producer, single-consumer byte ring.
+
+    The event loop writes PCM into a buffer allocated once per session; the
+    writer thread drains it through a memoryview. Neither side takes a lock:
+    each position counter is only ever advanced by its own side. When the
+    writer falls behind, new audio is dropped and counted instead of waiting.
+    ``dropped_bytes`` is only updated by the producer.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._view = memoryview(bytearray(capacity))
+        self._head = 0  # total bytes written, advanced by the producer
+        self._tail = 0  # total bytes drained, advanced by the consumer
+        self.dropped_bytes = 0
+
+    @property
+    def pending(self) -> int:
+        return self._head - self._tail
+
+    def write(self, data: bytes) -> bool:
+        """Copy ``data`` into the ring; False if there was no room for it."""
+        size = len(data)
+        if size > self.capacity - (self._head - self._tail):
+            self.dropped_bytes += size
+            return False
+        start = self._head % self.capacity
+        first = min(size, self.capacity - start)
+        if first == size:
+            self._view[start : start + size] = data
+        else:
+            # Wraps around the end of the buffer
+            source = memoryview(data)
+            self._view[start:] = source[:first]
+            self._view[: size - first] = source[first:]
+        self._head += size
+        return True
+
+    def drain(self, sink: Sink, limit: int | None = None) -> int:
+        """Write up to ``limit`` pending bytes to ``sink`` and return the count."""
+        head = self._head
+        tail = self._tail
+        if limit is not None:
+            head = min(head, tail + limit)
+        while tail < head:
+            start = tail % self.capacity
+            end = start + min(head - tail, self.capacity - start)
+            sink.write(self._view[start:end])
+            tail += end - start
+        drained = tail - self._tail
+        self._tail = tail
+        return drained
+
+
+class _Track:
+    """One speaker's ring and the WAV segment currently being written."""
+
+    def __init__(
+        self, directory: Path, speaker: str, sample_rate: int, ring_bytes: int
+    ) -> None:
+        self.directory = directory
+        self.speaker = speaker
+        self.sample_rate = sample_rate
+        self.ring = PcmRing(ring_bytes)
+        self.segment: wave.Wave_write | None = None
+        self._file: BinaryIO | None = None
+        self.segment_bytes = 0
+        self.segments = 0
+        self.written_bytes = 0
+        # Discarded by the writer past the track cap; the ring counts its own drops
+        self.capped_bytes = 0
+        self.failed = False
+
+    def write(self, pcm: bytes) -> None:
+        """Record a chunk; called on the event loop."""
+        if not self.failed:
+            self.ring.write(pcm)
+
+    @property
+    def dropped_bytes(self) -> int:
+        return self.ring.dropped_bytes + self.capped_bytes
+
+    def open_segment(self) -> wave.Wave_write:
+        path = self.directory / f"{self.speaker}-{self.segments:03d}.wav"
+        self._file = open(path, "wb")
+        segment = wave.open(self._file, "wb")
+        segment.setnchannels(CHANNELS)
+        segment.setsampwidth(SAMPLE_WIDTH)
+        segment.setframerate(self.sample_rate)
+        self.segment = segment
+        self.segments += 1
+        self.segment_bytes = 0
+        return segment
+
+    def sync(self) -> None:
+        """Flush the open segment's file to disk."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close_segment(self, fsync: bool) -> None:
+        if self.segment is None or self._file is None:
+            return
+        # Patches the RIFF and data sizes in the header
+        self.segment.close()
+        if fsync:
+            self.sync()
+        self._file.close()
+        self.segment = None
+        self._file = None
+
+
+class SessionRecording:
+    """The candidate and interviewer tracks of one session.
+
+    Write to ``candidate`` and ``interviewer`` from the event loop; files
+    are only touched by the recorder's writer thread.
+    """
+
+    def __init__(self, directory: Path, ring_bytes: dict[str, int]) -> None:
+        self.directory = directory
+        self.candidate = _Track(
+            directory, "candidate", SPEAKERS["candidate"], ring_bytes["candidate"]
+        )
+        self.interviewer = _Track(
+            directory, "interviewer", SPEAKERS["interviewer"], ring_bytes["interviewer"]
+        )
+        # Written next to the audio when the session closes
+        self.metadata: dict = {}
+        self.closed = False
+
+    @property
+    def tracks(self) -> tuple[_Track, _Track]:
+        return self.candidate, self.interviewer
+
+    def stats(self) -> dict:
+        return {
+            track.speaker: {
+                "written_bytes": track.written_bytes,
+                "dropped_bytes": track.dropped_bytes,
+                "segments": track.segments,
+            }
+            for track in self.tracks
+        }
+
+
+class AudioRecorder:
+    """Writes session audio to segmented WAV files from a background thread.
+
+    Each session gets one directory holding ``candidate-NNN.wav`` (16 kHz)
+    and ``interviewer-NNN.wav`` (24 kHz) segments of at most
+    ``segment_bytes`` of PCM each, plus ``session.json``. A track stops
+    recording after ``max_track_bytes``. Every ``flush_interval`` seconds the
+    thread drains all rings; ``fsync`` controls durability: after each drain
+    (``always``), when a segment is finished (``segment``) or ``never``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ring_seconds: float = 4.0,
+        segment_bytes: int = 50 * 1024 * 1024,
+        max_track_bytes: int = 500 * 1024 * 1024,
+        fsync: FsyncPolicy = "segment",
+        flush_interval: float = 0.25,
+    ) -> None:
+        """Initialize the recorder without starting its thread.
+
+        Args:
+            directory: Root directory for session recordings
+            ring_seconds: Audio each ring holds before new audio is dropped
+            segment_bytes: PCM bytes per WAV file before starting a new one,
+                rounded down to whole frames
+            max_track_bytes: PCM bytes recorded per speaker and session,
+                rounded down to whole frames
+            fsync: ``never``, ``segment`` or ``always``
+            flush_interval: Seconds between drains of the rings
+        """
+        self.directory = Path(directory)
+        self.ring_bytes = {
+            speaker: _whole_frames(int(rate * FRAME_BYTES * ring_seconds))
+            for speaker, rate in SPEAKERS.items()
+        }
+        self.segment_bytes = _whole_frames(segment_bytes)
+        self.max_track_bytes = _whole_frames(max_track_bytes)
+        self.fsync = fsync
+        self.flush_interval = flush_interval
+        self._recordings: list[SessionRecording] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.sessions = 0
+
+    def open(self, name: str) -> SessionRecording:
+        """Start recording a session into ``directory/name``."""
+        recording = SessionRecording(self.directory / name, self.ring_bytes)
+        with self._lock:
+            self._recordings.append(recording)
+        self.sessions += 1
+        return recording
+
+    def close(self, recording: SessionRecording) -> None:
+        """Finish a recording once the writer has drained what is left."""
+        recording.closed = True
+
+    def stats(self) -> dict:
+        with self._lock:
+            recordings = list(self._recordings)
+        return {
+            "active": len(recordings),
+            "sessions": self.sessions,
+            "pending_bytes": sum(t.ring.pending for r in recordings for t in r.tracks),
+            "dropped_bytes": sum(t.dropped_bytes for r in recordings for t in r.tracks),
+        }
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="audio-recorder", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Write out and finish every recording, then stop the thread.
+
+        Blocks, so call it off the event loop.
+        """
+        with self._lock:
+            for recording in self._recordings:
+                recording.closed = True
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            stopping = self._stop.wait(self.flush_interval)
+            started = time.perf_counter()
+            with self._lock:
+                recordings = list(self._recordings)
+            for recording in recordings:
+                self._drain(recording)
+            if stopping:
+                return
+            elapsed = time.perf_counter() - started
+            if elapsed > self.flush_interval:
+                logging.warning(
+                    f"Audio recorder drain took {elapsed * 1000:.0f} ms for {len(recordings)} sessions"
+                )
+
+    def _drain(self, recording: SessionRecording) -> None:
+        # Read before draining, so audio written after it is still drained first
+        closing = recording.closed
+        for track in recording.tracks:
+            if track.failed:
+                continue
+            try:
+                self._drain_track(track)
+                if closing:
+                    track.close_segment(fsync=self.fsync != "never")
+            except OSError as e:
+                track.failed = True
+                logging.error(
+                    f"Stopped recording {track.speaker} audio in {recording.directory}: {e}"
+                )
+        if closing:
+            self._finish(recording)
+
+    def _drain_track(self, track: _Track) -> None:
+        while track.ring.pending:
+            if track.written_bytes >= self.max_track_bytes:
+                # Keep the ring empty; the rest of the session is not recorded
+                track.capped_bytes += track.ring.drain(_NULL_SINK)
+                return
+            segment = track.segment
+            if segment is None:
+                track.directory.mkdir(parents=True, exist_ok=True)
+                segment = track.open_segment()
+            room = min(
+                self.segment_bytes - track.segment_bytes,
+                self.max_track_bytes - track.written_bytes,
+            )
+            drained = track.ring.drain(_SegmentSink(segment), limit=room)
+            track.segment_bytes += drained
+            track.written_bytes += drained
+            if track.segment_bytes >= self.segment_bytes:
+                track.close_segment(fsync=self.fsync != "never")
+        if self.fsync == "always":
+            track.sync()
+
+    def _finish(self, recording: SessionRecording) -> None:
+        with self._lock:
+            if recording in self._recordings:
+                self._recordings.remove(recording)
+        if not any(track.segments for track in recording.tracks):
+            return
+        try:
+            (recording.directory / "session.json").write_text(
+                json.dumps(
+                    {**recording.metadata, "audio": recording.stats()},
+                    default=str,
+                    indent=2,
+                )
+            )
+        except OSError as e:
+            logging.error(
+                f"Failed to write recording metadata in {recording.directory}: {e}"
+            )
+
+
+def _whole_frames(size: int) -> int:
+    """``size`` rounded down to a whole number of frames, at least one."""
+    return max(FRAME_BYTES, size - size % FRAME_BYTES)
+
+
+class _SegmentSink:
+    """Adapts a WAV writer to the ``write`` interface ``PcmRing.drain`` expects."""
+
+    def __init__(self, segment: wave.Wave_write) -> None:
+        self.write = segment.writeframesraw
+
+
+class _NullSink:
+    def write(self, data: memoryview, /) -> None:
+        pass
+
+
+_NULL_SINK = _NullSink()
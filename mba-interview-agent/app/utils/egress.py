@@ -0,0 +1,198 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Literal
+
+from app.utils.relay_codec import is_audio_frame, merge_audio_frames
+
+EgressPolicy = Literal["coalesce", "disconnect"]
+Payload = bytes | str
+
+
+class EgressOverflowError(Exception):
+    """Raised when a client falls too far behind to keep its session."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class EgressQueue:
+    """Outbound queue between the Gemini read loop and one client socket.
+
+    The read loop only appends to the queue; a separate writer task performs
+    the socket sends. When the queue passes ``max_bytes`` or ``max_messages``
+    the ``coalesce`` policy first merges adjacent binary audio frames, then
+    drops the oldest audio, while ``disconnect`` gives up on the client.
+    Queued audio is always discarded when the model is interrupted, since
+    playing it would talk over the candidate.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Payload], Awaitable[None]],
+        max_bytes: int = 2 * 1024 * 1024,
+        max_messages: int = 500,
+        overflow_policy: EgressPolicy = "coalesce",
+    ) -> None:
+        """Initialize the egress queue.
+
+        Args:
+            send: Coroutine function writing one frame to the client socket
+            max_bytes: Maximum bytes waiting for the client
+            max_messages: Maximum messages waiting for the client
+            overflow_policy: ``coalesce`` or ``disconnect``
+        """
+        self._send = send
+        self.max_bytes = max_bytes
+        self.max_messages = max_messages
+        self.overflow_policy = overflow_policy
+        # (carries_audio, payload) in send order
+        self._queue: deque[tuple[bool, Payload]] = deque()
+        self._queued_bytes = 0
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.sent_messages = 0
+        self.sent_bytes = 0
+        self.dropped_audio = 0
+        self.coalesced = 0
+        # Puts that found the queue over its limit
+        self.overflows = 0
+        self._send_seconds_total = 0.0
+        self._send_seconds_max = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting for the client."""
+        return len(self._queue)
+
+    @property
+    def queued_bytes(self) -> int:
+        """Bytes waiting for the client."""
+        return self._queued_bytes
+
+    def stats(self) -> dict:
+        """Queue depth and send latency for this session."""
+        return {
+            "queue_depth": self.depth,
+            "queued_bytes": self._queued_bytes,
+            "sent_messages": self.sent_messages,
+            "sent_bytes": self.sent_bytes,
+            "dropped_audio": self.dropped_audio,
+            "coalesced": self.coalesced,
+            "overflows": self.overflows,
+            "send_latency_avg_ms": (
+                self._send_seconds_total / self.sent_messages * 1000
+                if self.sent_messages
+                else 0.0
+            ),
+            "send_latency_max_ms": self._send_seconds_max * 1000,
+        }
+
+    def put(self, payload: Payload, carries_audio: bool = False) -> None:
+        """Queue a frame for the client without waiting on the socket.
+
+        Raises:
+            EgressOverflowError: If the queue is full and cannot be relieved.
+        """
+        self._queue.append((carries_audio, payload))
+        self._queued_bytes += len(payload)
+        if self._over_limit():
+            self._relieve()
+        self._ready.set()
+
+    def drop_audio(self) -> None:
+        """Discard all queued audio, e.g. after the model was interrupted."""
+        kept = deque(item for item in self._queue if not item[0])
+        dropped = len(self._queue) - len(kept)
+        if dropped:
+            self.dropped_audio += dropped
+            self._queue = kept
+            self._queued_bytes = sum(len(payload) for _, payload in kept)
+
+    def close(self) -> None:
+        """Let ``run`` exit once everything queued has been sent."""
+        self._closed = True
+        self._ready.set()
+
+    async def run(self) -> None:
+        """Send queued frames to the client until closed."""
+        while True:
+            if not self._queue:
+                if self._closed:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            _, payload = self._queue.popleft()
+            self._queued_bytes -= len(payload)
+            started = time.perf_counter()
+            await self._send(payload)
+            elapsed = time.perf_counter() - started
+            self._send_seconds_total += elapsed
+            self._send_seconds_max = max(self._send_seconds_max, elapsed)
+            self.sent_messages += 1
+            self.sent_bytes += len(payload)
+
+    def _over_limit(self) -> bool:
+        return (
+            self._queued_bytes > self.max_bytes or len(self._queue) > self.max_messages
+        )
+
+    def _relieve(self) -> None:
+        self.overflows += 1
+        if self.overflow_policy == "disconnect":
+            raise EgressOverflowError("Client is not keeping up with the session")
+
+        self._coalesce()
+        while self._over_limit():
+            for index, (carries_audio, _) in enumerate(self._queue):
+                if carries_audio:
+                    _, payload = self._queue[index]
+                    del self._queue[index]
+                    self._queued_bytes -= len(payload)
+                    self.dropped_audio += 1
+                    break
+            else:
+                raise EgressOverflowError("Client is not keeping up with the session")
+
+        # Once per slow spell and then every 100th overflow, not per frame
+        if self.overflows == 1 or self.overflows % 100 == 0:
+            logging.warning(
+                f"Slow client, {self.dropped_audio} audio frames dropped so far"
+                f" ({self.overflows} overflows)"
+            )
+
+    def _coalesce(self) -> None:
+        items: deque[tuple[bool, Payload]] = deque()
+        run: list[bytes] = []
+        for carries_audio, payload in self._queue:
+            if carries_audio and is_audio_frame(payload):
+                run.append(payload)  # type: ignore[arg-type]
+                continue
+            if run:
+                items.extend((True, frame) for frame in merge_audio_frames(run))
+                run = []
+            items.append((carries_audio, payload))
+        if run:
+            items.extend((True, frame) for frame in merge_audio_frames(run))
+        self.coalesced += len(self._queue) - len(items)
+        self._queue = items
+        self._queued_bytes = sum(len(payload) for _, payload in items)
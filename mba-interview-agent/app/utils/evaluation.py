@@ -0,0 +1,181 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+from dataclasses import dataclass, field
+
+# Rubric dimensions from the EVALUATION CRITERIA of the system instruction
+RUBRIC = {
+    "communication": ("Communication Skills", 0.25),
+    "leadership": ("Leadership Potential", 0.25),
+    "analytical": ("Analytical Thinking", 0.25),
+    "cultural_fit": ("Cultural Fit", 0.25),
+}
+
+# Used to file notes the model did not tag with a dimension
+DIMENSION_KEYWORDS = {
+    "communication": re.compile(
+        r"clear|clarity|articulat|concise|communicat|engag|rambl|storytell|listen", re.I
+    ),
+    "leadership": re.compile(
+        r"lead|influenc|initiative|ownership|motivat|mentor|team", re.I
+    ),
+    "analytical": re.compile(
+        r"analy|data|metric|quantitat|problem|strateg|logic|reason|structur", re.I
+    ),
+    "cultural_fit": re.compile(
+        r"cultur|fit|values|community|collaborat|mission|why (this|the) school", re.I
+    ),
+}
+
+MAX_EXAMPLES = 3
+
+
+@dataclass
+class _Dimension:
+    note_count: int = 0
+    rating_sum: int = 0
+    rating_count: int = 0
+    evidence: list[int] = field(default_factory=list)
+
+    @property
+    def score(self) -> int | None:
+        # Ratings are 1-5; report on the 0-100 scale the results page uses
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count * 20)
+
+
+def classify(observation: str) -> str | None:
+    """Return the rubric dimension an untagged note most likely belongs to."""
+    for dimension, pattern in DIMENSION_KEYWORDS.items():
+        if pattern.search(observation):
+            return dimension
+    return None
+
+
+class EvaluationAccumulator:
+    """Running rubric evaluation for one interview, fed by interview notes.
+
+    Each note is appended once and only updates the counters of its own
+    dimension, so the evaluation is always current and ``evaluation_data``
+    can be written the moment the interview ends. Notes point back at the
+    conversation turn they were taken in rather than copying the transcript.
+    """
+
+    def __init__(self) -> None:
+        self.notes: list[dict] = []
+        self.dimensions = {key: _Dimension() for key in RUBRIC}
+        self.unclassified = 0
+
+    def add_note(
+        self,
+        observation: str,
+        turn: int,
+        dimension: str | None = None,
+        rating: int | None = None,
+    ) -> str | None:
+        """Record a note and return the dimension it was filed under.
+
+        Args:
+            observation: The interviewer's note
+            turn: Conversation turn number the note refers to
+            dimension: Rubric dimension key; inferred from the text if unknown
+            rating: Optional 1-5 rating of the candidate on that dimension
+        """
+        if dimension not in RUBRIC:
+            dimension = classify(observation)
+        if rating is not None:
+            rating = min(5, max(1, int(rating)))
+
+        note_index = len(self.notes)
+        self.notes.append(
+            {
+                "turn": turn,
+                "dimension": dimension,
+                "rating": rating,
+                "text": observation,
+            }
+        )
+        if dimension is None:
+            self.unclassified += 1
+            return None
+
+        stats = self.dimensions[dimension]
+        stats.note_count += 1
+        stats.evidence.append(note_index)
+        if rating is not None:
+            stats.rating_sum += rating
+            stats.rating_count += 1
+        return dimension
+
+    def overall_score(self) -> int | None:
+        """Weighted rubric score over the dimensions that have ratings."""
+        weighted, weights = 0.0, 0.0
+        for key, (_, weight) in RUBRIC.items():
+            score = self.dimensions[key].score
+            if score is not None:
+                weighted += score * weight
+                weights += weight
+        return round(weighted / weights) if weights else None
+
+    def evaluation_data(self, total_turns: int = 0, duration_seconds: int = 0) -> dict:
+        """Build the ``ai_interview_evaluations.evaluation_data`` document."""
+        rubric = {}
+        strengths, improvements, feedback = [], [], []
+        for key, (label, weight) in RUBRIC.items():
+            stats = self.dimensions[key]
+            score = stats.score
+            rubric[key] = {
+                "label": label,
+                "weight": weight,
+                "score": score,
+                "note_count": stats.note_count,
+                "evidence": [
+                    {"note": i, "turn": self.notes[i]["turn"]} for i in stats.evidence
+                ],
+            }
+            if score is not None and score >= 75:
+                strengths.append(f"Strong {label.lower()}")
+            elif score is not None and score < 60:
+                improvements.append(f"Work on {label.lower()}")
+            elif not stats.note_count:
+                improvements.append(f"Show more evidence of {label.lower()}")
+            feedback.append(
+                {
+                    "category": label,
+                    "score": score,
+                    "feedback": self.notes[stats.evidence[-1]]["text"]
+                    if stats.evidence
+                    else "",
+                    "examples": [
+                        self.notes[i]["text"] for i in stats.evidence[:MAX_EXAMPLES]
+                    ],
+                }
+            )
+
+        return {
+            "source": "interview_notes",
+            "overall_score": self.overall_score(),
+            "communication_score": self.dimensions["communication"].score,
+            "total_duration": duration_seconds,
+            "total_responses": total_turns,
+            "strengths": strengths,
+            "areas_for_improvement": improvements,
+            "detailed_feedback": feedback,
+            "rubric": rubric,
+            "note_count": len(self.notes),
+            "unclassified_note_count": self.unclassified,
+            "notes": self.notes,
+        }
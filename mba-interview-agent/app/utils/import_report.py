@@ -0,0 +1,117 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Import time breakdown of the server, from ``python -X importtime``.
+
+Imports run in a fresh interpreter so nothing is already cached. Usage::
+
+    python -m app.utils.import_report [module] [--top N] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """One line of ``-X importtime`` output; times in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure(module: str = "app.server", env: dict | None = None) -> list[ImportTiming]:
+    """Import ``module`` in a subprocess and return the timing of every import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # column header
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings.append(
+            ImportTiming(name.strip(), int(self_us), int(cumulative_us), depth)
+        )
+    return timings
+
+
+def total_seconds(timings: list[ImportTiming], module: str = "app.server") -> float:
+    """Cumulative import time of ``module`` itself."""
+    return next(t.cumulative_us for t in timings if t.module == module) / 1e6
+
+
+def by_package(timings: list[ImportTiming]) -> dict[str, float]:
+    """Self time in seconds summed per package, slowest first.
+
+    Packages are the top two name components for namespace packages such as
+    ``google.genai``, otherwise the top-level name.
+    """
+    totals: dict[str, int] = defaultdict(int)
+    for timing in timings:
+        parts = timing.module.split(".")
+        package = ".".join(parts[:2]) if parts[0] in ("google", "app") else parts[0]
+        totals[package] += timing.self_us
+    return {
+        name: us / 1e6 for name, us in sorted(totals.items(), key=lambda item: -item[1])
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="app.server")
+    parser.add_argument("--top", type=int, default=20, help="packages to list")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    timings = measure(args.module)
+    packages = dict(list(by_package(timings).items())[: args.top])
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "module": args.module,
+                    "total_seconds": total_seconds(timings, args.module),
+                    "packages": packages,
+                    "modules": [asdict(t) for t in timings],
+                },
+                indent=2,
+            )
+        )
+        return
+
+    print(f"{args.module}: {total_seconds(timings, args.module) * 1000:.0f} ms")
+    for name, seconds in packages.items():
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
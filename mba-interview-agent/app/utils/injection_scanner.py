@@ -0,0 +1,104 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+from dataclasses import asdict, dataclass
+
+# Characters of earlier text kept for matches that span chunk boundaries.
+# Must exceed the longest phrase a pattern can match in practice.
+DEFAULT_OVERLAP = 64
+
+
+def compile_patterns(patterns: list[str]) -> re.Pattern:
+    """Combine patterns into one case-insensitive alternation.
+
+    Each pattern becomes the named group ``p<index>`` so a match can be
+    traced back to the pattern that produced it.
+    """
+    return re.compile(
+        "|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(patterns)),
+        re.IGNORECASE,
+    )
+
+
+def pattern_index(match: re.Match[str]) -> int:
+    """Index of the pattern a match from ``compile_patterns`` came from."""
+    if match.lastgroup is None:
+        raise ValueError("Match is not from a pattern built by compile_patterns")
+    return int(match.lastgroup[1:])
+
+
+@dataclass(frozen=True)
+class InjectionHit:
+    """A pattern match in a session's input transcript."""
+
+    pattern: str
+    text: str
+    start: int
+    end: int
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class InjectionScanner:
+    """Incremental prompt-injection scanner for a stream of transcript chunks.
+
+    Each chunk is scanned together with the last ``overlap`` characters of
+    the text before it, never the whole transcript, so the cost per chunk is
+    bounded by its own length plus the overlap. Matches lying entirely in the
+    overlap were reported by the previous call and are skipped. Offsets in
+    hits are relative to the start of the stream.
+    """
+
+    def __init__(
+        self, regex: re.Pattern, patterns: list[str], overlap: int = DEFAULT_OVERLAP
+    ) -> None:
+        """Initialize the scanner.
+
+        Args:
+            regex: Combined pattern from ``compile_patterns``
+            patterns: The source patterns, reported in hits
+            overlap: Characters of previous text rescanned with each chunk
+        """
+        self.regex = regex
+        self.patterns = patterns
+        self.overlap = overlap
+        self._tail = ""
+        self._offset = 0  # stream position of the start of _tail
+        self.hits = 0
+
+    def feed(self, chunk: str) -> list[InjectionHit]:
+        """Scan the next chunk and return the new hits it completes."""
+        if not chunk:
+            return []
+        text = self._tail + chunk
+        boundary = len(self._tail)
+        found = []
+        for match in self.regex.finditer(text):
+            if match.end() <= boundary:
+                continue
+            found.append(
+                InjectionHit(
+                    pattern=self.patterns[pattern_index(match)],
+                    text=match.group(),
+                    start=self._offset + match.start(),
+                    end=self._offset + match.end(),
+                )
+            )
+        keep = min(self.overlap, len(text))
+        self._offset += len(text) - keep
+        self._tail = text[len(text) - keep :]
+        self.hits += len(found)
+        return found
@@ -0,0 +1,202 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TextIO
+
+# (structured payload, severity)
+LogRecord = tuple[dict, str]
+Backend = Callable[[list[LogRecord]], None]
+
+_STOP = object()
+
+
+class CloudLoggingBackend:
+    """Writes each batch to Cloud Logging in a single ``entries.write`` call.
+
+    The Cloud Logging client is created on first use, normally on the
+    shipper thread, so neither import nor startup waits for credentials.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the backend.
+
+        Args:
+            name: Name of the Cloud Logging log to write to
+        """
+        self.name = name
+        self._logger: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def logger(self) -> Any:
+        """The ``google.cloud.logging.Logger``, created on first access."""
+        if self._logger is None:
+            with self._lock:
+                if self._logger is None:
+                    from google.cloud import logging as google_cloud_logging
+
+                    self._logger = google_cloud_logging.Client().logger(self.name)
+        return self._logger
+
+    def warmup(self) -> None:
+        """Create the Cloud Logging client now rather than on the first batch."""
+        _ = self.logger
+
+    def __call__(self, records: list[LogRecord]) -> None:
+        with self.logger.batch() as batch:
+            for info, severity in records:
+                batch.log_struct(info, severity=severity)
+
+
+class JsonLinesBackend:
+    """Writes records as JSON lines to a file, or to stdout, for local runs and tests."""
+
+    def __init__(self, path: str | None = None) -> None:
+        """Initialize the backend.
+
+        Args:
+            path: File to append to; stdout if None or ``-``
+        """
+        self.path = None if path in (None, "-") else path
+
+    def __call__(self, records: list[LogRecord]) -> None:
+        lines = "".join(
+            json.dumps({"severity": severity, **info}, default=str) + "\n"
+            for info, severity in records
+        )
+        if self.path is None:
+            self._write(sys.stdout, lines)
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            self._write(f, lines)
+
+    @staticmethod
+    def _write(stream: TextIO, lines: str) -> None:
+        stream.write(lines)
+        stream.flush()
+
+
+class LogShipper:
+    """Ships structured log records in batches from a background thread.
+
+    ``log_struct`` only appends to a bounded in-memory queue, so callers on
+    the event loop never wait on the logging backend. When the queue is full
+    the record is dropped and counted. The thread sends a batch when it holds
+    ``max_batch`` records or ``flush_interval`` seconds after its first one.
+    """
+
+    def __init__(
+        self,
+        backend: Backend,
+        max_queue: int = 10000,
+        max_batch: int = 500,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """Initialize the shipper without starting its thread.
+
+        Args:
+            backend: Callable that writes one batch of records
+            max_queue: Records buffered before new ones are dropped
+            max_batch: Records sent per backend call
+            flush_interval: Maximum seconds a record waits for its batch
+        """
+        self.backend = backend
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self.enqueued = 0
+        self.shipped = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def stats(self) -> dict:
+        """Queue depth and record counts."""
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "shipped": self.shipped,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def log_struct(self, info: dict, severity: str = "INFO") -> None:
+        """Queue a structured record; same call shape as Cloud Logging's logger."""
+        try:
+            self._queue.put_nowait((info, severity))
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.enqueued += 1
+
+    def start(self) -> None:
+        """Start the shipping thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="log-shipper", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ship everything queued so far and stop the thread.
+
+        Blocks for up to ``timeout`` seconds, so call it off the event loop.
+        """
+        if self._thread is None:
+            return
+        try:
+            # Queued behind every record logged so far
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logging.warning("Log queue full at shutdown, some records may be lost")
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        batch: list[LogRecord] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._ship(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+                if len(batch) < self.max_batch:
+                    continue
+            self._ship(batch)
+            batch = []
+
+    def _ship(self, batch: list[LogRecord]) -> None:
+        if not batch:
+            return
+        try:
+            self.backend(batch)
+            self.shipped += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logging.error(f"Failed to ship {len(batch)} log records: {e}")
@@ -0,0 +1,108 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Prometheus metrics for the relay path, served by ``/metrics``.
+
+Counters and histograms touched for every relayed message are bound to their
+labels here, once, so the hot path is a single ``inc``/``observe`` on a
+prebuilt child. Rates such as bytes per second come from ``rate()`` over the
+counters. Gauges that describe the whole process are computed at scrape time.
+"""
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Setup phases span a few milliseconds to several seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+SETUP_PHASE_SECONDS = Histogram(
+    "live_setup_phase_seconds",
+    "Time from accepting the client socket to the end of each setup phase.",
+    ["phase"],
+    buckets=LATENCY_BUCKETS,
+)
+
+TIME_TO_FIRST_RESPONSE_SECONDS = Histogram(
+    "live_time_to_first_response_seconds",
+    "Time from the last client input to the first model output of each turn.",
+    buckets=LATENCY_BUCKETS,
+)
+
+RELAY_BYTES = Counter(
+    "live_relay_bytes_total",
+    "Bytes relayed between clients and Gemini.",
+    ["direction"],
+)
+RELAY_MESSAGES = Counter(
+    "live_relay_messages_total",
+    "Messages relayed between clients and Gemini.",
+    ["direction"],
+)
+# Client to Gemini
+UPSTREAM_BYTES = RELAY_BYTES.labels("upstream")
+UPSTREAM_MESSAGES = RELAY_MESSAGES.labels("upstream")
+# Gemini to client
+DOWNSTREAM_BYTES = RELAY_BYTES.labels("downstream")
+DOWNSTREAM_MESSAGES = RELAY_MESSAGES.labels("downstream")
+
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds",
+    "Database operation latency, excluding the wait for a pooled connection.",
+    ["query"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to borrow a pooled database connection.",
+    buckets=LATENCY_BUCKETS,
+)
+
+TOOL_SECONDS = Histogram(
+    "tool_call_seconds",
+    "Tool call latency by tool and outcome.",
+    ["tool", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+ACTIVE_SESSIONS = Gauge(
+    "live_sessions_active", "Live Gemini sessions holding an admission slot."
+)
+WAITING_SESSIONS = Gauge(
+    "live_sessions_waiting", "Sessions queued for an admission slot."
+)
+PARKED_SESSIONS = Gauge(
+    "live_sessions_parked", "Sessions waiting for their client to reconnect."
+)
+EGRESS_QUEUED_MESSAGES = Gauge(
+    "egress_queued_messages",
+    "Messages waiting to be sent to clients, over all sessions.",
+)
+EGRESS_QUEUED_BYTES = Gauge(
+    "egress_queued_bytes", "Bytes waiting to be sent to clients, over all sessions."
+)
+
+
+def observe_setup_phase(phase: str, offset_ms: float) -> None:
+    """Record a ``PhaseTimer`` mark."""
+    SETUP_PHASE_SECONDS.labels(phase).observe(offset_ms / 1000)
+
+
+def render() -> tuple[bytes, str]:
+    """The exposition payload and its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,156 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Wire format for the binary audio mode of the Gemini -> client relay.
+
+In binary mode every audio chunk is sent as a binary websocket frame made of
+an 8-byte little-endian header followed by raw PCM16 samples:
+
+    offset 0  uint8   frame type (AUDIO_FRAME_TYPE)
+    offset 1  uint8   format version (AUDIO_FRAME_VERSION)
+    offset 2  uint16  channel count
+    offset 4  uint32  sample rate in Hz
+
+Everything else in a server message (text parts, tool calls, turn_complete,
+interruptions, transcriptions) is sent as a camelCase JSON text frame.
+"""
+
+import struct
+
+from google.genai import types
+
+AUDIO_FRAME_TYPE = 0x01
+AUDIO_FRAME_VERSION = 1
+AUDIO_HEADER = struct.Struct("<BBHI")
+DEFAULT_SAMPLE_RATE = 24000
+
+# Serialized form of a message whose only content was audio
+_EMPTY_SERVER_CONTENT = '{"serverContent":{}}'
+
+_sample_rates: dict[str, int] = {}
+
+
+def encode_audio_frame(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """Prefix raw PCM16 with the binary audio frame header."""
+    return (
+        AUDIO_HEADER.pack(AUDIO_FRAME_TYPE, AUDIO_FRAME_VERSION, channels, sample_rate)
+        + pcm
+    )
+
+
+def parse_sample_rate(mime_type: str) -> int:
+    """Extract the rate from a mime type like ``audio/pcm;rate=24000``."""
+    rate = _sample_rates.get(mime_type)
+    if rate is None:
+        rate = DEFAULT_SAMPLE_RATE
+        for param in mime_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "rate" and value.isdigit():
+                rate = int(value)
+        _sample_rates[mime_type] = rate
+    return rate
+
+
+def has_audio(message: types.LiveServerMessage) -> bool:
+    """True if the message carries inline audio, without copying it."""
+    content = message.server_content
+    if content is None or content.model_turn is None or not content.model_turn.parts:
+        return False
+    return any(part.inline_data is not None for part in content.model_turn.parts)
+
+
+def turn_text(model_turn: types.Content) -> str:
+    """Concatenate the text parts of a model turn."""
+    return "".join(part.text for part in model_turn.parts or () if part.text)
+
+
+def split_server_message(
+    message: types.LiveServerMessage,
+) -> tuple[list[bytes], str | None]:
+    """Separate a server message into binary audio frames and a JSON remainder.
+
+    Returns:
+        The encoded audio frames, and the JSON for the non-audio content or
+        None when the message carried nothing but audio.
+    """
+    content = message.server_content
+    model_turn = content.model_turn if content else None
+    if content is None or model_turn is None or not model_turn.parts:
+        return [], message.model_dump_json(exclude_none=True, by_alias=True)
+
+    frames = []
+    other_parts = []
+    for part in model_turn.parts:
+        blob = part.inline_data
+        if (
+            blob is not None
+            and blob.data
+            and blob.mime_type
+            and blob.mime_type.startswith("audio/pcm")
+        ):
+            frames.append(
+                encode_audio_frame(blob.data, parse_sample_rate(blob.mime_type))
+            )
+        else:
+            other_parts.append(part)
+
+    if not frames:
+        return [], message.model_dump_json(exclude_none=True, by_alias=True)
+
+    remainder = message.model_copy(
+        update={
+            "server_content": content.model_copy(
+                update={
+                    "model_turn": (
+                        model_turn.model_copy(update={"parts": other_parts})
+                        if other_parts
+                        else None
+                    )
+                }
+            )
+        }
+    )
+    payload = remainder.model_dump_json(exclude_none=True, by_alias=True)
+    return frames, None if payload == _EMPTY_SERVER_CONTENT else payload
+
+
+def merge_audio_frames(frames: list[bytes]) -> list[bytes]:
+    """Concatenate runs of adjacent audio frames that share a header."""
+    merged: list[bytes] = []
+    run: list[bytes] = []
+    for frame in frames:
+        if run and frame[: AUDIO_HEADER.size] != run[0][: AUDIO_HEADER.size]:
+            merged.append(_join_run(run))
+            run = []
+        run.append(frame)
+    if run:
+        merged.append(_join_run(run))
+    return merged
+
+
+def is_audio_frame(payload: bytes | str) -> bool:
+    """True for binary frames produced by ``encode_audio_frame``."""
+    return (
+        isinstance(payload, bytes)
+        and len(payload) >= AUDIO_HEADER.size
+        and payload[0] == AUDIO_FRAME_TYPE
+    )
+
+
+def _join_run(run: list[bytes]) -> bytes:
+    if len(run) == 1:
+        return run[0]
+    return run[0][: AUDIO_HEADER.size] + b"".join(
+        frame[AUDIO_HEADER.size :] for frame in run
+    )
@@ -0,0 +1,158 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+# Channel the database triggers publish changed school ids on
+SCHOOL_DATA_CHANNEL = "ai_interview_school_changed"
+
+SchoolData = tuple[dict, list]
+
+
+class SchoolDataCache:
+    """In-process cache of school personas and question banks.
+
+    Entries are keyed by ``school_id`` and expire after ``ttl`` seconds. The
+    least recently used entry is evicted once ``max_entries`` is reached.
+    Concurrent misses for the same school share a single load, which runs in
+    its own task so a caller that is cancelled does not cancel it for the
+    others. Postgres notifications on ``SCHOOL_DATA_CHANNEL`` evict entries
+    as soon as an admin edits them.
+
+    Cached values are shared between sessions and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Awaitable[SchoolData]],
+        ttl: float = 300.0,
+        max_entries: int = 512,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            loader: Coroutine function fetching persona and questions for a school
+            ttl: Seconds an entry stays valid without an invalidation
+            max_entries: Maximum number of schools kept in memory
+        """
+        self._loader = loader
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, SchoolData]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[SchoolData]] = {}
+        # Bumped on invalidation so loads that started earlier are not cached
+        self._generation: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, school_id: str) -> SchoolData:
+        """Return cached data for a school, loading it on a miss."""
+        entry = self._entries.get(school_id)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(school_id)
+                self.hits += 1
+                return value
+            del self._entries[school_id]
+
+        self.misses += 1
+        inflight = self._inflight.get(school_id)
+        if inflight is None:
+            generation = self._generation.get(school_id, 0)
+            inflight = asyncio.create_task(self._load(school_id, generation))
+            # Mark a failure as retrieved when every caller has gone away
+            inflight.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+            self._inflight[school_id] = inflight
+        return await asyncio.shield(inflight)
+
+    async def _load(self, school_id: str, generation: int) -> SchoolData:
+        try:
+            value = await self._loader(school_id)
+        finally:
+            del self._inflight[school_id]
+        if self._generation.get(school_id, 0) == generation:
+            self._store(school_id, value)
+        return value
+
+    def invalidate(self, school_id: str | None = None) -> None:
+        """Evict one school, or every school when ``school_id`` is None."""
+        if school_id is None:
+            self._entries.clear()
+            for key in self._inflight:
+                self._generation[key] = self._generation.get(key, 0) + 1
+            return
+        self._entries.pop(school_id, None)
+        if school_id in self._inflight:
+            self._generation[school_id] = self._generation.get(school_id, 0) + 1
+
+    def handle_notification(
+        self, connection: Any, pid: int, channel: str, payload: str
+    ) -> None:
+        """asyncpg listener callback for ``SCHOOL_DATA_CHANNEL``."""
+        logging.info(
+            f"School data changed, invalidating cache for {payload or 'all schools'}"
+        )
+        self.invalidate(payload or None)
+
+    async def listen(
+        self, connect: Callable[[], Awaitable[Any]], retry_delay: float = 5.0
+    ) -> None:
+        """Keep a LISTEN connection open and apply invalidations until cancelled.
+
+        Notifications sent while the connection is down are lost, so the whole
+        cache is cleared every time the listener (re)connects.
+
+        Args:
+            connect: Coroutine function returning a dedicated asyncpg connection
+            retry_delay: Seconds to wait before reconnecting after a failure
+        """
+        while True:
+            conn = None
+            try:
+                conn = await connect()
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _conn, closed=closed: closed.set())
+                await conn.add_listener(SCHOOL_DATA_CHANNEL, self.handle_notification)
+                self.invalidate()
+                logging.info(
+                    f"Listening for school data changes on {SCHOOL_DATA_CHANNEL}"
+                )
+                await closed.wait()
+                logging.warning("School data listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+                raise
+            except Exception as e:
+                logging.warning(
+                    f"School data listener unavailable, relying on TTL: {e}"
+                )
+            await asyncio.sleep(retry_delay)
+
+    def _store(self, school_id: str, value: SchoolData) -> None:
+        self._entries[school_id] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(school_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,289 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import re
+import unicodedata
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+# Generic words that carry no identity ("The Wharton School" -> "wharton")
+STOPWORDS = frozenset(
+    {
+        "the",
+        "of",
+        "and",
+        "at",
+        "for",
+        "in",
+        "school",
+        "schools",
+        "business",
+        "graduate",
+        "management",
+        "university",
+        "college",
+        "institute",
+        "mba",
+        "program",
+        "programme",
+    }
+)
+
+# Common names the model or candidate may use, mapped to a normalized key
+# produced by the school's own name. Targets not present in the index are
+# ignored, so this can list schools that have no row yet.
+ALIASES = {
+    "hbs": "harvard",
+    "gsb": "stanford",
+    "stanford gsb": "stanford",
+    "upenn": "wharton",
+    "kellogg": "northwestern kellogg",
+    "booth": "chicago booth",
+    "sloan": "mit sloan",
+    "mit": "mit sloan",
+    "cbs": "columbia",
+    "tuck": "dartmouth tuck",
+    "haas": "berkeley haas",
+    "fuqua": "duke fuqua",
+    "ross": "michigan ross",
+    "stern": "nyu stern",
+    "darden": "virginia darden",
+    "som": "yale",
+    "yale som": "yale",
+    "lbs": "london",
+}
+
+# Words a query may add to a school's name without naming another school,
+# e.g. "harvard interview style"
+QUERY_WORDS = frozenset(
+    {
+        "admission",
+        "admissions",
+        "application",
+        "applications",
+        "culture",
+        "essay",
+        "essays",
+        "format",
+        "info",
+        "information",
+        "insights",
+        "interview",
+        "interviews",
+        "process",
+        "profile",
+        "question",
+        "questions",
+        "style",
+        "tips",
+        "values",
+    }
+)
+
+# Minimum Dice coefficient over trigrams for a fuzzy match
+MIN_SIMILARITY = 0.5
+# Raw queries remembered per index snapshot
+MAX_CACHED_QUERIES = 1024
+
+_PUNCTUATION = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(name: str) -> str:
+    """Lowercase, strip accents, punctuation and generic words from a name."""
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    text = text.lower().replace("'s ", " ")
+    tokens = [t for t in _PUNCTUATION.split(text) if t and t not in STOPWORDS]
+    return " ".join(tokens)
+
+
+def trigrams(key: str) -> set[str]:
+    """Character trigrams of a normalized key, padded at word boundaries."""
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class _Snapshot:
+    """Immutable lookup structures for one build of the index."""
+
+    def __init__(self, entries: list[dict], keys: dict[str, int]) -> None:
+        self.entries = entries
+        self.keys = keys
+        self.key_tokens = {key: frozenset(key.split()) for key in keys}
+        self.by_token: dict[str, list[str]] = defaultdict(list)
+        self.by_trigram: dict[str, list[str]] = defaultdict(list)
+        self.gram_counts: dict[str, int] = {}
+        for key in keys:
+            for token in self.key_tokens[key]:
+                self.by_token[token].append(key)
+            grams = trigrams(key)
+            self.gram_counts[key] = len(grams)
+            for gram in grams:
+                self.by_trigram[gram].append(key)
+        self.cache: dict[str, int | None] = {}
+
+    def match(self, query: str) -> int | None:
+        key = normalize(query)
+        if not key:
+            return None
+
+        # 1. Exact normalized name or alias
+        if key in self.keys:
+            return self.keys[key]
+
+        # 2. Longest known name whose words all appear in the query, as long
+        #    as the other words do not name a different school:
+        #    "harvard interview style" -> "harvard", but not "harvard kennedy"
+        tokens = set(key.split())
+        contained: set[str] = set()
+        best_key, best_len = None, 0
+        for token in tokens:
+            for candidate in self.by_token.get(token, ()):
+                if self.key_tokens[candidate] <= tokens:
+                    contained.add(candidate)
+                    size = len(self.key_tokens[candidate])
+                    if size > best_len:
+                        best_key, best_len = candidate, size
+        if best_key is not None:
+            index = self.keys[best_key]
+            leftover = tokens - self.key_tokens[best_key]
+            if all(self._describes(token, index) for token in leftover):
+                return index
+
+        # 3. Trigram similarity for misspellings, e.g. "warton". Schools with
+        #    a name that appeared verbatim were judged, and rejected, above.
+        rejected = {self.keys[candidate] for candidate in contained}
+        grams = trigrams(key)
+        shared: dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self.by_trigram.get(gram, ()):
+                if self.keys[candidate] not in rejected:
+                    shared[candidate] += 1
+        best_key, best_score = None, MIN_SIMILARITY
+        for candidate, count in shared.items():
+            score = 2 * count / (len(grams) + self.gram_counts[candidate])
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        return self.keys[best_key] if best_key is not None else None
+
+    def _describes(self, token: str, index: int) -> bool:
+        """True if a query word is generic or only names the school at ``index``."""
+        if token in QUERY_WORDS:
+            return True
+        schools = {self.keys[key] for key in self.by_token.get(token, ())}
+        return schools == {index}
+
+
+class SchoolIndex:
+    """In-memory school knowledge index used by the ``get_school_info`` tool.
+
+    Entries come from a static seed plus rows of ``mba_schools`` joined with
+    the persona tables. Each school is reachable by its normalized name, by
+    each comma-separated part of its name and by ``ALIASES``; anything else is
+    resolved by word containment and then trigram similarity. Builds produce a
+    new immutable snapshot that is swapped in atomically, so lookups from tool
+    threads never take a lock.
+    """
+
+    def __init__(self, seed: dict[str, dict] | None = None) -> None:
+        """Initialize the index from the seed only.
+
+        Args:
+            seed: Insights keyed by school name, used until (and merged with)
+                rows loaded from the database
+        """
+        self.seed = seed or {}
+        self._snapshot = self._build([])
+
+    def __len__(self) -> int:
+        return len(self._snapshot.entries)
+
+    def lookup(self, query: str) -> dict | None:
+        """Return insights for the best matching school, or None."""
+        snapshot = self._snapshot
+        try:
+            index = snapshot.cache[query]
+        except KeyError:
+            index = snapshot.match(query)
+            if len(snapshot.cache) >= MAX_CACHED_QUERIES:
+                snapshot.cache.clear()
+            snapshot.cache[query] = index
+        return snapshot.entries[index] if index is not None else None
+
+    def rebuild(self, rows: list[dict]) -> None:
+        """Replace the index with the seed merged with ``rows``."""
+        self._snapshot = self._build(rows)
+
+    async def refresh(self, loader: Callable[[], Awaitable[list[dict]]]) -> None:
+        """Load school rows and rebuild the index from them."""
+        rows = await loader()
+        self.rebuild(rows)
+        logging.info(f"School index rebuilt with {len(self)} schools")
+
+    async def run_refresh(
+        self, loader: Callable[[], Awaitable[list[dict]]], interval: float = 600.0
+    ) -> None:
+        """Refresh immediately and then every ``interval`` seconds until cancelled."""
+        while True:
+            try:
+                await self.refresh(loader)
+            except Exception as e:
+                logging.warning(
+                    f"School index refresh failed, keeping previous index: {e}"
+                )
+            await asyncio.sleep(interval)
+
+    def _build(self, rows: list[dict]) -> _Snapshot:
+        entries: list[dict] = []
+        keys: dict[str, int] = {}
+
+        def add(names: list[str], extra_names: list[str], insights: dict) -> None:
+            # Only ``names`` identify a school already in the index; a shared
+            # university part must not merge two of its schools
+            name_keys = [k for k in (normalize(n) for n in names) if k]
+            existing = next((keys[k] for k in name_keys if k in keys), None)
+            if existing is None:
+                existing = len(entries)
+                entries.append({})
+            entries[existing].update(insights)
+            for key in name_keys + [normalize(n) for n in extra_names]:
+                if key:
+                    keys.setdefault(key, existing)
+
+        for name, insights in self.seed.items():
+            add([name], [], dict(insights))
+        for row in rows:
+            # "University of Pennsylvania, Wharton School" is reachable by
+            # the full name and by either part
+            *university, school = (row.get("name") or "").split(",")
+            add([row.get("name") or "", school], university, _row_insights(row))
+
+        for alias, target in ALIASES.items():
+            target_index = keys.get(normalize(target))
+            if target_index is not None:
+                keys.setdefault(normalize(alias), target_index)
+        return _Snapshot(entries, keys)
+
+
+def _row_insights(row: dict) -> dict:
+    insights = {
+        "name": row.get("name"),
+        "location": row.get("location"),
+        "context": row.get("school_context"),
+        "interview_style": row.get("behavioral_notes"),
+        "teaching": row.get("teaching_methodology"),
+        "question_focus": ", ".join(row.get("question_categories") or []) or None,
+    }
+    return {k: v for k, v in insights.items() if v}
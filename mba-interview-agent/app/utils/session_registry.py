@@ -0,0 +1,114 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Parked(Generic[T]):
+    owner: str
+    session: T
+    expire: Callable[[], Awaitable[None]]
+    timer: asyncio.Task
+
+
+class ParkedSessions(Generic[T]):
+    """Sessions whose client went away, held for a grace window to be resumed.
+
+    A parked session is keyed by its resume token and can be claimed once,
+    by the same owner, until ``grace_seconds`` pass or its ``done`` future
+    completes (e.g. the upstream connection closed). It is then removed and
+    its ``expire`` callback runs, which should release the session for good.
+    """
+
+    def __init__(self, grace_seconds: float = 30.0, max_sessions: int = 1000) -> None:
+        """Initialize the registry.
+
+        Args:
+            grace_seconds: How long a session waits for its client to return
+            max_sessions: Parked sessions kept before the oldest is expired early
+        """
+        self.grace_seconds = grace_seconds
+        self.max_sessions = max_sessions
+        self._parked: OrderedDict[str, _Parked[T]] = OrderedDict()
+        self.resumed = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._parked)
+
+    def park(
+        self,
+        token: str,
+        owner: str,
+        session: T,
+        expire: Callable[[], Awaitable[None]],
+        done: asyncio.Future | None = None,
+    ) -> None:
+        """Hold a session until it is claimed or its grace window ends."""
+        if len(self._parked) >= self.max_sessions:
+            # Expiring in the oldest session's own timer task keeps it referenced
+            oldest_token, oldest = next(iter(self._parked.items()))
+            oldest.timer.cancel()
+            oldest.timer = asyncio.create_task(self._expire(oldest_token))
+        timer = asyncio.create_task(self._expire_later(token, done))
+        self._parked[token] = _Parked(owner, session, expire, timer)
+
+    def claim(self, token: str, owner: str) -> T | None:
+        """Take back a parked session, or None if unknown, expired or not ``owner``'s."""
+        parked = self._parked.get(token)
+        if parked is None:
+            return None
+        if parked.owner != owner:
+            logging.warning(
+                f"Resume token presented by {owner} belongs to another user"
+            )
+            return None
+        del self._parked[token]
+        parked.timer.cancel()
+        self.resumed += 1
+        return parked.session
+
+    async def close(self) -> None:
+        """Expire every parked session now, e.g. on shutdown."""
+        for token in list(self._parked):
+            parked = self._parked.get(token)
+            if parked is not None:
+                parked.timer.cancel()
+                await self._expire(token)
+
+    async def _expire_later(self, token: str, done: asyncio.Future | None) -> None:
+        if done is None:
+            await asyncio.sleep(self.grace_seconds)
+        else:
+            await asyncio.wait([done], timeout=self.grace_seconds)
+        await self._expire(token)
+
+    async def _expire(self, token: str) -> None:
+        # Removed before expiring so a concurrent claim can no longer find it
+        parked = self._parked.pop(token, None)
+        if parked is None:
+            return
+        self.expired += 1
+        try:
+            await parked.expire()
+        except Exception as e:
+            logging.error(f"Failed to expire parked session: {e}")
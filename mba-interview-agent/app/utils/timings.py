@@ -0,0 +1,47 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from collections.abc import Callable
+
+
+class PhaseTimer:
+    """Records when each setup phase of a connection finished.
+
+    Times are milliseconds since the timer was created, which the websocket
+    endpoint does right after accepting the socket. Only the first mark of a
+    phase counts, so marking from a loop is safe. ``on_mark`` is called with
+    each new phase and its offset, e.g. to feed a metrics histogram.
+    """
+
+    def __init__(self, on_mark: Callable[[str, float], None] | None = None) -> None:
+        self._started = time.perf_counter()
+        self._on_mark = on_mark
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> float:
+        """Record the end of a phase and return its offset in milliseconds."""
+        if phase not in self.phases:
+            self.phases[phase] = round((time.perf_counter() - self._started) * 1000, 2)
+            if self._on_mark is not None:
+                self._on_mark(phase, self.phases[phase])
+        return self.phases[phase]
+
+    def elapsed(self) -> float:
+        """Milliseconds since the timer was created."""
+        return (time.perf_counter() - self._started) * 1000
+
+    def as_dict(self) -> dict[str, float]:
+        """Phase offsets in the order they were reached."""
+        return dict(self.phases)
@@ -0,0 +1,123 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from app.utils.metrics import TOOL_SECONDS
+
+# Stats key shared by calls to tools that do not exist. Their names come from
+# the model, so keying on them would grow the stats without bound.
+UNKNOWN_TOOL = "<unknown>"
+
+
+@dataclass
+class ToolStats:
+    """Latency and outcome counters for one tool."""
+
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": self.total_seconds / self.calls * 1000 if self.calls else 0.0,
+            "max_ms": self.max_seconds * 1000,
+        }
+
+
+class ToolExecutor:
+    """Runs tool functions with timeouts on a dedicated, bounded thread pool.
+
+    Sync tools run on the executor's own pool rather than the default
+    ``asyncio.to_thread`` executor, so tools cannot starve other blocking work
+    in the process. A call that fails or exceeds its timeout produces an error
+    response instead of leaving the model waiting.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        default_timeout: float = 10.0,
+        timeouts: dict[str, float] | None = None,
+    ) -> None:
+        """Initialize the executor.
+
+        Args:
+            max_workers: Threads available to sync tools across all sessions
+            default_timeout: Seconds a tool may run before it is abandoned
+            timeouts: Per-tool overrides of ``default_timeout``
+        """
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts or {}
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tool"
+        )
+        self._stats: dict[str, ToolStats] = {}
+
+    async def run(self, name: str | None, func: Callable | None, args: dict) -> dict:
+        """Run one tool call and return its response payload."""
+        if func is None or name is None:
+            stats = self._stats.setdefault(UNKNOWN_TOOL, ToolStats())
+            stats.calls += 1
+            stats.errors += 1
+            logging.error(f"Function {name} not found")
+            return {"error": f"Unknown tool: {name}"}
+        stats = self._stats.setdefault(name, ToolStats())
+        stats.calls += 1
+
+        timeout = self.timeouts.get(name, self.default_timeout)
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            if asyncio.iscoroutinefunction(func):
+                return await asyncio.wait_for(func(**args), timeout=timeout)
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._pool, functools.partial(func, **args)),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            stats.timeouts += 1
+            logging.warning(f"Tool {name} timed out after {timeout}s")
+            return {"error": f"Tool {name} timed out after {timeout} seconds"}
+        except Exception as e:
+            outcome = "error"
+            stats.errors += 1
+            logging.error(f"Tool {name} failed: {e!s}")
+            return {"error": f"Tool {name} failed: {e!s}"}
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            TOOL_SECONDS.labels(name, outcome).observe(elapsed)
+
+    def stats(self) -> dict[str, dict]:
+        """Per-tool call counts, errors, timeouts and latency."""
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def shutdown(self) -> None:
+        """Stop the thread pool without waiting for abandoned calls."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
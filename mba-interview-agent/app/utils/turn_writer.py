@@ -0,0 +1,150 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+# (session_id, turn_number, speaker, message_text, message_metadata, timestamp)
+TurnRecord = tuple[str, int, str, str, str, datetime]
+
+TURN_COLUMNS = (
+    "session_id",
+    "turn_number",
+    "speaker",
+    "message_text",
+    "message_metadata",
+    "timestamp",
+)
+
+
+class TurnWriter:
+    """Buffers conversation turns from all sessions and persists them in bulk.
+
+    Turns are appended to an in-memory buffer without touching the database.
+    A background task flushes the buffer whenever it reaches ``max_batch_size``
+    rows or ``flush_interval`` seconds have passed, so the relay loop never
+    waits on Postgres and a single pool connection serves many sessions.
+    """
+
+    def __init__(
+        self,
+        write_rows: Callable[[list[TurnRecord]], Awaitable[None]],
+        max_batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+    ) -> None:
+        """Initialize the turn writer.
+
+        Args:
+            write_rows: Coroutine function that persists a batch of turn records
+            max_batch_size: Number of buffered rows that triggers an early flush
+            flush_interval: Maximum number of seconds a row waits in the buffer
+            max_pending: Upper bound on buffered rows; further turns are dropped
+        """
+        self._write_rows = write_rows
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: list[TurnRecord] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of turns waiting to be written."""
+        return len(self._pending)
+
+    def start(self) -> None:
+        """Start the background flush task on the running event loop."""
+        if self._task is None or self._task.done():
+            # Bound to the loop it is first awaited on, so made per start
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write everything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def enqueue(
+        self,
+        session_id: str,
+        turn_number: int,
+        speaker: str,
+        message: str,
+        metadata: dict | None = None,
+    ) -> bool:
+        """Buffer a turn for the next bulk write.
+
+        Returns:
+            False if the buffer is full and the turn was dropped.
+        """
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            logging.warning(
+                f"Turn buffer full ({self.max_pending} rows), dropping turn "
+                f"{turn_number} of session {session_id}"
+            )
+            return False
+
+        self._pending.append(
+            (
+                session_id,
+                turn_number,
+                speaker,
+                message,
+                json.dumps(metadata or {}),
+                datetime.utcnow(),
+            )
+        )
+        if len(self._pending) >= self.max_batch_size:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> None:
+        """Write all buffered turns in batches of ``max_batch_size``."""
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            await self._write(batch)
+
+    async def flush_session(self, session_id: str) -> None:
+        """Write the buffered turns of one session immediately."""
+        batch = [record for record in self._pending if record[0] == session_id]
+        if not batch:
+            return
+        self._pending = [record for record in self._pending if record[0] != session_id]
+        await self._write(batch)
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _write(self, batch: list[TurnRecord]) -> None:
+        try:
+            await self._write_rows(batch)
+        except Exception as e:
+            logging.error(f"Failed to save {len(batch)} conversation turns: {e}")
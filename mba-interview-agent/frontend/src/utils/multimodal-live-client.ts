@@ -36,7 +36,15 @@ import {
   ToolResponseMessage,
   type LiveConfig,
 } from "../multimodal-live-types";
-import { blobToJSON, base64ToArrayBuffer } from "./utils";
+import { base64ToArrayBuffer } from "./utils";
+
+/**
+ * binary audio frames from the server start with an 8-byte little-endian
+ * header: frame type (uint8), version (uint8), channels (uint16), sample
+ * rate (uint32), followed by raw PCM16 samples
+ */
+const AUDIO_FRAME_TYPE = 0x01;
+const AUDIO_HEADER_BYTES = 8;
 
 /**
  * the events that this client will emit
@@ -59,6 +67,8 @@ export type MultimodalLiveAPIClientConnection = {
   url?: string;
   runId?: string;
   userId?: string;
+  /** ask the server to send audio as binary frames instead of base64 JSON */
+  binaryAudio?: boolean;
 };
 
 /**
@@ -72,8 +82,18 @@ export class MultimodalLiveClient extends EventEmitter<MultimodalLiveClientEvent
   public url: string = "";
   private runId: string;
   private userId?: string;
-  constructor({ url, userId, runId }: MultimodalLiveAPIClientConnection) {
+  private binaryAudio: boolean;
+  /** lets a reconnect within the server's grace window resume the session */
+  private resumeToken?: string;
+  private textDecoder = new TextDecoder();
+  constructor({
+    url,
+    userId,
+    runId,
+    binaryAudio = true,
+  }: MultimodalLiveAPIClientConnection) {
     super();
+    this.binaryAudio = binaryAudio;
     url = url || `ws://localhost:8000/ws`;
     this.url = new URL("ws", url).href;
     this.userId = userId;
@@ -98,15 +118,23 @@ export class MultimodalLiveClient extends EventEmitter<MultimodalLiveClientEvent
       this.runId = newRunId;
     }
 
-    ws.addEventListener("message", async (evt: MessageEvent) => {
-      if (evt.data instanceof Blob) {
-        this.receive(evt.data);
+    ws.binaryType = "arraybuffer";
+    ws.addEventListener("message", (evt: MessageEvent) => {
+      if (evt.data instanceof ArrayBuffer) {
+        this.receiveBinary(evt.data);
       } else if (typeof evt.data === "string") {
         try {
           const jsonData = JSON.parse(evt.data);
-          if (jsonData.status) {
-            this.log("server.status", jsonData.status);
-            console.log("Status:", jsonData.status); // This will show in console
+          if (jsonData.type === "status" || jsonData.status) {
+            const status = jsonData.message || jsonData.status;
+            if (jsonData.resume_token) {
+              this.resumeToken = jsonData.resume_token;
+            }
+            this.log("server.status", status);
+            console.log("Status:", status); // This will show in console
+          } else {
+            // in binary audio mode all non-audio content arrives as text
+            this.receive(jsonData as LiveIncomingMessage);
           }
         } catch (error) {
           console.error("Error parsing message:", error);
@@ -134,6 +162,8 @@ export class MultimodalLiveClient extends EventEmitter<MultimodalLiveClientEvent
           setup: {
             run_id: this.runId,
             user_id: this.userId,
+            binary_audio: this.binaryAudio,
+            ...(this.resumeToken ? { resume_token: this.resumeToken } : {}),
           },
         };
         this._sendDirect(setupMessage);
@@ -174,10 +204,25 @@ export class MultimodalLiveClient extends EventEmitter<MultimodalLiveClientEvent
     }
     return false;
   }
-  protected async receive(blob: Blob) {
-    const response = (await blobToJSON(blob)) as LiveIncomingMessage;
-    console.log("Parsed response:", response);
+  /**
+   * binary frames are either audio (typed header + PCM16) or, when binary
+   * audio was not negotiated, a whole JSON message
+   */
+  protected receiveBinary(buffer: ArrayBuffer) {
+    const view = new DataView(buffer);
+    if (
+      buffer.byteLength >= AUDIO_HEADER_BYTES &&
+      view.getUint8(0) === AUDIO_FRAME_TYPE
+    ) {
+      const data = buffer.slice(AUDIO_HEADER_BYTES);
+      this.emit("audio", data);
+      this.log(`server.audio`, `buffer (${data.byteLength})`);
+      return;
+    }
+    this.receive(JSON.parse(this.textDecoder.decode(buffer)));
+  }
 
+  protected receive(response: LiveIncomingMessage) {
     if (isToolCallMessage(response)) {
       this.log("server.toolCall", response);
       this.emit("toolcall", response.toolCall);
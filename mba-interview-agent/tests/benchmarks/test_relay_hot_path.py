@@ -0,0 +1,163 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Microbenchmarks for code that runs on every relayed message.
+
+Run with ``make benchmark``; see tests/benchmarks/README.md for baselines.
+"""
+
+import base64
+import json
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from google.genai import types
+from google.genai.types import LiveServerToolCall
+
+from app.agent import clear_config_cache, create_personalized_config
+from app.server import validate_input
+from app.utils.audio_ingress import AudioIngress
+from app.utils.relay_codec import split_server_message, turn_text
+
+# 20 ms of 16 kHz PCM16, the chunk size browsers typically send
+CLIENT_CHUNK = bytes(640)
+
+
+async def _discard(message: str) -> None:
+    pass
+
+
+@pytest.mark.parametrize("name", ["server_audio", "server_text"])
+def test_model_dump_json(benchmark: Any, load_fixture: Callable, name: str) -> None:
+    """JSON relay of a Gemini message to a client in the legacy mode."""
+    message = types.LiveServerMessage.model_validate(load_fixture(name))
+
+    payload = benchmark(message.model_dump_json, exclude_none=True)
+
+    assert json.loads(payload)["server_content"]
+
+
+@pytest.mark.parametrize("name", ["server_audio", "server_text"])
+def test_split_server_message(
+    benchmark: Any, load_fixture: Callable, name: str
+) -> None:
+    """Binary-mode relay of a Gemini message to a client."""
+    message = types.LiveServerMessage.model_validate(load_fixture(name))
+
+    frames, payload = benchmark(split_server_message, message)
+
+    assert frames or payload
+
+
+def test_tool_call_model_validate(benchmark: Any, load_fixture: Callable) -> None:
+    """Re-validation of a tool call before it is dispatched."""
+    tool_call = types.LiveServerMessage.model_validate(
+        load_fixture("tool_call")
+    ).tool_call
+
+    validated = benchmark(LiveServerToolCall.model_validate, tool_call)
+
+    assert len(validated.function_calls) == 2
+
+
+def test_turn_text(benchmark: Any, load_fixture: Callable) -> None:
+    """Assembly of the agent's turn text on turn_complete."""
+    server_content = types.LiveServerMessage.model_validate(
+        load_fixture("server_text")
+    ).server_content
+    assert server_content is not None
+    model_turn = server_content.model_turn
+
+    text = benchmark(turn_text, model_turn)
+
+    assert text.startswith("Thank you")
+
+
+@pytest.mark.parametrize("name,expected", [("answer", True), ("injection", False)])
+def test_validate_input(
+    benchmark: Any, load_fixture: Callable, name: str, expected: bool
+) -> None:
+    """Prompt-injection screening of candidate text."""
+    text = load_fixture("transcripts")[name]
+
+    assert benchmark(validate_input, text) is expected
+
+
+def test_create_personalized_config_cached(
+    benchmark: Any, load_fixture: Callable
+) -> None:
+    """Session setup config for a school whose config is already cached."""
+    fixture = load_fixture("persona")
+    create_personalized_config(fixture["persona"], fixture["questions"])
+
+    config = benchmark(
+        create_personalized_config, fixture["persona"], fixture["questions"]
+    )
+
+    assert "Dana Lee" in config.system_instruction.parts[0].text
+
+
+def test_create_personalized_config_uncached(
+    benchmark: Any, load_fixture: Callable
+) -> None:
+    """Session setup config built from scratch."""
+    fixture = load_fixture("persona")
+
+    config = benchmark.pedantic(
+        create_personalized_config,
+        args=(fixture["persona"], fixture["questions"]),
+        setup=clear_config_cache,
+        rounds=200,
+    )
+
+    assert "Dana Lee" in config.system_instruction.parts[0].text
+
+
+def test_ingress_binary_chunk(benchmark: Any) -> None:
+    """Framing of one binary audio chunk from the client."""
+    ingress = AudioIngress(_discard, frame_ms=60)
+
+    def forward() -> None:
+        ingress.push_audio(CLIENT_CHUNK)
+        ingress._queue.clear()
+
+    benchmark(forward)
+
+    assert ingress.bytes_in > 0
+
+
+def test_ingress_json_chunk(benchmark: Any) -> None:
+    """Framing of one base64 audio chunk in a realtimeInput JSON message."""
+    ingress = AudioIngress(_discard, frame_ms=60)
+    message = json.dumps(
+        {
+            "realtimeInput": {
+                "mediaChunks": [
+                    {
+                        "mimeType": "audio/pcm;rate=16000",
+                        "data": base64.b64encode(CLIENT_CHUNK).decode(),
+                    }
+                ]
+            }
+        }
+    )
+
+    def forward() -> None:
+        ingress.push_client_message(message)
+        ingress._queue.clear()
+
+    benchmark(forward)
+
+    assert ingress.bytes_in > 0
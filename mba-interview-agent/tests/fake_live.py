@@ -0,0 +1,277 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A local stand-in for the Gemini Live websocket API used by tests.
+
+It speaks the Live JSON protocol: the setup message is acknowledged with
+``setupComplete`` and every completed client turn is answered with a model
+turn of PCM audio chunks followed by a text part and ``turnComplete``.
+Optionally every n-th turn first asks for a tool call and answers once the
+tool response arrives.
+
+The load tests run it as its own process, with the server pointed at it
+by ``tests/load_test/fake_backed_server.py``::
+
+    python -m tests.fake_live --port 9000 --latency 0.3 --realtime
+"""
+
+import argparse
+import asyncio
+import base64
+import functools
+import json
+import math
+import struct
+import threading
+
+from google import genai
+from websockets.asyncio.server import ServerConnection, serve
+
+
+def tone(sample_rate: int, duration_ms: int, frequency: float = 220.0) -> bytes:
+    """Quiet PCM16 sine tone, so audio is not all zeros."""
+    samples = sample_rate * duration_ms // 1000
+    return struct.pack(
+        f"<{samples}h",
+        *(
+            int(3000 * math.sin(2 * math.pi * frequency * i / sample_rate))
+            for i in range(samples)
+        ),
+    )
+
+
+def live_client(uri: str) -> genai.Client:
+    """A genai client whose ``aio.live.connect`` opens sessions at ``uri``.
+
+    The public ``connect()`` always targets the production endpoint and the
+    configurable base URL is forced to ``wss``, so the plain websocket fake
+    is reached by replacing ``connect`` on this client's instance only.
+    """
+    client = genai.Client(api_key="fake-key", http_options={"api_version": "v1alpha"})
+    vars(client.aio.live)["connect"] = functools.partial(
+        client.aio.live._connect, uri=uri
+    )
+    return client
+
+
+class FakeLiveServer:
+    """Fake Live endpoint served from a background thread."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        audio_chunks: int = 2,
+        chunk_ms: int = 40,
+        sample_rate: int = 24000,
+        turn_text: str = "Thank you. Tell me more about that.",
+        tool_call_every: int = 0,
+        realtime: bool = False,
+        record: bool = True,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize the fake endpoint.
+
+        Args:
+            latency: Seconds before the first chunk of each model turn
+            audio_chunks: Audio chunks per model turn
+            chunk_ms: Milliseconds of audio per chunk
+            sample_rate: Sample rate of the PCM16 audio sent back
+            turn_text: Text part closing each model turn
+            tool_call_every: Start every n-th model turn with a tool call; 0 never
+            realtime: Pace audio chunks at playback speed instead of sending at once
+            record: Keep every received message in ``received``; off for load runs
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free one
+        """
+        self.latency = latency
+        self.audio_chunks = audio_chunks
+        self.chunk_ms = chunk_ms
+        self.sample_rate = sample_rate
+        self.turn_text = turn_text
+        self.tool_call_every = tool_call_every
+        self.realtime = realtime
+        self.record = record
+        self.host = host
+        self._chunk = base64.b64encode(tone(sample_rate, chunk_ms)).decode()
+        self.port = port
+        self.connections = 0
+        self.messages = 0
+        self.tool_calls = 0
+        self.setups: list[dict] = []
+        self.received: list[dict] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws"
+
+    def client(self) -> genai.Client:
+        """A genai client whose ``aio.live.connect`` opens sessions on this server."""
+        return live_client(self.url)
+
+    def start(self) -> "FakeLiveServer":
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), daemon=True)
+        self._thread.start()
+        ready.wait(timeout=5)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeLiveServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _run(self, ready: threading.Event) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._serve(ready))
+
+    async def _serve(self, ready: threading.Event) -> None:
+        self._stop = asyncio.Event()
+        async with serve(self._handle, self.host, self.port, max_size=None) as server:
+            self.port = next(iter(server.sockets)).getsockname()[1]
+            ready.set()
+            await self._stop.wait()
+
+    async def _handle(self, ws: ServerConnection) -> None:
+        self.connections += 1
+        self.setups.append(json.loads(await ws.recv()))
+        await ws.send(json.dumps({"setupComplete": {}}))
+        turns = 0
+        responses: set[asyncio.Task] = set()
+        async for raw in ws:
+            self.messages += 1
+            message = json.loads(raw)
+            if self.record:
+                self.received.append(message)
+            # google-genai sends some message keys in snake_case
+            content = (
+                message.get("clientContent") or message.get("client_content") or {}
+            )
+            if content.get("turnComplete") or content.get("turn_complete"):
+                turns += 1
+                if self.tool_call_every and turns % self.tool_call_every == 0:
+                    await self._call_tool(ws, turns)
+                    continue
+            elif "toolResponse" not in message and "tool_response" not in message:
+                continue
+            # Answer off the read loop, so client audio keeps flowing meanwhile
+            task = asyncio.create_task(self._respond(ws))
+            responses.add(task)
+            task.add_done_callback(responses.discard)
+
+    async def _call_tool(self, ws: ServerConnection, turn: int) -> None:
+        await asyncio.sleep(self.latency)
+        self.tool_calls += 1
+        await ws.send(
+            json.dumps(
+                {
+                    "toolCall": {
+                        "functionCalls": [
+                            {
+                                "id": f"call-{turn}",
+                                "name": "take_interview_notes",
+                                "args": {
+                                    "observation": "Gave a structured answer",
+                                    "dimension": "communication",
+                                    "rating": 4,
+                                },
+                            }
+                        ]
+                    }
+                }
+            )
+        )
+
+    async def _respond(self, ws: ServerConnection) -> None:
+        await asyncio.sleep(self.latency)
+        mime_type = f"audio/pcm;rate={self.sample_rate}"
+        chunk = json.dumps(
+            {
+                "serverContent": {
+                    "modelTurn": {
+                        "parts": [
+                            {"inlineData": {"mimeType": mime_type, "data": self._chunk}}
+                        ]
+                    }
+                }
+            }
+        )
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for i in range(self.audio_chunks):
+            if self.realtime:
+                await asyncio.sleep(
+                    max(0.0, started + i * self.chunk_ms / 1000 - loop.time())
+                )
+            await ws.send(chunk)
+        await ws.send(
+            json.dumps(
+                {
+                    "serverContent": {
+                        "modelTurn": {"parts": [{"text": self.turn_text}]},
+                        "turnComplete": True,
+                    }
+                }
+            )
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a fake Gemini Live endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument(
+        "--latency", type=float, default=0.3, help="seconds before each model turn"
+    )
+    parser.add_argument(
+        "--audio-chunks", type=int, default=50, help="chunks per model turn"
+    )
+    parser.add_argument("--chunk-ms", type=int, default=40)
+    parser.add_argument("--tool-call-every", type=int, default=0)
+    parser.add_argument(
+        "--realtime", action="store_true", help="pace audio at playback speed"
+    )
+    args = parser.parse_args()
+
+    fake = FakeLiveServer(
+        latency=args.latency,
+        audio_chunks=args.audio_chunks,
+        chunk_ms=args.chunk_ms,
+        tool_call_every=args.tool_call_every,
+        realtime=args.realtime,
+        record=False,
+        host=args.host,
+        port=args.port,
+    )
+    stop = threading.Event()
+    with fake:
+        print(f"Fake Live API listening on {fake.url}", flush=True)
+        try:
+            stop.wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
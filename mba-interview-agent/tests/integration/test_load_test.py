@@ -0,0 +1,55 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from pathlib import Path
+
+import pytest
+
+from tests.load_test.load_test import parse_args, run
+
+
+@pytest.mark.asyncio
+async def test_load_test_against_local_stack(tmp_path: Path) -> None:
+    """A small swarm against the fake Live endpoint completes and writes its reports."""
+    args = parse_args(
+        [
+            "--stages",
+            "2",
+            "--turns",
+            "2",
+            "--speech-seconds",
+            "0.2",
+            "--think-seconds",
+            "0",
+            "--fake-latency",
+            "0.05",
+            "--fake-tool-call-every",
+            "2",
+            "--cooldown-seconds",
+            "0",
+            "--out",
+            str(tmp_path),
+        ]
+    )
+
+    report = await run(args)
+
+    stage = report["stages"][0]
+    assert stage["completed"] == 2, stage["errors"]
+    assert stage["turn_latency_ms"]["count"] == 4
+    assert stage["setup_ms"]["p50"] is not None
+    assert report["max_sustained_sessions"] == 2
+    [report_path] = tmp_path.glob("*/report.json")
+    assert json.loads(report_path.read_text())["stages"][0]["sessions"] == 2
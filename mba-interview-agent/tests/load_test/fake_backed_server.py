@@ -0,0 +1,54 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs ``app.server`` with its Gemini client pointed at a fake Live endpoint.
+
+The load test starts the server through this module so production code has
+no hook for swapping the Live API endpoint::
+
+    python -m tests.load_test.fake_backed_server --live-uri ws://127.0.0.1:9000/ws --port 8000
+"""
+
+import argparse
+import os
+from unittest.mock import patch
+
+import uvicorn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve the app against a fake Gemini Live endpoint."
+    )
+    parser.add_argument(
+        "--live-uri", required=True, help="websocket URI of the fake endpoint"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    # The API-key client needs no credentials; set before app.agent is imported
+    os.environ["VERTEXAI"] = "false"
+
+    from app import server
+    from tests.fake_live import live_client
+
+    with patch.object(
+        server, "get_genai_client", return_value=live_client(args.live_uri)
+    ):
+        uvicorn.run(server.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
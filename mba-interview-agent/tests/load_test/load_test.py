@@ -12,29 +12,558 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+"""Websocket load test: a swarm of simulated candidates against ``/ws``.
+
+Each simulated session sends the setup message, then for every turn streams
+16 kHz PCM16 speech in real time, ends the turn and waits for the model's
+answer. The swarm measures setup latency, time to first audio and per-turn
+latency, and samples the server's CPU and RSS. Stages of increasing
+concurrency show how many sessions one instance sustains.
+
+By default the server and a fake Gemini Live endpoint (``tests/fake_live.py``)
+are started locally; pass ``--url`` to target a running server instead.
+Reports are written to ``tests/load_test/.results`` as JSON and CSV.
+
+    python -m tests.load_test.load_test --stages 10,25,50 --turns 3
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import socket
+import struct
+import subprocess
+import sys
 import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import websockets
+
+RESULTS_DIR = Path(__file__).parent / ".results"
+
+INPUT_SAMPLE_RATE = 16000
+FRAME_MS = 20
+# Binary audio frames from the server start with this type byte (app/utils/relay_codec.py)
+AUDIO_FRAME_TYPE = 0x01
+
+
+@dataclass
+class SessionResult:
+    """Measurements of one simulated session, in milliseconds."""
+
+    outcome: str = "ok"  # ok, rejected, failed
+    error: str = ""
+    setup_ms: float | None = None
+    first_audio_ms: float | None = None
+    turn_latency_ms: list[float] = field(default_factory=list)
+    turn_total_ms: list[float] = field(default_factory=list)
+
+
+@dataclass
+class _Turn:
+    sent_at: float = 0.0
+    first_audio_at: float | None = None
+    complete: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def start(self) -> None:
+        """Reset for a new turn; the reader task fills in the rest."""
+        self.first_audio_at, self.sent_at = None, time.perf_counter()
+        self.complete.clear()
+
+
+def percentiles(values: list[float]) -> dict[str, float | None]:
+    """Nearest-rank percentiles of ``values``."""
+    if not values:
+        return {
+            "count": 0,
+            "p50": None,
+            "p90": None,
+            "p95": None,
+            "p99": None,
+            "max": None,
+        }
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)], 1)
+
+    return {
+        "count": len(ordered),
+        "p50": rank(50),
+        "p90": rank(90),
+        "p95": rank(95),
+        "p99": rank(99),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def speech_frame() -> bytes:
+    """One 20 ms frame of quiet 16 kHz PCM16 tone."""
+    samples = INPUT_SAMPLE_RATE * FRAME_MS // 1000
+    return struct.pack(
+        f"<{samples}h",
+        *(
+            int(2000 * math.sin(2 * math.pi * 180 * i / INPUT_SAMPLE_RATE))
+            for i in range(samples)
+        ),
+    )
+
+
+class ResourceSampler:
+    """Samples CPU percent and RSS of a process from /proc (Linux only)."""
+
+    def __init__(self, pid: int | None, interval: float = 0.5) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.cpu_percent: list[float] = []
+        self.rss_mb: list[float] = []
+        self._ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._page = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    @property
+    def available(self) -> bool:
+        return self.pid is not None and Path(f"/proc/{self.pid}/stat").exists()
+
+    def _read(self) -> tuple[float, float]:
+        stat = Path(f"/proc/{self.pid}/stat").read_text()
+        # Fields after the parenthesised command name; utime and stime are 14 and 15
+        fields = stat[stat.rindex(")") + 2 :].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self._ticks
+        rss_pages = int(Path(f"/proc/{self.pid}/statm").read_text().split()[1])
+        return cpu_seconds, rss_pages * self._page / 2**20
+
+    async def run(self) -> None:
+        if not self.available:
+            return
+        previous_cpu, _ = self._read()
+        previous_at = time.perf_counter()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                cpu, rss = self._read()
+            except (OSError, ValueError):
+                return
+            now = time.perf_counter()
+            self.cpu_percent.append(
+                round((cpu - previous_cpu) / (now - previous_at) * 100, 1)
+            )
+            self.rss_mb.append(round(rss, 1))
+            previous_cpu, previous_at = cpu, now
+
+    def summary(self) -> dict:
+        return {
+            "cpu_percent_avg": round(sum(self.cpu_percent) / len(self.cpu_percent), 1)
+            if self.cpu_percent
+            else None,
+            "cpu_percent_max": max(self.cpu_percent, default=None),
+            "rss_mb_max": max(self.rss_mb, default=None),
+            "rss_mb_last": self.rss_mb[-1] if self.rss_mb else None,
+        }
 
-from locust import HttpUser, between, task
 
+async def run_session(
+    index: int, args: argparse.Namespace, frame: bytes
+) -> SessionResult:
+    """Drive one simulated interview and measure it."""
+    result = SessionResult()
+    turn = _Turn()
+    started = time.perf_counter()
+    # Distinct addresses keep per-IP rate limits realistic for a single load host
+    headers = {
+        "X-Forwarded-For": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"
+    }
 
-class DummyUser(HttpUser):
-    """Simulates a user for testing purposes."""
+    async def read(ws: websockets.ClientConnection) -> None:
+        async for message in ws:
+            if isinstance(message, bytes) and message[:1] == bytes([AUDIO_FRAME_TYPE]):
+                now = time.perf_counter()
+                if result.first_audio_ms is None:
+                    result.first_audio_ms = (now - started) * 1000
+                if turn.first_audio_at is None:
+                    turn.first_audio_at = now
+            elif '"turnComplete":true' in (message if isinstance(message, str) else ""):
+                turn.complete.set()
 
-    wait_time = between(1, 3)  # Wait 1-3 seconds between tasks
+    try:
+        async with websockets.connect(
+            args.url, additional_headers=headers, max_size=None
+        ) as ws:
+            await ws.send(
+                json.dumps(
+                    {
+                        "setup": {
+                            "run_id": f"load-{uuid.uuid4().hex[:8]}",
+                            "user_id": f"load-user-{index}",
+                            "binary_audio": True,
+                            "context": {"school_id": args.school_id}
+                            if args.school_id
+                            else {},
+                        }
+                    }
+                )
+            )
+            while True:
+                status = json.loads(
+                    await asyncio.wait_for(ws.recv(), timeout=args.timeout)
+                )
+                if status.get("retry_after"):
+                    result.outcome, result.error = "rejected", status.get("message", "")
+                    return result
+                if not status.get("queued"):
+                    break
+            result.setup_ms = (time.perf_counter() - started) * 1000
 
-    @task
-    def dummy_task(self) -> None:
-        """A dummy task that simulates work without making actual requests."""
-        # Simulate some processing time
+            reader = asyncio.create_task(read(ws))
+            try:
+                for _ in range(args.turns):
+                    # Real-time speech, scheduled against the clock so it does not drift
+                    frames = int(args.speech_seconds * 1000 / FRAME_MS)
+                    speech_started = time.perf_counter()
+                    for i in range(frames):
+                        await asyncio.sleep(
+                            max(
+                                0.0,
+                                speech_started
+                                + i * FRAME_MS / 1000
+                                - time.perf_counter(),
+                            )
+                        )
+                        await ws.send(frame)
+
+                    turn.start()
+                    await ws.send(
+                        json.dumps(
+                            {
+                                "clientContent": {
+                                    "turns": [
+                                        {
+                                            "role": "user",
+                                            "parts": [{"text": "That is my answer."}],
+                                        }
+                                    ],
+                                    "turnComplete": True,
+                                }
+                            }
+                        )
+                    )
+                    await asyncio.wait_for(turn.complete.wait(), timeout=args.timeout)
+                    if turn.first_audio_at is not None:
+                        result.turn_latency_ms.append(
+                            (turn.first_audio_at - turn.sent_at) * 1000
+                        )
+                    result.turn_total_ms.append(
+                        (time.perf_counter() - turn.sent_at) * 1000
+                    )
+                    await asyncio.sleep(args.think_seconds)
+            finally:
+                reader.cancel()
+    except Exception as e:
+        if (
+            isinstance(e, websockets.ConnectionClosed)
+            and e.rcvd is not None
+            and e.rcvd.code == 1013
+        ):
+            result.outcome = "rejected"
+        else:
+            result.outcome = "failed"
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+async def run_stage(
+    sessions: int, args: argparse.Namespace, server_pid: int | None
+) -> dict:
+    """Run ``sessions`` concurrent sessions, ramped up at ``--ramp`` per second."""
+    frame = speech_frame()
+    sampler = ResourceSampler(server_pid)
+    sampling = asyncio.create_task(sampler.run())
+    started = time.perf_counter()
+
+    async def delayed(index: int) -> SessionResult:
+        await asyncio.sleep(index / args.ramp)
+        return await run_session(index, args, frame)
+
+    results = await asyncio.gather(*(delayed(i) for i in range(sessions)))
+    sampling.cancel()
+
+    ok = [r for r in results if r.outcome == "ok"]
+    errors: dict[str, int] = {}
+    for r in results:
+        if r.error:
+            errors[r.error[:120]] = errors.get(r.error[:120], 0) + 1
+    return {
+        "sessions": sessions,
+        "completed": len(ok),
+        "rejected": sum(r.outcome == "rejected" for r in results),
+        "failed": sum(r.outcome == "failed" for r in results),
+        "duration_seconds": round(time.perf_counter() - started, 1),
+        "setup_ms": percentiles(
+            [r.setup_ms for r in results if r.setup_ms is not None]
+        ),
+        "first_audio_ms": percentiles(
+            [r.first_audio_ms for r in results if r.first_audio_ms is not None]
+        ),
+        "turn_latency_ms": percentiles([v for r in results for v in r.turn_latency_ms]),
+        "turn_total_ms": percentiles([v for r in results for v in r.turn_total_ms]),
+        "server": sampler.summary(),
+        "errors": errors,
+    }
+
+
+def sustained(stage: dict, args: argparse.Namespace) -> bool:
+    """Whether a stage met the latency objective with every session completing."""
+    p95 = stage["turn_latency_ms"]["p95"]
+    return (
+        stage["completed"] == stage["sessions"]
+        and p95 is not None
+        and p95 <= args.slo_p95_turn_ms
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args!r} exited with {process.returncode}")
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
         time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout}s")
+
 
-        # Record a successful dummy request
-        self.environment.events.request.fire(
-            request_type="POST",
-            name="dummy_endpoint",
-            response_time=100,
-            response_length=1024,
-            response=None,
-            context={},
-            exception=None,
+def start_local_stack(
+    args: argparse.Namespace, log_dir: Path
+) -> list[subprocess.Popen]:
+    """Start the fake Live endpoint and the server wired to it; sets ``args.url``."""
+    fake_port, server_port = free_port(), free_port()
+    # The children keep their own handles to the log files
+    with open(log_dir / "fake_live.log", "w") as fake_log:
+        fake = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "tests.fake_live",
+                "--port",
+                str(fake_port),
+                "--latency",
+                str(args.fake_latency),
+                "--audio-chunks",
+                str(args.fake_audio_chunks),
+                "--tool-call-every",
+                str(args.fake_tool_call_every),
+                "--realtime",
+            ],
+            stdout=fake_log,
+            stderr=subprocess.STDOUT,
         )
+    wait_for_port(fake_port, fake)
+
+    env = {
+        **os.environ,
+        "VERTEXAI": "false",
+        "LOG_BACKEND": str(log_dir / "server_structured.jsonl"),
+        "MAX_LIVE_SESSIONS": os.environ.get(
+            "MAX_LIVE_SESSIONS", str(args.max_live_sessions)
+        ),
+    }
+    with open(log_dir / "server.log", "w") as server_log:
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "tests.load_test.fake_backed_server",
+                "--live-uri",
+                f"ws://127.0.0.1:{fake_port}/ws",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(server_port),
+            ],
+            stdout=server_log,
+            stderr=subprocess.STDOUT,
+            env=env,
+        )
+    try:
+        wait_for_port(server_port, server)
+    except RuntimeError:
+        fake.terminate()
+        raise
+    args.url = f"ws://127.0.0.1:{server_port}/ws"
+    return [server, fake]
+
+
+def write_reports(report: dict, out_dir: Path) -> tuple[Path, Path]:
+    """Write the full JSON report and a one-row-per-stage CSV summary."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    json_path = out_dir / "report.json"
+    json_path.write_text(json.dumps(report, indent=2))
+
+    csv_path = out_dir / "stages.csv"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "sessions",
+                "completed",
+                "rejected",
+                "failed",
+                "setup_p95_ms",
+                "first_audio_p95_ms",
+                "turn_p50_ms",
+                "turn_p95_ms",
+                "turn_p99_ms",
+                "cpu_avg_pct",
+                "cpu_max_pct",
+                "rss_max_mb",
+                "sustained",
+            ]
+        )
+        for stage in report["stages"]:
+            writer.writerow(
+                [
+                    stage["sessions"],
+                    stage["completed"],
+                    stage["rejected"],
+                    stage["failed"],
+                    stage["setup_ms"]["p95"],
+                    stage["first_audio_ms"]["p95"],
+                    stage["turn_latency_ms"]["p50"],
+                    stage["turn_latency_ms"]["p95"],
+                    stage["turn_latency_ms"]["p99"],
+                    stage["server"]["cpu_percent_avg"],
+                    stage["server"]["cpu_percent_max"],
+                    stage["server"]["rss_mb_max"],
+                    stage["sustained"],
+                ]
+            )
+    return json_path, csv_path
+
+
+async def run(args: argparse.Namespace) -> dict:
+    out_dir = Path(args.out) / datetime.now().strftime("%Y%m%d-%H%M%S")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    processes = [] if args.url else start_local_stack(args, out_dir)
+    server_pid = processes[0].pid if processes else args.server_pid
+    try:
+        stages = []
+        for sessions in args.stages:
+            print(f"Stage: {sessions} sessions against {args.url}", flush=True)
+            stage = await run_stage(sessions, args, server_pid)
+            stage["sustained"] = sustained(stage, args)
+            stages.append(stage)
+            print(
+                f"  completed {stage['completed']}/{sessions}, rejected {stage['rejected']}, "
+                f"turn p95 {stage['turn_latency_ms']['p95']} ms, "
+                f"cpu max {stage['server']['cpu_percent_max']}%, rss max {stage['server']['rss_mb_max']} MB",
+                flush=True,
+            )
+            if not stage["sustained"] and args.stop_on_failure:
+                break
+            await asyncio.sleep(args.cooldown_seconds)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+
+    passing = [stage["sessions"] for stage in stages if stage["sustained"]]
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "url": args.url,
+        "config": {
+            key: value for key, value in vars(args).items() if key not in ("url", "out")
+        },
+        "max_sustained_sessions": max(passing, default=0),
+        "stages": stages,
+    }
+    json_path, csv_path = write_reports(report, out_dir)
+    print(
+        f"Max sustained sessions: {report['max_sustained_sessions']}; reports in {json_path} and {csv_path}"
+    )
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url", help="websocket URL of a running server; default starts a local one"
+    )
+    parser.add_argument(
+        "--server-pid", type=int, help="pid to sample CPU and RSS of, with --url"
+    )
+    parser.add_argument(
+        "--stages",
+        default="5,10,25",
+        type=lambda s: [int(n) for n in s.split(",")],
+        help="comma separated concurrent session counts",
+    )
+    parser.add_argument(
+        "--ramp", type=float, default=10.0, help="new sessions per second"
+    )
+    parser.add_argument("--turns", type=int, default=3, help="turns per session")
+    parser.add_argument(
+        "--speech-seconds", type=float, default=2.0, help="candidate audio per turn"
+    )
+    parser.add_argument(
+        "--think-seconds", type=float, default=0.5, help="pause after each answer"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="seconds to wait for setup or a turn",
+    )
+    parser.add_argument(
+        "--school-id", help="school_id for the setup context (needs a database)"
+    )
+    parser.add_argument(
+        "--slo-p95-turn-ms",
+        type=float,
+        default=1500.0,
+        help="p95 turn latency a stage must stay under to count as sustained",
+    )
+    parser.add_argument(
+        "--stop-on-failure",
+        action="store_true",
+        help="stop after the first failing stage",
+    )
+    parser.add_argument("--cooldown-seconds", type=float, default=2.0)
+    parser.add_argument(
+        "--max-live-sessions",
+        type=int,
+        default=1000,
+        help="MAX_LIVE_SESSIONS of a local server",
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=0.3,
+        help="fake Live API seconds before each answer",
+    )
+    parser.add_argument(
+        "--fake-audio-chunks", type=int, default=25, help="40 ms chunks per fake answer"
+    )
+    parser.add_argument(
+        "--fake-tool-call-every",
+        type=int,
+        default=3,
+        help="tool call every n-th turn; 0 never",
+    )
+    parser.add_argument("--out", default=str(RESULTS_DIR), help="directory for reports")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
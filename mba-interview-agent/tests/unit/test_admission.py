@@ -0,0 +1,120 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from app.utils.admission import AdmissionController, AdmissionRejected, RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_admission_queues_in_order_and_sheds_overflow() -> None:
+    """Waiters get freed slots first-come first-served; beyond the queue callers are rejected."""
+    admission = AdmissionController(
+        max_sessions=1, max_waiting=2, wait_timeout=1.0, retry_after=3
+    )
+    await admission.acquire()
+
+    positions: list[int] = []
+    order: list[str] = []
+
+    async def wait(name: str) -> None:
+        async def on_queued(position: int) -> None:
+            positions.append(position)
+
+        await admission.acquire(on_queued)
+        order.append(name)
+
+    first = asyncio.create_task(wait("first"))
+    second = asyncio.create_task(wait("second"))
+    await asyncio.sleep(0)
+    assert positions == [1, 2]
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await admission.acquire()
+    assert rejected.value.retry_after == 3
+
+    admission.release()
+    await first
+    admission.release()
+    await second
+    assert order == ["first", "second"]
+    assert admission.active == 1
+
+    admission.release()
+    assert admission.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_positions_are_reported_as_the_queue_drains() -> None:
+    """A waiter hears its new position each time someone ahead of it leaves."""
+    admission = AdmissionController(max_sessions=1, max_waiting=3, wait_timeout=1.0)
+    await admission.acquire()
+    positions: dict[str, list[int]] = {"first": [], "second": [], "third": []}
+
+    async def wait(name: str) -> None:
+        async def on_queued(position: int) -> None:
+            positions[name].append(position)
+
+        await admission.acquire(on_queued)
+
+    tasks = {name: asyncio.create_task(wait(name)) for name in positions}
+    await asyncio.sleep(0)
+    assert positions == {"first": [1], "second": [2], "third": [3]}
+
+    admission.release()
+    await tasks["first"]
+    await asyncio.sleep(0)
+    assert positions["third"] == [3, 2]
+
+    tasks["second"].cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await tasks["second"]
+    await asyncio.sleep(0)
+    assert positions["third"] == [3, 2, 1]
+    assert positions["second"] == [2, 1]
+
+    admission.release()
+    await tasks["third"]
+    admission.release()
+    assert admission.active == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_wait_times_out() -> None:
+    """A waiter that is never served gives up and leaves the queue."""
+    admission = AdmissionController(max_sessions=1, max_waiting=1, wait_timeout=0.01)
+    await admission.acquire()
+
+    with pytest.raises(AdmissionRejected):
+        await admission.acquire()
+    assert admission.waiting == 0
+    assert admission.stats()["timed_out"] == 1
+
+    admission.release()
+    assert admission.active == 0
+
+
+def test_rate_limiter_buckets_are_per_key() -> None:
+    """Each key gets its own burst, and an empty bucket says when to retry."""
+    limiter = RateLimiter(per_minute=6, burst=2)
+    limiter.check("user:a")
+    limiter.check("user:a")
+    with pytest.raises(AdmissionRejected) as rejected:
+        limiter.check("user:a")
+    assert 1 <= rejected.value.retry_after <= 10
+
+    limiter.check("user:b")
+    assert limiter.rejected == 1
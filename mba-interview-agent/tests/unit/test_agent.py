@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.auth.credentials import Credentials
+
+PERSONA = {
+    "interviewer_name": "Dana Lee",
+    "interviewer_title": "Director of Admissions",
+    "school_context": "A case-method business school",
+}
+QUESTIONS = [{"question_text": "Tell me about a time you led a team."}]
+
+
+@pytest.fixture
+def agent() -> Generator[ModuleType, None, None]:
+    """Import app.agent with Google Cloud initialization mocked out."""
+    with (
+        patch(
+            "google.auth.default",
+            return_value=(MagicMock(spec=Credentials), "mock-project-id"),
+        ),
+        patch("vertexai.init"),
+    ):
+        from app import agent
+
+        agent.clear_config_cache()
+        yield agent
+
+
+def test_identical_persona_reuses_config(agent: ModuleType) -> None:
+    """The same persona and questions return the same shared config object."""
+    first = agent.create_personalized_config(PERSONA, QUESTIONS)
+    second = agent.create_personalized_config(dict(PERSONA), list(QUESTIONS))
+
+    assert first is second
+    assert "Dana Lee" in first.system_instruction.parts[0].text
+    stats = agent.config_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["instruction_bytes"] > 0
+
+
+def test_changed_question_builds_new_config(agent: ModuleType) -> None:
+    """Any change to the persona or question texts produces a different config."""
+    first = agent.create_personalized_config(PERSONA, QUESTIONS)
+    second = agent.create_personalized_config(PERSONA, [{"question_text": "Why now?"}])
+
+    assert first is not second
+    assert "Why now?" in second.system_instruction.parts[0].text
+    assert agent.config_cache_stats()["entries"] == 2
+
+
+def test_genai_client_is_created_once_across_threads(agent: ModuleType) -> None:
+    """Concurrent first calls share one lazily created client."""
+
+    def slow_client(**kwargs: object) -> object:
+        time.sleep(0.05)
+        return object()
+
+    with (
+        patch.object(agent, "_genai_client", None),
+        patch.object(agent.genai, "Client", side_effect=slow_client) as client_cls,
+        ThreadPoolExecutor(max_workers=8) as pool,
+    ):
+        clients = list(pool.map(lambda _: agent.get_genai_client(), range(8)))
+
+    assert client_cls.call_count == 1
+    assert all(client is clients[0] for client in clients)
@@ -0,0 +1,110 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import base64
+import json
+
+import pytest
+
+from app.utils.audio_ingress import AudioIngress, IngressOverflowError
+
+
+def decode_audio(message: str) -> bytes:
+    """Return the PCM payload of an upstream realtimeInput frame."""
+    chunk = json.loads(message)["realtimeInput"]["mediaChunks"][0]
+    assert chunk["mimeType"] == "audio/pcm;rate=16000"
+    return base64.b64decode(chunk["data"])
+
+
+@pytest.mark.asyncio
+async def test_small_chunks_are_coalesced_into_frames() -> None:
+    """Ten 10 ms chunks become two 50 ms frames sent upstream."""
+    sent: list[str] = []
+
+    async def send(message: str) -> None:
+        sent.append(message)
+
+    ingress = AudioIngress(send, frame_ms=50)
+    chunk = b"\x01\x00" * 160  # 10 ms of 16 kHz PCM16
+    for _ in range(10):
+        ingress.push_audio(chunk)
+    ingress.close()
+    await ingress.run()
+
+    assert [len(decode_audio(m)) for m in sent] == [1600, 1600]
+    assert ingress.stats()["frames_sent"] == 2
+
+
+@pytest.mark.asyncio
+async def test_json_audio_is_framed_and_other_messages_keep_order() -> None:
+    """Base64 audio inside realtimeInput is framed; control messages pass through."""
+    sent: list[str] = []
+
+    async def send(message: str) -> None:
+        sent.append(message)
+
+    ingress = AudioIngress(send, frame_ms=100)
+    audio = base64.b64encode(b"\x00\x00" * 100).decode()
+    ingress.push_client_message(
+        json.dumps(
+            {
+                "realtimeInput": {
+                    "mediaChunks": [{"mimeType": "audio/pcm;rate=16000", "data": audio}]
+                }
+            }
+        )
+    )
+    ingress.push_client_message(json.dumps({"clientContent": {"turnComplete": True}}))
+    ingress.close()
+    await ingress.run()
+
+    assert len(decode_audio(sent[0])) == 200
+    assert json.loads(sent[1]) == {"clientContent": {"turnComplete": True}}
+
+
+@pytest.mark.asyncio
+async def test_partial_frame_flushed_when_audio_stops() -> None:
+    """The tail of an utterance is sent after frame_ms of silence."""
+    sent: list[str] = []
+
+    async def send(message: str) -> None:
+        sent.append(message)
+
+    ingress = AudioIngress(send, frame_ms=20)
+    task = asyncio.create_task(ingress.run())
+    ingress.push_audio(b"\x00\x00" * 10)
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    assert len(sent) == 1
+    assert len(decode_audio(sent[0])) == 20
+
+
+def test_overflow_policies() -> None:
+    """A full queue drops the oldest frame, or raises when set to close."""
+
+    async def send(message: str) -> None:
+        pass
+
+    dropping = AudioIngress(send, frame_ms=10, max_queue=2)
+    for _ in range(3):
+        dropping.push_audio(b"\x00" * dropping.frame_bytes)
+    assert dropping.depth == 2
+    assert dropping.frames_dropped == 1
+
+    closing = AudioIngress(send, frame_ms=10, max_queue=2, overflow_policy="close")
+    closing.push_audio(b"\x00" * closing.frame_bytes * 2)
+    with pytest.raises(IngressOverflowError):
+        closing.push_audio(b"\x00" * closing.frame_bytes)
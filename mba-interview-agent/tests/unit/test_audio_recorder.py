@@ -0,0 +1,97 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import wave
+from pathlib import Path
+
+from app.utils.audio_recorder import AudioRecorder, PcmRing
+
+
+def test_ring_wraps_around_and_drops_when_full() -> None:
+    """Writes that wrap come out in order; a write that does not fit is dropped whole."""
+    ring = PcmRing(10)
+    sink = io.BytesIO()
+    assert ring.write(b"abcdef")
+    assert ring.drain(sink) == 6
+    assert ring.write(b"ghijklmn")  # wraps past the end of the buffer
+    assert not ring.write(b"opq")
+    assert ring.dropped_bytes == 3
+    assert ring.drain(sink, limit=5) == 5
+    assert ring.drain(sink) == 3
+    assert sink.getvalue() == b"abcdefghijklmn"
+
+
+def test_sessions_are_written_as_segmented_wav(tmp_path: Path) -> None:
+    """Each speaker gets WAV segments capped at the segment size, plus metadata."""
+    recorder = AudioRecorder(str(tmp_path), segment_bytes=3200, flush_interval=0.01)
+    recorder.start()
+    recording = recorder.open("session-1")
+    for _ in range(5):
+        recording.candidate.write(b"\x01\x00" * 800)  # 50 ms at 16 kHz
+    recording.interviewer.write(b"\x02\x00" * 1200)
+    recording.metadata["user_id"] = "user-1"
+    recorder.close(recording)
+    recorder.stop()
+
+    directory = tmp_path / "session-1"
+    candidate = sorted(directory.glob("candidate-*.wav"))
+    assert len(candidate) == 3
+    frames = 0
+    for path in candidate:
+        with wave.open(str(path)) as wav:
+            assert wav.getframerate() == 16000 and wav.getsampwidth() == 2
+            frames += wav.getnframes()
+    assert frames == 4000
+    with wave.open(str(directory / "interviewer-000.wav")) as wav:
+        assert wav.getframerate() == 24000 and wav.getnframes() == 1200
+    metadata = json.loads((directory / "session.json").read_text())
+    assert metadata["user_id"] == "user-1"
+    assert metadata["audio"]["candidate"]["written_bytes"] == 8000
+    assert recorder.stats()["active"] == 0
+
+
+def test_audio_past_the_track_cap_is_counted_by_the_writer(tmp_path: Path) -> None:
+    """The writer discards audio beyond the cap without touching the ring's counter."""
+    recorder = AudioRecorder(str(tmp_path), max_track_bytes=1000, flush_interval=0.01)
+    recorder.start()
+    recording = recorder.open("session-1")
+    recording.candidate.write(b"\x01\x00" * 1000)
+    recorder.close(recording)
+    recorder.stop()
+
+    track = recording.candidate
+    assert track.written_bytes == 1000
+    assert track.ring.dropped_bytes == 0
+    assert track.capped_bytes == 1000
+    assert recording.stats()["candidate"]["dropped_bytes"] == 1000
+
+
+def test_odd_segment_sizes_do_not_split_samples(tmp_path: Path) -> None:
+    """Segment boundaries fall between samples even for an odd segment size."""
+    recorder = AudioRecorder(str(tmp_path), segment_bytes=1001, flush_interval=0.01)
+    assert recorder.segment_bytes == 1000
+    recorder.start()
+    recording = recorder.open("session-1")
+    recording.candidate.write(b"\x01\x00" * 1500)
+    recorder.close(recording)
+    recorder.stop()
+
+    frames = 0
+    for path in sorted((tmp_path / "session-1").glob("candidate-*.wav")):
+        with wave.open(str(path)) as wav:
+            frames += wav.getnframes()
+            assert wav.readframes(wav.getnframes()) == b"\x01\x00" * wav.getnframes()
+    assert frames == 1500
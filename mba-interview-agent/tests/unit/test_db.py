@@ -0,0 +1,100 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.db import Database, DatabaseUnavailableError
+
+
+def make_pool(size: int = 2, idle: int = 1) -> MagicMock:
+    """Build a stand-in for an asyncpg pool."""
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=MagicMock())
+    pool.release = AsyncMock()
+    pool.get_size.return_value = size
+    pool.get_idle_size.return_value = idle
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_acquire_releases_and_records_wait() -> None:
+    """Connections go back to the pool and every acquisition is timed."""
+    db = Database(max_size=4)
+    db.pool = make_pool()
+
+    async with db.acquire() as conn:
+        assert conn is db.pool.acquire.return_value
+
+    db.pool.release.assert_awaited_once_with(conn)
+    stats = db.stats()
+    assert stats["acquisitions"] == 1
+    assert stats["in_use"] == 1
+    assert stats["max_size"] == 4
+    assert stats["wait_seconds_total"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_releases_on_error() -> None:
+    """A failing query still returns its connection."""
+    db = Database()
+    db.pool = make_pool()
+
+    with pytest.raises(ValueError):
+        async with db.acquire():
+            raise ValueError("query failed")
+
+    db.pool.release.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_acquire_without_pool_fails_fast() -> None:
+    """Queries do not try to create a pool on the request path."""
+    db = Database()
+
+    with pytest.raises(DatabaseUnavailableError):
+        async with db.acquire():
+            pass
+    assert db.stats()["available"] is False
+
+
+@pytest.mark.asyncio
+async def test_queries_run_on_an_acquired_connection_and_are_timed() -> None:
+    """Every query method gets a connection, runs and records its duration."""
+    db = Database()
+    db.pool = make_pool()
+    conn = AsyncMock()
+    conn.fetch.return_value = [{"school_id": "hbs"}]
+    db.pool.acquire.return_value = conn
+
+    assert await db.fetch_school_index_rows() == [{"school_id": "hbs"}]
+    await db.insert_interview_session("s1", "u1", "hbs", {})
+    await db.complete_interview_session("s1", 3, 120)
+    await db.upsert_interview_evaluation("s1", "u1", {"score": 4})
+    await db.write_conversation_turns([])
+
+    assert conn.execute.await_count == 3
+    conn.copy_records_to_table.assert_awaited_once()
+    assert db.pool.release.await_count == 5
+    for query in (
+        "school_index",
+        "insert_session",
+        "complete_session",
+        "upsert_evaluation",
+        "write_turns",
+    ):
+        count = REGISTRY.get_sample_value("db_query_seconds_count", {"query": query})
+        assert count is not None and count >= 1
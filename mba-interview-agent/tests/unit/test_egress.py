@@ -0,0 +1,102 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+
+import pytest
+
+from app.utils.egress import EgressOverflowError, EgressQueue
+from app.utils.relay_codec import encode_audio_frame
+
+
+async def discard(payload: bytes | str) -> None:
+    """Client send stub."""
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_producer() -> None:
+    """put() returns immediately even while the client send is stuck."""
+    release = asyncio.Event()
+    sent: list[bytes | str] = []
+
+    async def slow_send(payload: bytes | str) -> None:
+        await release.wait()
+        sent.append(payload)
+
+    egress = EgressQueue(slow_send)
+    writer = asyncio.create_task(egress.run())
+    for index in range(10):
+        egress.put(f"message {index}")
+    await asyncio.sleep(0)
+    assert egress.depth >= 9
+
+    release.set()
+    egress.close()
+    await writer
+    assert sent == [f"message {index}" for index in range(10)]
+    assert egress.stats()["sent_messages"] == 10
+
+
+def test_overflow_coalesces_audio_before_dropping() -> None:
+    """Adjacent audio frames are merged when the message limit is hit."""
+    egress = EgressQueue(discard, max_messages=3)
+    for _ in range(4):
+        egress.put(encode_audio_frame(b"\x00\x00" * 10, 24000), carries_audio=True)
+
+    assert egress.depth == 1
+    assert egress.dropped_audio == 0
+    assert egress.coalesced == 3
+
+
+def test_overflow_drops_oldest_audio_but_keeps_control_messages() -> None:
+    """Past the byte limit audio is dropped and JSON messages survive."""
+    frame = encode_audio_frame(b"\x00" * 100, 24000)
+    egress = EgressQueue(discard, max_bytes=len(frame) + 50)
+    egress.put('{"toolCall": {}}')
+    egress.put(frame, carries_audio=True)
+    egress.put('{"serverContent": {}}')
+    egress.put(frame, carries_audio=True)
+
+    assert egress.dropped_audio == 1
+    assert egress.depth == 3
+    assert egress.stats()["queued_bytes"] <= len(frame) + 50
+
+
+def test_overflow_warnings_are_rate_limited(caplog: pytest.LogCaptureFixture) -> None:
+    """A client that stays behind is logged once and then every 100th overflow."""
+    frame = encode_audio_frame(b"\x00" * 100, 24000)
+    egress = EgressQueue(discard, max_bytes=len(frame) + 50)
+    egress.put('{"toolCall": {}}')
+    with caplog.at_level(logging.WARNING):
+        for _ in range(250):
+            egress.put(frame, carries_audio=True)
+
+    overflows = egress.stats()["overflows"]
+    assert overflows > 100
+    assert len(caplog.records) == 1 + overflows // 100
+
+
+def test_interruption_and_disconnect_policy() -> None:
+    """Queued audio is purged on interruption; disconnect policy raises."""
+    egress = EgressQueue(discard)
+    egress.put(encode_audio_frame(b"\x00\x00", 24000), carries_audio=True)
+    egress.put('{"serverContent": {"interrupted": true}}')
+    egress.drop_audio()
+    assert egress.depth == 1
+
+    strict = EgressQueue(discard, max_messages=1, overflow_policy="disconnect")
+    strict.put("first")
+    with pytest.raises(EgressOverflowError):
+        strict.put("second")
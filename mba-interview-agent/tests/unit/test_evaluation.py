@@ -0,0 +1,55 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from app.utils.evaluation import EvaluationAccumulator
+
+
+def test_notes_accumulate_per_dimension() -> None:
+    """Tagged and inferred notes update scores, counts and turn evidence."""
+    evaluation = EvaluationAccumulator()
+    evaluation.add_note(
+        "Led a team of 12 through a reorg", turn=2, dimension="leadership", rating=5
+    )
+    evaluation.add_note(
+        "Rallied peers without formal authority",
+        turn=4,
+        dimension="leadership",
+        rating=4,
+    )
+    evaluation.add_note("Answers were clear and concise", turn=4, rating=3)
+    evaluation.add_note("Mentioned a hobby", turn=6)
+
+    data = evaluation.evaluation_data(total_turns=6, duration_seconds=600)
+
+    leadership = data["rubric"]["leadership"]
+    assert leadership["score"] == 90
+    assert leadership["note_count"] == 2
+    assert leadership["evidence"] == [{"note": 0, "turn": 2}, {"note": 1, "turn": 4}]
+    assert data["rubric"]["communication"]["score"] == 60
+    assert data["communication_score"] == 60
+    assert data["unclassified_note_count"] == 1
+    assert data["note_count"] == 4
+    # Only rated dimensions contribute, each at equal weight
+    assert data["overall_score"] == 75
+    assert "Strong leadership potential" in data["strengths"]
+    assert "Show more evidence of cultural fit" in data["areas_for_improvement"]
+
+
+def test_empty_evaluation_has_no_scores() -> None:
+    """An interview without notes yields an evaluation with no scores."""
+    data = EvaluationAccumulator().evaluation_data()
+
+    assert data["overall_score"] is None
+    assert data["note_count"] == 0
+    assert len(data["detailed_feedback"]) == 4
@@ -0,0 +1,39 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from app.utils.import_report import by_package, measure, total_seconds
+
+# Generous enough for slow CI machines; cold imports used to take seconds
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "2.0"))
+
+# Only needed once a client is created, never at import
+DEFERRED_MODULES = ("vertexai", "google.cloud.logging", "google.cloud.aiplatform")
+
+
+def test_server_import_stays_within_budget() -> None:
+    """Importing the server is fast and needs no cloud credentials."""
+    # No credentials are available to a bare subprocess
+    timings = measure(
+        "app.server", env={"GOOGLE_APPLICATION_CREDENTIALS": "/nonexistent"}
+    )
+
+    imported = {t.module for t in timings}
+    assert not [m for m in imported if m.startswith(DEFERRED_MODULES)]
+    seconds = total_seconds(timings)
+    assert seconds < IMPORT_TIME_BUDGET_SECONDS, (
+        f"app.server took {seconds:.2f}s to import; slowest packages: "
+        f"{list(by_package(timings).items())[:5]}"
+    )
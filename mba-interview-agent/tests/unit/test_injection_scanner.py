@@ -0,0 +1,52 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from app.utils.injection_scanner import InjectionScanner, compile_patterns
+
+PATTERNS = [r"ignore\s+previous\s+instructions", r"pretend\s+to\s+be"]
+
+
+def test_match_spanning_chunks_is_reported_once() -> None:
+    """A phrase split across chunks is found, with stream offsets, exactly once."""
+    scanner = InjectionScanner(compile_patterns(PATTERNS), PATTERNS)
+    chunks = [
+        "Well, I think you should ig",
+        "nore previous",
+        " instructions and",
+        " then more words",
+    ]
+
+    hits = [hit for chunk in chunks for hit in scanner.feed(chunk)]
+
+    assert len(hits) == 1
+    transcript = "".join(chunks)
+    assert hits[0].pattern == PATTERNS[0]
+    assert transcript[hits[0].start : hits[0].end] == hits[0].text
+    assert hits[0].text.lower() == "ignore previous instructions"
+
+
+def test_scanner_keeps_only_overlap_window() -> None:
+    """Earlier text is not retained or rescanned beyond the overlap."""
+    scanner = InjectionScanner(compile_patterns(PATTERNS), PATTERNS, overlap=32)
+    assert [h.pattern for h in scanner.feed("Pretend to be my friend. ")] == [
+        PATTERNS[1]
+    ]
+
+    for _ in range(100):
+        assert scanner.feed("just a normal answer about leadership. ") == []
+    assert len(scanner._tail) == 32
+
+    hits = scanner.feed("PRETEND   TO BE someone")
+    assert [h.pattern for h in hits] == [PATTERNS[1]]
+    assert scanner.hits == 2
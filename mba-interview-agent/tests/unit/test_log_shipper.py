@@ -0,0 +1,72 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from app.utils.log_shipper import CloudLoggingBackend, JsonLinesBackend, LogShipper
+
+
+def test_records_are_batched_and_flushed_on_stop(tmp_path: Path) -> None:
+    """Everything logged before stop() reaches the backend, in order and in batches."""
+    path = tmp_path / "logs.jsonl"
+    backend = JsonLinesBackend(str(path))
+    batches: list[int] = []
+
+    def write(records: list) -> None:
+        batches.append(len(records))
+        backend(records)
+
+    shipper = LogShipper(write, max_batch=10, flush_interval=60)
+    shipper.start()
+    for i in range(25):
+        shipper.log_struct({"type": "feedback", "n": i}, severity="WARNING")
+    shipper.stop()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["n"] for line in lines] == list(range(25))
+    assert lines[0]["severity"] == "WARNING"
+    assert batches[:2] == [10, 10] and sum(batches) == 25
+    assert shipper.stats()["shipped"] == 25
+
+
+def test_full_queue_drops_without_blocking() -> None:
+    """A stalled backend fills the queue, after which records are counted and dropped."""
+    release = threading.Event()
+
+    def stalled(records: list) -> None:
+        release.wait()
+
+    shipper = LogShipper(stalled, max_queue=5, max_batch=1, flush_interval=0)
+    shipper.start()
+    for i in range(20):
+        shipper.log_struct({"n": i})
+    assert shipper.dropped > 0
+    assert shipper.enqueued + shipper.dropped == 20
+
+    release.set()
+    shipper.stop()
+    assert shipper.stats()["queued"] == 0
+
+
+def test_cloud_backend_warmup_creates_the_client_once() -> None:
+    """Warming up builds the client that later batches reuse."""
+    backend = CloudLoggingBackend("test-log")
+    with patch("google.cloud.logging.Client") as client:
+        backend.warmup()
+        backend.warmup()
+    client.assert_called_once_with()
+    assert backend.logger is client.return_value.logger.return_value
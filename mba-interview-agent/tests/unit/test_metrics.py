@@ -0,0 +1,90 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections.abc import Generator
+from types import ModuleType
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from google.auth.credentials import Credentials
+from prometheus_client.parser import text_string_to_metric_families
+
+from tests.fake_live import FakeLiveServer
+
+SETUP = {
+    "setup": {
+        "run_id": "run-1",
+        "user_id": "metrics-user",
+        "context": {"school_id": "school-1"},
+    }
+}
+
+
+@pytest.fixture
+def server() -> Generator[ModuleType, None, None]:
+    """Import app.server with Google Cloud clients mocked out."""
+    with (
+        patch(
+            "google.auth.default",
+            return_value=(MagicMock(spec=Credentials), "mock-project-id"),
+        ),
+        patch("vertexai.init"),
+        patch("google.cloud.logging.Client"),
+    ):
+        from app import server
+
+        yield server
+
+
+def scrape(client: TestClient) -> dict[str, float]:
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    samples = {}
+    for family in text_string_to_metric_families(response.text):
+        for sample in family.samples:
+            labels = ",".join(f"{k}={v}" for k, v in sorted(sample.labels.items()))
+            samples[f"{sample.name}{{{labels}}}"] = sample.value
+    return samples
+
+
+def test_live_session_is_instrumented(server: ModuleType) -> None:
+    """A relayed greeting shows up in the setup, latency and traffic metrics."""
+    with (
+        FakeLiveServer(latency=0.02) as fake,
+        patch.object(server, "get_genai_client", return_value=fake.client()),
+        TestClient(server.app) as client,
+    ):
+        before = scrape(client)
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json(SETUP)
+            ws.receive_json()
+            while b"turn_complete" not in ws.receive().get("bytes", b""):
+                pass
+            during = scrape(client)
+
+        def delta(name: str) -> float:
+            return during.get(name, 0.0) - before.get(name, 0.0)
+
+        assert during["live_sessions_active{}"] >= 1
+        assert delta("live_setup_phase_seconds_count{phase=gemini_connected}") == 1
+        assert delta("live_time_to_first_response_seconds_count{}") == 1
+        assert delta("live_time_to_first_response_seconds_sum{}") >= 0.02
+        # Two audio chunks and the closing text
+        assert delta("live_relay_messages_total{direction=downstream}") == 3
+        assert (
+            delta("live_relay_bytes_total{direction=downstream}")
+            > 2 * 24000 * 40 // 1000 * 2
+        )
+        assert "egress_queued_messages{}" in during
@@ -0,0 +1,98 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from google.genai import types
+
+from app.utils.relay_codec import (
+    AUDIO_FRAME_TYPE,
+    AUDIO_FRAME_VERSION,
+    AUDIO_HEADER,
+    split_server_message,
+)
+
+
+def audio_part(pcm: bytes, rate: int = 24000) -> types.Part:
+    """Build a model turn part carrying PCM audio."""
+    return types.Part(
+        inline_data=types.Blob(data=pcm, mime_type=f"audio/pcm;rate={rate}")
+    )
+
+
+def test_audio_only_message_sends_no_json() -> None:
+    """A pure audio chunk becomes one binary frame with its header."""
+    message = types.LiveServerMessage(
+        server_content=types.LiveServerContent(
+            model_turn=types.Content(role="model", parts=[audio_part(b"\x01\x02" * 4)])
+        )
+    )
+
+    frames, payload = split_server_message(message)
+
+    assert payload is None
+    assert len(frames) == 1
+    kind, version, channels, rate = AUDIO_HEADER.unpack_from(frames[0])
+    assert (kind, version, channels, rate) == (
+        AUDIO_FRAME_TYPE,
+        AUDIO_FRAME_VERSION,
+        1,
+        24000,
+    )
+    assert frames[0][AUDIO_HEADER.size :] == b"\x01\x02" * 4
+
+
+def test_non_audio_content_is_kept_as_json() -> None:
+    """Text parts and turn_complete survive; audio is stripped from the JSON."""
+    message = types.LiveServerMessage(
+        server_content=types.LiveServerContent(
+            model_turn=types.Content(
+                role="model",
+                parts=[audio_part(b"\x00\x00", rate=16000), types.Part(text="Welcome")],
+            ),
+            turn_complete=True,
+        )
+    )
+
+    frames, payload = split_server_message(message)
+
+    assert AUDIO_HEADER.unpack_from(frames[0])[3] == 16000
+    assert payload is not None
+    assert json.loads(payload) == {
+        "serverContent": {
+            "modelTurn": {"role": "model", "parts": [{"text": "Welcome"}]},
+            "turnComplete": True,
+        }
+    }
+
+
+def test_tool_call_passes_through_unchanged() -> None:
+    """Messages without audio are serialized whole in camelCase."""
+    message = types.LiveServerMessage(
+        tool_call=types.LiveServerToolCall(
+            function_calls=[
+                types.FunctionCall(
+                    id="1", name="get_school_info", args={"school_name": "HBS"}
+                )
+            ]
+        )
+    )
+
+    frames, payload = split_server_message(message)
+
+    assert frames == []
+    assert payload is not None
+    assert (
+        json.loads(payload)["toolCall"]["functionCalls"][0]["name"] == "get_school_info"
+    )
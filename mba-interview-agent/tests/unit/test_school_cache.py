@@ -0,0 +1,100 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from app.utils.school_cache import SCHOOL_DATA_CHANNEL, SchoolDataCache
+
+
+class CountingLoader:
+    """Loader stub that records how often each school was fetched."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls: dict[str, int] = {}
+        self.delay = delay
+
+    async def __call__(self, school_id: str) -> tuple[dict, list]:
+        self.calls[school_id] = self.calls.get(school_id, 0) + 1
+        await asyncio.sleep(self.delay)
+        return {"school_id": school_id}, [{"question_text": "Why an MBA?"}]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load() -> None:
+    """A burst of connections for one school triggers a single fetch."""
+    loader = CountingLoader(delay=0.01)
+    cache = SchoolDataCache(loader)
+
+    results = await asyncio.gather(*(cache.get("hbs") for _ in range(20)))
+
+    assert loader.calls == {"hbs": 1}
+    assert all(result == results[0] for result in results)
+    await cache.get("hbs")
+    assert loader.calls == {"hbs": 1}
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_notification_invalidation() -> None:
+    """Old schools are evicted and notifications force a reload."""
+    loader = CountingLoader()
+    cache = SchoolDataCache(loader, max_entries=2)
+
+    await cache.get("a")
+    await cache.get("b")
+    await cache.get("a")
+    await cache.get("c")  # evicts "b", the least recently used
+    assert len(cache) == 2
+    await cache.get("b")
+    assert loader.calls["b"] == 2
+
+    cache.handle_notification(None, 0, SCHOOL_DATA_CHANNEL, "b")
+    await cache.get("b")
+    assert loader.calls["b"] == 3
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_cached() -> None:
+    """A load that races with an invalidation must not repopulate stale data."""
+    loader = CountingLoader(delay=0.01)
+    cache = SchoolDataCache(loader)
+
+    pending = asyncio.create_task(cache.get("a"))
+    await asyncio.sleep(0)
+    cache.invalidate("a")
+    await pending
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_load() -> None:
+    """Callers waiting on a load started by a cancelled caller still get the data."""
+    loader = CountingLoader(delay=0.01)
+    cache = SchoolDataCache(loader)
+
+    leader = asyncio.create_task(cache.get("hbs"))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(cache.get("hbs")) for _ in range(2)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    results = await asyncio.gather(*followers)
+    assert all(result[0] == {"school_id": "hbs"} for result in results)
+    assert loader.calls == {"hbs": 1}
+    assert len(cache) == 1
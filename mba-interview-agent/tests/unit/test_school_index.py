@@ -0,0 +1,107 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+
+from app.utils.school_index import SchoolIndex
+
+SEED = {
+    "harvard business school": {"focus": "leadership"},
+    "stanford graduate school of business": {"focus": "innovation"},
+    "wharton school": {"focus": "analytics"},
+}
+
+ROWS: list[dict] = [
+    {
+        "name": "University of Pennsylvania, Wharton School",
+        "location": "Philadelphia",
+        "school_context": "Wharton emphasizes analytical rigor.",
+        "question_categories": ["leadership", "analytical"],
+    },
+    {
+        "name": "Northwestern University, Kellogg School of Management",
+        "location": "Evanston",
+        "school_context": "Kellogg is known for its collaborative culture.",
+    },
+]
+
+
+def found(index: SchoolIndex, query: str) -> dict:
+    """Look up a school that must exist."""
+    school = index.lookup(query)
+    assert school is not None
+    return school
+
+
+@pytest.mark.parametrize(
+    "query,focus",
+    [
+        ("Harvard Business School", "leadership"),
+        ("HBS", "leadership"),
+        ("Stanford GSB", "innovation"),
+        ("The Wharton School", "analytics"),
+        ("wharton school of the university of pennsylvania", "analytics"),
+        ("Warton", "analytics"),
+        ("Harvard interview style", "leadership"),
+    ],
+)
+def test_lookup_resolves_variants(query: str, focus: str) -> None:
+    """Aliases, extra words and misspellings resolve to the same school."""
+    index = SchoolIndex(seed=SEED)
+    index.rebuild(ROWS)
+
+    assert found(index, query)["focus"] == focus
+
+
+def test_other_schools_of_a_known_university_do_not_match_it() -> None:
+    """Extra words that name another school reject the containment match."""
+    index = SchoolIndex(seed=SEED)
+    index.rebuild(ROWS)
+
+    assert index.lookup("Harvard Kennedy School") is None
+    assert index.lookup("Stanford Law School") is None
+
+
+def test_rows_merge_with_seed_and_add_schools() -> None:
+    """Database rows enrich seeded schools and add new ones."""
+    index = SchoolIndex(seed=SEED)
+    index.rebuild(ROWS)
+
+    wharton = found(index, "Wharton")
+    assert wharton["location"] == "Philadelphia"
+    assert wharton["question_focus"] == "leadership, analytical"
+    assert found(index, "kellogg")["location"] == "Evanston"
+    assert found(index, "Northwestern")["location"] == "Evanston"
+    assert index.lookup("Acme Institute of Cooking") is None
+    assert len(index) == 4
+
+
+def test_lookup_is_sub_millisecond() -> None:
+    """Uncached fuzzy lookups stay well under a millisecond per call."""
+    rows: list[dict] = [
+        {"name": f"University {i}, School Number{i} Business School"}
+        for i in range(200)
+    ]
+    index = SchoolIndex(seed=SEED)
+    index.rebuild(ROWS + rows)
+
+    queries = [f"schol numbr{i}" for i in range(200)]
+    started = time.perf_counter()
+    for query in queries:
+        index.lookup(query)
+    per_lookup = (time.perf_counter() - started) / len(queries)
+
+    assert per_lookup < 0.001
@@ -14,130 +14,167 @@
 
 import json
 import logging
-import os
 from collections.abc import Generator
+from types import ModuleType
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 from google.auth.credentials import Credentials
+from starlette.websockets import WebSocketDisconnect
+
+from app.utils.admission import AdmissionController, RateLimiter
+from tests.fake_live import FakeLiveServer
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@pytest.fixture(autouse=True)
-def mock_google_cloud_credentials() -> Generator[None, None, None]:
-    """Mock Google Cloud credentials for testing."""
-    with patch.dict(
-        os.environ,
-        {
-            "GOOGLE_APPLICATION_CREDENTIALS": "/path/to/mock/credentials.json",
-            "GOOGLE_CLOUD_PROJECT_ID": "mock-project-id",
-        },
+@pytest.fixture
+def server() -> Generator[ModuleType, None, None]:
+    """Import app.server with Google Cloud clients mocked out."""
+    with (
+        patch(
+            "google.auth.default",
+            return_value=(MagicMock(spec=Credentials), "mock-project-id"),
+        ),
+        patch("vertexai.init"),
+        patch("google.cloud.logging.Client"),
     ):
-        yield
-
+        from app import server
 
-@pytest.fixture(autouse=True)
-def mock_google_auth_default() -> Generator[None, None, None]:
-    """Mock the google.auth.default function for testing."""
-    mock_credentials = MagicMock(spec=Credentials)
-    mock_project = "mock-project-id"
+        yield server
 
-    with patch("google.auth.default", return_value=(mock_credentials, mock_project)):
-        yield
 
-
-@pytest.fixture(autouse=True)
-def mock_dependencies() -> Generator[None, None, None]:
+def test_websocket_endpoint(server: ModuleType) -> None:
     """
-    Mock Vertex AI dependencies for testing.
-    Patches genai client and tool functions.
+    Test the websocket endpoint to ensure it correctly handles
+    websocket connections and messages.
     """
     with (
-        patch("app.server.genai_client") as mock_genai,
-        patch("app.server.tool_functions") as mock_tools,
+        FakeLiveServer() as fake,
+        patch.object(server, "get_genai_client", return_value=fake.client()),
+        TestClient(server.app) as client,
+        client.websocket_connect("/ws") as websocket,
     ):
-        mock_genai.aio.live.connect = AsyncMock()
-        mock_tools.return_value = {}
-        yield
+        websocket.send_json({"setup": {"run_id": "test-run", "user_id": "test-user"}})
 
+        # Test initial connection message
+        data = websocket.receive_json()
+        assert data["type"] == "status"
+        assert data["resume_token"]
 
-@pytest.mark.asyncio
-async def test_websocket_endpoint() -> None:
-    """
-    Test the websocket endpoint to ensure it correctly handles
-    websocket connections and messages.
-    """
-    from app.server import app
-
-    mock_session = AsyncMock()
-    mock_session._ws = AsyncMock()
-    # Configure mock to return proper response format and close after one message
-    mock_session._ws.recv.side_effect = [
-        json.dumps(
-            {
-                "serverContent": {
-                    "modelTurn": {
-                        "role": "model",
-                        "parts": [{"text": "Hello, how can I help you?"}],
-                    }
-                }
-            }
-        ).encode(),  # Encode as bytes since recv(decode=False) is used
-        None,  # Add None to trigger StopAsyncIteration after first message
-    ]
-
-    with patch("app.server.genai_client") as mock_genai:
-        mock_genai.aio.live.connect.return_value.__aenter__.return_value = mock_session
-        client = TestClient(app)
-        with client.websocket_connect("/ws") as websocket:
-            # Test initial connection message
-            data = websocket.receive_json()
-            assert data["status"] == "Backend is ready for conversation"
-
-            # Test sending a message
-            websocket.send_json(
-                {"setup": {"run_id": "test-run", "user_id": "test-user"}}
-            )
+        # Test sending audio stream
+        dummy_audio = bytes([0] * 1024)  # 1KB of silence
+        websocket.send_bytes(dummy_audio)
 
-            # Test sending audio stream
-            dummy_audio = bytes([0] * 1024)  # 1KB of silence
-            websocket.send_json(
+        # Test sending a message
+        websocket.send_text(
+            json.dumps(
                 {
-                    "realtimeInput": {
-                        "mediaChunks": [
-                            {
-                                "mimeType": "audio/pcm;rate=16000",
-                                "data": dummy_audio.hex(),
-                            }
-                        ]
+                    "clientContent": {
+                        "turns": [{"role": "user", "parts": [{"text": "Hello"}]}],
+                        "turnComplete": True,
                     }
                 }
             )
+        )
 
-            # Receive response as bytes
-            response = websocket.receive_bytes()
-            response_data = json.loads(response.decode())
-            assert "serverContent" in response_data
+        # Receive response as bytes
+        response = websocket.receive_bytes()
+        response_data = json.loads(response.decode())
+        assert "server_content" in response_data
 
-            # Verify mock interactions
-            mock_genai.aio.live.connect.assert_called_once()
-            assert mock_session._ws.recv.called
+    assert fake.connections == 1
+    assert any(
+        "realtimeInput" in message or "realtime_input" in message
+        for message in fake.received
+    )
 
 
-@pytest.mark.asyncio
-async def test_websocket_error_handling() -> None:
+def test_websocket_error_handling(server: ModuleType) -> None:
     """Test websocket error handling."""
-    from app.server import app
+    mock_genai = MagicMock()
+    mock_genai.aio.live.connect.side_effect = Exception("Connection failed")
+
+    with (
+        patch.object(server, "get_genai_client", return_value=mock_genai),
+        TestClient(server.app) as client,
+        client.websocket_connect("/ws") as websocket,
+    ):
+        websocket.send_json({"setup": {"run_id": "test-run", "user_id": "test-user"}})
+        with pytest.raises(WebSocketDisconnect) as exc:
+            websocket.receive_json()
+        assert exc.value.code == 1011
+
+
+def test_turns_of_temporary_sessions_are_not_queued(server: ModuleType) -> None:
+    """Sessions without a database row never reach the turn writer."""
+    before = server.turn_writer.pending
+    try:
+        server.save_conversation_turn("temp_session_1", 1, "agent", "Hello")
+        assert server.turn_writer.pending == before
+        server.save_conversation_turn("session-1", 1, "agent", "Hello")
+        assert server.turn_writer.pending == before + 1
+    finally:
+        server.turn_writer._pending.clear()
+
+
+def test_client_ip_ignores_client_supplied_forwarding_hops(server: ModuleType) -> None:
+    """Only the hops appended by trusted proxies identify the caller."""
+    client = MagicMock(host="10.0.0.1")
+    headers = {"x-forwarded-for": "1.2.3.4, 203.0.113.7"}
+    assert server.client_ip(headers, client, trusted_hops=1) == "203.0.113.7"
+    assert server.client_ip(headers, client, trusted_hops=2) == "1.2.3.4"
+    assert server.client_ip(headers, client, trusted_hops=3) == "10.0.0.1"
+    assert server.client_ip(headers, client, trusted_hops=0) == "10.0.0.1"
+    assert server.client_ip({}, None) == "unknown"
+
+
+def test_anonymous_clients_do_not_share_a_user_budget(server: ModuleType) -> None:
+    """Clients without a user id are limited per address, not as one user."""
+    failing = MagicMock()
+    failing.aio.live.connect.side_effect = Exception("Connection failed")
 
-    with patch("app.server.genai_client") as mock_genai:
-        mock_genai.aio.live.connect.side_effect = Exception("Connection failed")
+    with (
+        patch.object(server, "ws_user_limiter", RateLimiter(per_minute=1)),
+        patch.object(server, "get_genai_client", return_value=failing),
+        TestClient(server.app) as client,
+    ):
+        for address in ("203.0.113.1", "203.0.113.2"):
+            with client.websocket_connect(
+                "/ws", headers={"x-forwarded-for": address}
+            ) as websocket:
+                websocket.send_json({"setup": {"run_id": "test-run"}})
+                with pytest.raises(WebSocketDisconnect) as exc:
+                    websocket.receive_json()
+                # Got past the rate limit and failed to reach Gemini instead
+                assert exc.value.code == 1011
+
+
+def test_rejected_clients_do_no_database_work(server: ModuleType) -> None:
+    """Admission comes before the persona lookup and the session row."""
+    persona = AsyncMock(return_value=({}, []))
+    create_session = AsyncMock(return_value="session-1")
+    setup = {
+        "setup": {"user_id": "test-user", "context": {"school_id": "hbs"}},
+    }
 
-        client = TestClient(app)
-        with pytest.raises(Exception) as exc:
-            with client.websocket_connect("/ws"):
-                pass
-        assert str(exc.value) == "Connection failed"
+    with (
+        patch.object(
+            server, "admission", AdmissionController(max_waiting=0, max_sessions=0)
+        ),
+        patch.object(server, "get_school_persona_and_questions", persona),
+        patch.object(server, "create_interview_session", create_session),
+        TestClient(server.app) as client,
+        client.websocket_connect("/ws") as websocket,
+    ):
+        websocket.send_json(setup)
+        assert "retry_after" in websocket.receive_json()
+        with pytest.raises(WebSocketDisconnect) as exc:
+            websocket.receive_json()
+        assert exc.value.code == 1013
+
+    persona.assert_not_awaited()
+    create_session.assert_not_awaited()
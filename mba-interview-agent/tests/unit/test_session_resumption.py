@@ -0,0 +1,134 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from collections.abc import Callable, Generator
+from types import ModuleType
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from google.auth.credentials import Credentials
+from starlette.testclient import WebSocketTestSession
+
+from tests.fake_live import FakeLiveServer
+
+SETUP = {
+    "setup": {
+        "run_id": "run-1",
+        "user_id": "user-1",
+        "context": {"school_id": "school-1"},
+    }
+}
+
+
+@pytest.fixture
+def server() -> Generator[ModuleType, None, None]:
+    """Import app.server with Google Cloud clients mocked out."""
+    with (
+        patch(
+            "google.auth.default",
+            return_value=(MagicMock(spec=Credentials), "mock-project-id"),
+        ),
+        patch("vertexai.init"),
+        patch("google.cloud.logging.Client"),
+    ):
+        from app import server
+
+        yield server
+
+
+@pytest.fixture
+def fake_live(server: ModuleType) -> Generator[FakeLiveServer, None, None]:
+    """Point the server's Gemini client at a local fake Live endpoint."""
+    with (
+        FakeLiveServer() as fake,
+        patch.object(server, "get_genai_client", return_value=fake.client()),
+    ):
+        yield fake
+
+
+def receive_until_turn_complete(ws: WebSocketTestSession) -> None:
+    # Without binary audio every Gemini message arrives as a JSON bytes frame
+    while b"turn_complete" not in ws.receive().get("bytes", b""):
+        pass
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_reconnect_resumes_gemini_session(
+    server: ModuleType, fake_live: FakeLiveServer
+) -> None:
+    """A reconnect with the resume token reuses the Gemini session and turn count."""
+    with TestClient(server.app) as client:
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json(SETUP)
+            status = ws.receive_json()
+            token = status["resume_token"]
+            receive_until_turn_complete(ws)  # greeting
+
+        wait_for(lambda: len(server.parked_sessions) == 1)
+
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"setup": {**SETUP["setup"], "resume_token": token}})
+            status = ws.receive_json()
+            assert status["resumed"] is True
+            assert status["turn"] == 1
+
+            ws.send_text(
+                '{"clientContent": {"turns": [{"role": "user", "parts": [{"text": "Hi"}]}], "turnComplete": true}}'
+            )
+            receive_until_turn_complete(ws)
+
+        wait_for(lambda: len(server.parked_sessions) == 1)
+
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"setup": {**SETUP["setup"], "resume_token": token}})
+            assert ws.receive_json()["turn"] == 2
+
+        assert fake_live.connections == 1
+
+
+def test_resume_token_is_bound_to_its_user(
+    server: ModuleType, fake_live: FakeLiveServer
+) -> None:
+    """Another user's token starts a fresh session instead of resuming."""
+    with TestClient(server.app) as client:
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json(SETUP)
+            token = ws.receive_json()["resume_token"]
+            receive_until_turn_complete(ws)
+
+        wait_for(lambda: len(server.parked_sessions) == 1)
+
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json(
+                {
+                    "setup": {
+                        **SETUP["setup"],
+                        "user_id": "user-2",
+                        "resume_token": token,
+                    }
+                }
+            )
+            status = ws.receive_json()
+            assert "resumed" not in status
+            assert status["resume_token"] != token
+
+        assert fake_live.connections == 2
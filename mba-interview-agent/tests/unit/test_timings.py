@@ -0,0 +1,29 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from app.utils.timings import PhaseTimer
+
+
+def test_phase_marks_are_ordered_and_recorded_once() -> None:
+    """Each phase keeps its first offset; later phases are never earlier."""
+    timer = PhaseTimer()
+    accepted = timer.mark("accepted")
+    time.sleep(0.002)
+    connected = timer.mark("gemini_connected")
+    assert timer.mark("accepted") == accepted
+
+    assert connected > accepted
+    assert list(timer.as_dict()) == ["accepted", "gemini_connected"]
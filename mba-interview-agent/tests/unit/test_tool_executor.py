@@ -0,0 +1,74 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+import pytest
+
+from app.utils.tool_executor import UNKNOWN_TOOL, ToolExecutor
+
+
+@pytest.mark.asyncio
+async def test_calls_run_concurrently() -> None:
+    """Independent sync and async tools overlap instead of running in turn."""
+    executor = ToolExecutor(max_workers=4)
+
+    def slow_sync(value: str) -> dict:
+        time.sleep(0.2)
+        return {"value": value}
+
+    async def slow_async(value: str) -> dict:
+        await asyncio.sleep(0.2)
+        return {"value": value}
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        executor.run("a", slow_sync, {"value": "a"}),
+        executor.run("b", slow_sync, {"value": "b"}),
+        executor.run("c", slow_async, {"value": "c"}),
+    )
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+
+    assert results == [{"value": "a"}, {"value": "b"}, {"value": "c"}]
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_errors_become_error_responses() -> None:
+    """Slow, failing and unknown tools return error payloads and are counted."""
+    executor = ToolExecutor(default_timeout=5.0, timeouts={"slow": 0.05})
+
+    async def slow() -> dict:
+        await asyncio.sleep(1)
+        return {}
+
+    def broken() -> dict:
+        raise ValueError("bad input")
+
+    slow_result = await executor.run("slow", slow, {})
+    broken_result = await executor.run("broken", broken, {})
+    missing_result = await executor.run("missing", None, {})
+    await executor.run("also_missing", None, {})
+    executor.shutdown()
+
+    assert "timed out" in slow_result["error"]
+    assert "bad input" in broken_result["error"]
+    assert "Unknown tool" in missing_result["error"]
+    stats = executor.stats()
+    assert stats["slow"]["timeouts"] == 1
+    assert stats["broken"]["errors"] == 1
+    assert stats[UNKNOWN_TOOL] == {**stats[UNKNOWN_TOOL], "calls": 2, "errors": 2}
+    assert "missing" not in stats
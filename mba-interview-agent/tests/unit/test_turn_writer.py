@@ -0,0 +1,71 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from app.utils.turn_writer import TurnRecord, TurnWriter
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_size_reached() -> None:
+    """A full batch is written by the background task without waiting for the timer."""
+    batches: list[list[TurnRecord]] = []
+
+    async def write_rows(records: list[TurnRecord]) -> None:
+        batches.append(records)
+
+    writer = TurnWriter(write_rows, max_batch_size=3, flush_interval=60)
+    writer.start()
+    for turn in range(1, 4):
+        assert writer.enqueue("session-a", turn, "agent", f"turn {turn}")
+    await asyncio.sleep(0.01)
+    await writer.stop()
+
+    assert len(batches) == 1
+    assert [record[1] for record in batches[0]] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_flush_session_only_writes_that_session() -> None:
+    """Cleanup of one session leaves other sessions' turns buffered."""
+    batches: list[list[TurnRecord]] = []
+
+    async def write_rows(records: list[TurnRecord]) -> None:
+        batches.append(records)
+
+    writer = TurnWriter(write_rows, max_batch_size=100, flush_interval=60)
+    writer.enqueue("session-a", 1, "agent", "hello")
+    writer.enqueue("session-b", 1, "agent", "hi")
+    writer.enqueue("session-a", 2, "agent", "again")
+
+    await writer.flush_session("session-a")
+
+    assert [(r[0], r[1]) for r in batches[0]] == [("session-a", 1), ("session-a", 2)]
+    assert writer.pending == 1
+
+
+@pytest.mark.asyncio
+async def test_drops_turns_when_buffer_full() -> None:
+    """The buffer is bounded and counts the turns it had to drop."""
+
+    async def write_rows(records: list[TurnRecord]) -> None:
+        pass
+
+    writer = TurnWriter(write_rows, max_batch_size=100, max_pending=2)
+    assert writer.enqueue("s", 1, "agent", "a")
+    assert writer.enqueue("s", 2, "agent", "b")
+    assert not writer.enqueue("s", 3, "agent", "c")
+    assert writer.dropped == 1
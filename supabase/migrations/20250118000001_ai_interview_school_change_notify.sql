@@ -0,0 +1,41 @@
+-- AI Interview school data change notifications
+-- The interview agent caches personas and question banks per school and
+-- listens on this channel to evict a school as soon as an admin edits it.
+
+CREATE OR REPLACE FUNCTION notify_ai_interview_school_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM pg_notify('ai_interview_school_changed', OLD.school_id::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND (TG_OP = 'INSERT' OR NEW.school_id IS DISTINCT FROM OLD.school_id) THEN
+        PERFORM pg_notify('ai_interview_school_changed', NEW.school_id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Statement-level truncation invalidates every school
+CREATE OR REPLACE FUNCTION notify_ai_interview_schools_truncated()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('ai_interview_school_changed', '');
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER notify_ai_interview_personas_changed
+    AFTER INSERT OR UPDATE OR DELETE ON ai_interview_school_personas
+    FOR EACH ROW EXECUTE FUNCTION notify_ai_interview_school_changed();
+
+CREATE TRIGGER notify_ai_interview_questions_changed
+    AFTER INSERT OR UPDATE OR DELETE ON ai_interview_question_banks
+    FOR EACH ROW EXECUTE FUNCTION notify_ai_interview_school_changed();
+
+CREATE TRIGGER notify_ai_interview_personas_truncated
+    AFTER TRUNCATE ON ai_interview_school_personas
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_ai_interview_schools_truncated();
+
+CREATE TRIGGER notify_ai_interview_questions_truncated
+    AFTER TRUNCATE ON ai_interview_question_banks
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_ai_interview_schools_truncated();
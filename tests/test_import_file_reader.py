@@ -0,0 +1,153 @@
+import json
+import openpyxl
+import pandas as pd
+import pytest
+from app.utils import import_file_reader
+from app.utils.import_file_reader import read_import_file
+
+RECORDS = [{'name': f'Scholarship {i}', 'amount': i * 100} for i in range(5)]
+
+def chunk_rows(path, chunk_size=2):
+    return [df.to_dict('records') for df in read_import_file(str(path), chunk_size)]
+
+def chunk_index(path, chunk_size=2):
+    return [df.index.tolist() for df in read_import_file(str(path), chunk_size)]
+
+@pytest.fixture
+def small_json_blocks(monkeypatch):
+    # Make records span several reads
+    monkeypatch.setattr(import_file_reader, 'JSON_READ_SIZE', 7)
+
+def test_csv_is_read_in_chunks(tmp_path):
+    path = tmp_path / 'scholarships.csv'
+    pd.DataFrame(RECORDS).to_csv(path, index=False)
+
+    assert chunk_rows(path) == [RECORDS[:2], RECORDS[2:4], RECORDS[4:]]
+    assert chunk_index(path) == [[0, 1], [2, 3], [4]]
+
+def test_xlsx_is_streamed_in_chunks_skipping_blank_rows(tmp_path):
+    path = tmp_path / 'scholarships.xlsx'
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['name', 'amount', None])
+    for i, record in enumerate(RECORDS):
+        if i == 2:
+            sheet.append([None, None, None])
+        sheet.append([record['name'], record['amount'], 'note' if i == 0 else None])
+    workbook.save(path)
+
+    frames = list(read_import_file(str(path), 2))
+
+    assert frames[0].columns.tolist() == ['name', 'amount', 'column_2']
+    assert [df[['name', 'amount']].to_dict('records') for df in frames] == [RECORDS[:2], RECORDS[2:4], RECORDS[4:]]
+    # Rows keep their place in the sheet, so row numbers stay right
+    assert [df.index.tolist() for df in frames] == [[0, 1], [3, 4], [5]]
+
+def test_xlsx_header_only_gives_one_empty_frame(tmp_path):
+    path = tmp_path / 'scholarships.xlsx'
+    workbook = openpyxl.Workbook()
+    workbook.active.append(['name', 'amount'])
+    workbook.save(path)
+
+    frames = list(read_import_file(str(path), 2))
+
+    assert len(frames) == 1 and frames[0].empty
+    assert frames[0].columns.tolist() == ['name', 'amount']
+
+@pytest.mark.parametrize('document', [
+    RECORDS,
+    {'scholarships': RECORDS},
+    {'note': 'see [appendix] ]', 'version': 12345, 'source': {'ids': [1, 2]}, 'scholarships': RECORDS},
+])
+def test_json_records_are_read_in_chunks(tmp_path, small_json_blocks, document):
+    path = tmp_path / 'scholarships.json'
+    path.write_text(json.dumps(document, indent=2))
+
+    assert chunk_rows(path) == [RECORDS[:2], RECORDS[2:4], RECORDS[4:]]
+
+def test_numbers_split_across_reads_are_read_whole(tmp_path, small_json_blocks):
+    path = tmp_path / 'scholarships.json'
+    path.write_text('{"count":123456789012,"scholarships":[{"amount":123456789012}]}')
+
+    assert chunk_rows(path) == [[{'amount': 123456789012}]]
+
+@pytest.mark.parametrize('text', ['', '[]', '{}', '{"note": "none yet"}'])
+def test_json_without_records_gives_one_empty_frame(tmp_path, text):
+    path = tmp_path / 'scholarships.json'
+    path.write_text(text)
+
+    assert chunk_rows(path) == [[]]
+
+@pytest.mark.parametrize('text', ['"scholarships"', '[{"name": "A"}, {"name": ', '{"scholarships": [{"name": "A"}'])
+def test_malformed_json_raises(tmp_path, text):
+    path = tmp_path / 'scholarships.json'
+    path.write_text(text)
+
+    with pytest.raises(ValueError):
+        list(read_import_file(str(path)))
+
+def test_an_oversized_json_record_stops_the_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(import_file_reader, 'JSON_READ_SIZE', 10)
+    monkeypatch.setattr(import_file_reader, 'JSON_MAX_RECORD_SIZE', 100)
+    path = tmp_path / 'scholarships.json'
+    path.write_text('[{"name": "A"}, {"name": "' + 'x' * 10_000)
+    reads = []
+    real_open = open
+
+    def counting_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        read = f.read
+        f.read = lambda size: reads.append(size) or read(size)
+        return f
+
+    monkeypatch.setattr(import_file_reader, 'open', counting_open, raising=False)
+
+    records = read_import_file(str(path), 1)
+    assert next(records).to_dict('records') == [{'name': 'A'}]
+    with pytest.raises(ValueError, match='longer than 100'):
+        next(records)
+    # Stopped about one cap's worth in, not at the end of the file
+    assert sum(reads) < 200
+
+def test_csv_reader_is_closed_when_reading_stops_early(tmp_path, monkeypatch):
+    path = tmp_path / 'scholarships.csv'
+    pd.DataFrame(RECORDS).to_csv(path, index=False)
+    closed = []
+    read_csv = pd.read_csv
+
+    def tracking_read_csv(*args, **kwargs):
+        reader = read_csv(*args, **kwargs)
+        close = reader.close
+        reader.close = lambda: closed.append(True) or close()
+        return reader
+
+    monkeypatch.setattr(pd, 'read_csv', tracking_read_csv)
+
+    chunks = read_import_file(str(path), 2)
+    next(chunks)
+    chunks.close()
+
+    assert closed
+
+def test_xlsx_workbook_is_closed_when_reading_stops_early(tmp_path, monkeypatch):
+    path = tmp_path / 'scholarships.xlsx'
+    workbook = openpyxl.Workbook()
+    for row in [['name'], ['A'], ['B'], ['C']]:
+        workbook.active.append(row)
+    workbook.save(path)
+    closed = []
+    load_workbook = openpyxl.load_workbook
+
+    def tracking_load_workbook(*args, **kwargs):
+        opened = load_workbook(*args, **kwargs)
+        close = opened.close
+        opened.close = lambda: closed.append(True) or close()
+        return opened
+
+    monkeypatch.setattr(openpyxl, 'load_workbook', tracking_load_workbook)
+
+    chunks = read_import_file(str(path), 1)
+    next(chunks)
+    chunks.close()
+
+    assert closed
@@ -0,0 +1,82 @@
+import threading
+import time
+from app.utils import reference_data_cache as cache_module
+from app.utils.reference_data_cache import REFERENCE_TABLES, ReferenceDataCache
+
+class FakeQuery:
+    def __init__(self, session, model):
+        self.session = session
+        self.model = model
+
+    def all(self):
+        self.session.queries += 1
+        time.sleep(self.session.delay)
+        return [(row_id,) for row_id in self.session.ids.get(self.model, [])]
+
+class FakeSession:
+    """Stands in for the database session, holding the IDs of each reference
+    table and counting the queries made for them"""
+
+    def __init__(self, ids, delay=0.0):
+        self.ids = ids
+        self.delay = delay
+        self.queries = 0
+
+    def query(self, column):
+        return FakeQuery(self, column.class_)
+
+def reference_ids():
+    return {model: [1, 2, 3] for model in REFERENCE_TABLES.values()}
+
+def test_ids_are_loaded_per_foreign_key():
+    session = FakeSession(reference_ids())
+
+    ids = ReferenceDataCache().get_ids(session)
+
+    assert ids == {field: frozenset({1, 2, 3}) for field in REFERENCE_TABLES}
+    assert session.queries == len(REFERENCE_TABLES)
+
+def test_ids_are_reloaded_once_the_ttl_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    session = FakeSession(reference_ids())
+    cache = ReferenceDataCache(ttl_seconds=60)
+
+    cache.get_ids(session)
+    now[0] += 60
+    cache.get_ids(session)
+    assert session.queries == len(REFERENCE_TABLES)
+
+    session.ids[REFERENCE_TABLES['gender_id']] = [4]
+    now[0] += 1
+    assert cache.get_ids(session)['gender_id'] == frozenset({4})
+    assert session.queries == 2 * len(REFERENCE_TABLES)
+
+def test_invalidate_forces_a_reload():
+    session = FakeSession(reference_ids())
+    cache = ReferenceDataCache()
+
+    cache.get_ids(session)
+    cache.invalidate()
+    cache.get_ids(session)
+
+    assert session.queries == 2 * len(REFERENCE_TABLES)
+
+def test_concurrent_callers_share_one_load():
+    session = FakeSession(reference_ids(), delay=0.01)
+    cache = ReferenceDataCache()
+    start = threading.Barrier(8)
+    results = []
+
+    def get_ids():
+        start.wait()
+        results.append(cache.get_ids(session))
+
+    threads = [threading.Thread(target=get_ids) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert session.queries == len(REFERENCE_TABLES)
+    assert len(results) == 8 and all(result is results[0] for result in results)
@@ -0,0 +1,125 @@
+import csv
+import datetime
+from contextlib import contextmanager
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import Column, ColumnDefault, DateTime, Integer, String, func
+from sqlalchemy.orm import declarative_base
+from app.utils import scholarship_bulk_writer
+from app.utils.import_error_handler import ImportErrorHandler
+from app.utils.scholarship_bulk_writer import ScholarshipBulkWriter, copy_field, is_context_free
+
+Base = declarative_base()
+
+class PlainDefaults(Base):
+    __tablename__ = 'plain_defaults'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    status = Column(String, default='active')
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+class ContextDefaults(Base):
+    __tablename__ = 'context_defaults'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    slug = Column(String, default=lambda context: context.get_current_parameters()['name'].lower())
+
+class Validated:
+    """A validated row as the writer takes it"""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def dict(self):
+        return self.values
+
+class FakeSession:
+    """Stands in for the database session: rows inserted under a savepoint
+    are kept unless it is rolled back, and inserting a row named 'bad' fails
+    after the rows before it went in"""
+
+    def __init__(self, dialect='postgresql', driver='psycopg2'):
+        self.dialect = SimpleNamespace(name=dialect, driver=driver)
+        self.rows = []
+        self.savepoints = 0
+        self.commits = 0
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=self.dialect)
+
+    @contextmanager
+    def begin_nested(self):
+        self.savepoints += 1
+        start = len(self.rows)
+        try:
+            yield
+        except Exception:
+            del self.rows[start:]
+            raise
+
+    def bulk_insert_mappings(self, model, mappings):
+        for mapping in mappings:
+            if mapping['name'] == 'bad':
+                raise ValueError('violates check constraint')
+            self.rows.append(mapping)
+
+    def commit(self):
+        self.commits += 1
+
+@pytest.mark.parametrize('value', [
+    '', 'plain', 'say "hi"', 'tab\there', 'two\nlines', 'carriage\r\nreturn', 'back\\slash', '\\N', ',', 12.5,
+])
+def test_copy_fields_read_back_as_written(value):
+    line = ','.join([copy_field(value), copy_field(None)]) + '\n'
+
+    # COPY's CSV format quotes like the csv module and has no escape character
+    fields = next(csv.reader([line], strict=True))
+
+    assert fields == [str(value), '']
+
+def test_only_none_is_an_unquoted_empty_field():
+    assert copy_field(None) == ''
+    assert copy_field('') == '""'
+
+@pytest.mark.parametrize('default, context_free', [
+    (ColumnDefault('active'), True),
+    (ColumnDefault(datetime.datetime.utcnow), True),
+    (ColumnDefault(lambda: 'now'), True),
+    (ColumnDefault(lambda prefix='x': prefix), True),
+    (ColumnDefault(lambda context: context.get_current_parameters()['name']), False),
+    (ColumnDefault(func.now()), False),
+])
+def test_is_context_free(default, context_free):
+    assert is_context_free(default) == context_free
+
+def test_copy_fills_in_context_free_defaults(monkeypatch):
+    monkeypatch.setattr(scholarship_bulk_writer, 'Scholarship', PlainDefaults)
+    writer = ScholarshipBulkWriter(FakeSession(), ImportErrorHandler())
+
+    mapping = writer._with_defaults({'name': 'A'})
+
+    assert writer.use_copy
+    assert mapping['status'] == 'active'
+    assert isinstance(mapping['created_at'], datetime.datetime)
+
+def test_context_sensitive_defaults_fall_back_to_bulk_inserts(monkeypatch):
+    monkeypatch.setattr(scholarship_bulk_writer, 'Scholarship', ContextDefaults)
+
+    writer = ScholarshipBulkWriter(FakeSession(), ImportErrorHandler())
+
+    assert not writer.use_copy
+
+def test_a_failing_row_is_isolated_and_the_rest_written():
+    session = FakeSession()
+    error_handler = ImportErrorHandler()
+    writer = ScholarshipBulkWriter(session, error_handler, chunk_size=8, use_copy=False)
+
+    for row_number in range(2, 10):
+        writer.add(row_number, Validated(name='bad' if row_number == 7 else f'row {row_number}'))
+
+    assert [row['name'] for row in session.rows] == [f'row {n}' for n in range(2, 10) if n != 7]
+    assert writer.inserted == 7
+    assert [(error.row_number, error.field) for error in error_handler.errors] == [(7, 'database')]
+    # The chunk, then halves down to the bad row: 1 + 2 + 2 + 2 savepoints
+    assert session.savepoints == 7
+    assert session.commits == 1
@@ -0,0 +1,216 @@
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+from app.utils.import_file_reader import read_import_file
+from app.utils.reference_data_cache import REFERENCE_TABLES
+from app.utils.scholarship_import_processor import (
+    DUPLICATE_QUERY_BATCH, ScholarshipImportProcessor, normalize_name
+)
+
+class FakeQuery:
+    def __init__(self, session):
+        self.session = session
+        self.organization_ids = []
+
+    def filter(self, condition):
+        # organization_id IN (...): the right side holds the listed IDs
+        self.organization_ids = list(condition.right.value)
+        return self
+
+    def all(self):
+        self.session.queries.append(self.organization_ids)
+        return [row for row in self.session.scholarships if row[2] in self.organization_ids]
+
+class FakeSession:
+    """Stands in for the database session, holding (id, name, organization_id)
+    scholarship rows and recording the organization IDs each query asks for"""
+
+    def __init__(self, scholarships=()):
+        self.scholarships = list(scholarships)
+        self.queries = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name='sqlite', driver='pysqlite'))
+
+    def query(self, *columns):
+        return FakeQuery(self)
+
+class FakeReferenceCache:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def get_ids(self, db):
+        return self.ids
+
+@pytest.fixture
+def processor():
+    return ScholarshipImportProcessor(FakeSession())
+
+def row_wise_clean(data):
+    """Numeric and deadline cleaning as it was done one row at a time"""
+    data = dict(data)
+    for field in ('amount', 'age_min', 'gpa_max', 'income_min'):
+        if field in data and pd.notna(data[field]):
+            data[field] = Decimal(str(data[field]))
+    if 'deadline' in data and pd.notna(data['deadline']):
+        if isinstance(data['deadline'], str):
+            data['deadline'] = pd.to_datetime(data['deadline'])
+    return data
+
+def test_numeric_fields_keep_values_that_do_not_convert(processor):
+    df = pd.DataFrame({'amount': ['1000', 2500.5, None, 'a lot', ' 75 ']})
+
+    records = processor._to_records(processor._clean_data(df))
+
+    assert [record['amount'] for record in records] == [1000, 2500.5, None, 'a lot', 75]
+
+def test_coerce_keeps_the_converted_dtype_when_everything_converts():
+    column = pd.Series(['1', '2.5', None])
+
+    coerced = ScholarshipImportProcessor._coerce(column, pd.to_numeric(column, errors='coerce'))
+
+    assert coerced.dtype == float
+    assert coerced.tolist()[:2] == [1.0, 2.5]
+    assert pd.isna(coerced.iloc[2])
+
+def test_deadlines_fall_back_to_row_wise_parsing(processor):
+    df = pd.DataFrame({'deadline': ['2025-01-31', 'March 1, 2025', '01/15/2025', 'soon', None]})
+
+    deadlines = [record['deadline'] for record in processor._to_records(processor._clean_data(df))]
+
+    assert deadlines == [
+        pd.Timestamp('2025-01-31'), pd.Timestamp('2025-03-01'), pd.Timestamp('2025-01-15'), 'soon', None
+    ]
+
+def test_parsed_deadlines_are_left_alone(processor):
+    column = pd.Series(pd.to_datetime(['2025-01-31', None]))
+
+    assert processor._clean_deadlines(column) is column
+
+@pytest.mark.parametrize('values, expected', [
+    (['yes', 'No', 'false', 'F', '0', '', ' n ', 'TRUE', 'x', None], [True] + [False] * 6 + [True, True, False]),
+    ([1, 0, None, 2.5], [True, False, False, True]),
+    ([True, False], [True, False]),
+])
+def test_clean_flags(values, expected):
+    assert ScholarshipImportProcessor._clean_flags(pd.Series(values)).tolist() == expected
+
+def test_missing_values_become_none(processor):
+    df = pd.DataFrame({
+        'name': ['A', None],
+        'amount': [100.0, float('nan')],
+        'deadline': ['2025-01-31', None],
+        'is_need_based': ['yes', None],
+    })
+
+    records = processor._to_records(processor._clean_data(df))
+
+    assert records[1] == {'name': None, 'amount': None, 'deadline': None, 'is_need_based': False}
+
+@pytest.mark.parametrize('row', [
+    {'amount': 1000, 'age_min': 18, 'gpa_max': 3.5, 'income_min': 0, 'deadline': '2025-01-31'},
+    {'amount': '2500.50', 'age_min': '21', 'gpa_max': None, 'income_min': None, 'deadline': 'March 1, 2025'},
+    {'amount': None, 'age_min': None, 'gpa_max': '4', 'income_min': 50000.0, 'deadline': None},
+    {'amount': 10, 'age_min': 5, 'gpa_max': 2, 'income_min': 1, 'deadline': datetime(2025, 6, 30)},
+])
+def test_column_wise_cleaning_matches_row_wise_cleaning(processor, row):
+    # Mixed column types, as one chunk of a spreadsheet can have
+    df = pd.DataFrame([row, {'amount': 'x', 'age_min': 'y', 'gpa_max': 'z', 'income_min': 'w', 'deadline': 'q'}])
+
+    record = processor._to_records(processor._clean_data(df))[0]
+
+    assert record == row_wise_clean(row)
+
+def test_malformed_values_reach_validation_unchanged(processor):
+    row = {'amount': 'a lot', 'age_min': '18-25', 'deadline': 'when funded'}
+
+    record = processor._to_records(processor._clean_data(pd.DataFrame([row])))[0]
+
+    # Row-wise cleaning raised on these before validation could name the field
+    assert record == row
+
+def test_row_numbers_continue_across_chunks(tmp_path):
+    path = tmp_path / 'scholarships.csv'
+    path.write_text('name\n' + ''.join(f'row {i}\n' for i in range(5)))
+
+    row_numbers = [ScholarshipImportProcessor._row_numbers(df) for df in read_import_file(str(path), 2)]
+
+    assert row_numbers == [[2, 3], [4, 5], [6]]
+
+def valid_row(**values):
+    row = {
+        'name': 'Global Leaders Award', 'description': 'For future leaders', 'amount': 5000.0,
+        'deadline': pd.Timestamp('2099-01-31'), 'eligibility_criteria': 'Open to all',
+        'application_process': 'Apply online', 'status': 'active', 'organization_id': 1,
+        'category_id': 1, 'country_id': 1, 'education_level_id': 1, 'gender_id': 1,
+    }
+    row.update(values)
+    return row
+
+@pytest.mark.parametrize('name', [
+    'Global Leaders Award', '  global   LEADERS award ', 'Global\tLeaders\nAward', 'Global\xa0Leaders Award',
+    'STRASSE Fund', 'Straße Fund', 'ǅemal Prize', 42,
+])
+def test_duplicate_keys_normalize_names_like_normalize_name(name):
+    df = pd.DataFrame({'name': [name], 'organization_id': ['7']})
+
+    assert ScholarshipImportProcessor._duplicate_keys(df) == {0: (normalize_name(name), 7)}
+
+def test_rows_without_a_usable_key_are_left_for_validation():
+    df = pd.DataFrame({'name': ['A', '', None, 'B', 'C'], 'organization_id': [1, 1, 1, None, 1.5]})
+
+    assert ScholarshipImportProcessor._duplicate_keys(df) == {0: ('a', 1)}
+
+def test_rows_repeating_an_existing_scholarship_are_dropped():
+    processor = ScholarshipImportProcessor(FakeSession([(12, ' Global  leaders AWARD', 1)]))
+    df = pd.DataFrame({'name': ['global leaders award', 'Global Leaders Award'], 'organization_id': [1.0, 2.0]})
+
+    kept = processor._drop_duplicates(df, processor._duplicate_keys(df))
+
+    assert kept.index.tolist() == [1]
+    assert [(d['row_number'], d['duplicate_of']) for d in processor.error_handler.duplicates] == [(2, 'scholarship 12')]
+
+def test_existing_keys_are_queried_once_per_batch_of_new_organizations():
+    session = FakeSession()
+    processor = ScholarshipImportProcessor(session)
+    organization_ids = list(range(1, DUPLICATE_QUERY_BATCH * 2 + 3))
+
+    for chunk in ([organization_ids[:-1]] * 2) + [organization_ids]:
+        df = pd.DataFrame({'name': 'A', 'organization_id': chunk})
+        processor._drop_duplicates(df, processor._duplicate_keys(df))
+
+    # The first chunk needs three queries, the second none and the third
+    # only the organization it adds
+    assert [len(ids) for ids in session.queries] == [DUPLICATE_QUERY_BATCH, DUPLICATE_QUERY_BATCH, 1, 1]
+    assert session.queries[-1] == [organization_ids[-1]]
+
+def test_only_rows_queued_for_insert_claim_their_key():
+    processor = ScholarshipImportProcessor(FakeSession())
+    key = ('global leaders award', 1)
+
+    processor._process_row(valid_row(amount=-1), 2, [], key)
+    processor._process_row(valid_row(), 3, ['category_id'], key)
+    processor._process_row(valid_row(description=None), 4, [], key)
+    processor._process_row(valid_row(), 5, [], key)
+    processor._process_row(valid_row(), 6, [], key)
+
+    # Invalid, corrupt and incomplete copies do not hide row 5
+    assert [row_number for row_number, _ in processor.writer.pending] == [5]
+    assert [(d['row_number'], d['duplicate_of']) for d in processor.error_handler.duplicates] == [(6, 'row 5')]
+
+def test_invalid_references_compare_ids_by_value():
+    valid_ids = {field: frozenset({1, 2}) for field in REFERENCE_TABLES}
+    processor = ScholarshipImportProcessor(FakeSession(), FakeReferenceCache(valid_ids))
+    # Columns read as float because of a blank, as object because of text
+    df = pd.DataFrame({
+        'organization_id': [1.0, 2.0, None, 3.0, 1.0],
+        'category_id': ['1', 'abc', '2', '2', '1.5'],
+        'country_id': [1, 2, 1, 2, 99],
+    })
+
+    invalid = processor._find_invalid_references(df)
+
+    # Blank and non-numeric IDs are left for validation to reject
+    assert invalid == {3: ['organization_id'], 4: ['category_id', 'country_id']}